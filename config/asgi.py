@@ -11,6 +11,23 @@ import os
 
 from django.core.asgi import get_asgi_application
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.local')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from core_apps.accounts.consumers import AccountEventsConsumer  # noqa: E402
+
+websocket_routes = {
+    "/ws/v1/accounts/events/": AccountEventsConsumer(),
+}
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "websocket":
+        consumer = websocket_routes.get(scope["path"])
+        if consumer is None:
+            await receive()
+            await send({"type": "websocket.close", "code": 4404})
+            return
+        return await consumer(scope, receive, send)
+    return await django_application(scope, receive, send)
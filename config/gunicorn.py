@@ -0,0 +1,43 @@
+import multiprocessing
+from os import getenv
+
+cpu_count = multiprocessing.cpu_count()
+
+bind = getenv("GUNICORN_BIND", "0.0.0.0:8000")
+
+worker_class = getenv("GUNICORN_WORKER_CLASS", "uvicorn.workers.UvicornWorker")
+
+# 2 * CPU + 1 is the rule of thumb for sync workers, which block on I/O. An
+# async worker does not block while it waits, so one per core keeps every
+# core busy.
+if worker_class in ("sync", "gthread"):
+    workers = int(getenv("GUNICORN_WORKERS", cpu_count * 2 + 1))
+else:
+    workers = int(getenv("GUNICORN_WORKERS", cpu_count))
+
+# Only used by the gthread worker class. Uvicorn workers run sync views through
+# sync_to_async, which is thread-sensitive by default, so a bigger thread pool
+# would not let more of them reach the database at once.
+threads = int(getenv("GUNICORN_THREADS", cpu_count * 2))
+
+keepalive = int(getenv("GUNICORN_KEEPALIVE", 5))
+
+timeout = int(getenv("GUNICORN_TIMEOUT", 30))
+
+graceful_timeout = int(getenv("GUNICORN_GRACEFUL_TIMEOUT", 30))
+
+max_requests = int(getenv("GUNICORN_MAX_REQUESTS", 1000))
+
+max_requests_jitter = int(getenv("GUNICORN_MAX_REQUESTS_JITTER", 100))
+
+preload_app = getenv("GUNICORN_PRELOAD", "True") == "True"
+
+# X-Forwarded-* headers are only trusted from these addresses; set this to the
+# nginx address when the proxy is not on the same host.
+forwarded_allow_ips = getenv("GUNICORN_FORWARDED_ALLOW_IPS", "127.0.0.1")
+
+accesslog = "-"
+
+errorlog = "-"
+
+loglevel = getenv("GUNICORN_LOG_LEVEL", "info")
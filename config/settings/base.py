@@ -27,6 +27,7 @@ DJANGO_APPS = [
     "django.contrib.staticfiles",
     "django.contrib.sites",
     "django.contrib.humanize",
+    "django.contrib.postgres",
 ]
 
 THIRD_PARTY_APPS = [
@@ -54,6 +55,7 @@ INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "core_apps.common.middleware.ReadReplicaMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -83,6 +85,8 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "config.wsgi.application"
 
+ASGI_APPLICATION = "config.asgi.application"
+
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
@@ -95,17 +99,69 @@ DATABASES = {
         "PASSWORD": getenv("POSTGRES_PASSWORD"),
         "HOST": getenv("POSTGRES_HOST"),
         "PORT": getenv("POSTGRES_PORT"),
+        "CONN_MAX_AGE": int(getenv("POSTGRES_CONN_MAX_AGE") or 60),
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
+# "transaction" when connecting through PgBouncer in transaction pooling mode.
+# Server-side cursors do not survive across pooled transactions; row locks
+# taken with select_for_update() live inside atomic() blocks and are safe.
+DATABASE_POOL_MODE = getenv("DATABASE_POOL_MODE", "session")
+
+if DATABASE_POOL_MODE == "transaction":
+    DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"] = True
+
+REPLICA_DATABASE = "replica"
+
+if getenv("POSTGRES_REPLICA_HOST"):
+    DATABASES[REPLICA_DATABASE] = {
+        **DATABASES["default"],
+        "HOST": getenv("POSTGRES_REPLICA_HOST"),
+        "PORT": getenv("POSTGRES_REPLICA_PORT", getenv("POSTGRES_PORT")),
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["core_apps.common.db_routers.PrimaryReplicaRouter"]
+
+# How long a user's reads stay on the primary after they write, so they never
+# read their own writes back from a lagging replica.
+REPLICA_STICKINESS_WINDOW = timedelta(
+    seconds=int(getenv("REPLICA_STICKINESS_SECONDS") or 10)
+)
+
 PASSWORD_HASHERS = [
-    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    # Shares the "argon2" algorithm name, so it also verifies hashes made by
+    # the stock Argon2PasswordHasher.
+    "core_apps.user_auth.hashers.TunedArgon2PasswordHasher",
     "django.contrib.auth.hashers.PBKDF2PasswordHasher",
     "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
     "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
     "django.contrib.auth.hashers.ScryptPasswordHasher",
 ]
 
+ARGON2_TIME_COST = int(getenv("ARGON2_TIME_COST") or 2)
+ARGON2_MEMORY_COST = int(getenv("ARGON2_MEMORY_COST") or 102400)
+ARGON2_PARALLELISM = int(getenv("ARGON2_PARALLELISM") or 8)
+
+# Each API process owns a pool of PASSWORD_HASH_WORKERS hashing processes and
+# queues at most PASSWORD_HASH_QUEUE_SIZE hashes; callers that cannot get a
+# slot within PASSWORD_HASH_QUEUE_TIMEOUT seconds are turned away with a 503
+# (see core_apps.common.exceptions).
+#
+# Size the pool per host, not per process: every gunicorn worker spawns its own
+# PASSWORD_HASH_WORKERS processes, and each hash in flight holds
+# ARGON2_MEMORY_COST KiB (about 100 MB by default) and up to
+# ARGON2_PARALLELISM threads. A host therefore needs roughly
+#   GUNICORN_WORKERS * PASSWORD_HASH_WORKERS * ARGON2_MEMORY_COST
+# of memory for hashing alone, and gains nothing once the hashing processes
+# outnumber its cores. On a 4-core host running 4 workers, the default of 2
+# gives 8 processes and up to 800 MB; lower it (or the worker count) on
+# smaller hosts.
+PASSWORD_HASH_WORKERS = int(getenv("PASSWORD_HASH_WORKERS") or 2)
+PASSWORD_HASH_QUEUE_SIZE = int(getenv("PASSWORD_HASH_QUEUE_SIZE") or 16)
+PASSWORD_HASH_QUEUE_TIMEOUT = float(getenv("PASSWORD_HASH_QUEUE_TIMEOUT") or 5)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -167,6 +223,7 @@ REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"],
     "PAGE_SIZE": 10,
+    "EXCEPTION_HANDLER": "core_apps.common.exceptions.api_exception_handler",
     "DEFAULT_THROTTLE_CLASSES": [
         "rest_framework.throttling.AnonRateThrottle",
         "rest_framework.throttling.UserRateThrottle",
@@ -186,8 +243,14 @@ SIMPLE_JWT = {
     "SIGNING_KEY": getenv("SIGNING_KEY"),
     "USER_ID_FIELD": "id",
     "USER_ID_CLAIM": "user_id",
+    "AUTH_TOKEN_CLASSES": ("core_apps.user_auth.tokens.CachedAccessToken",),
+    "TOKEN_REFRESH_SERIALIZER": (
+        "core_apps.user_auth.serializers.CustomTokenRefreshSerializer"
+    ),
 }
 
+JWT_VERIFY_CACHE_SIZE = int(getenv("JWT_VERIFY_CACHE_SIZE") or 1024)
+
 
 DJOSER = {
     "USER_ID_FIELD": "id",
@@ -232,8 +295,80 @@ CELERY_WORKER_SEND_TASK_EVENTS = True
 CELERY_BEAT_SCHEDULE = {
     "apply_daily_interest": {"task": "apply_daily_interest"},
     "detect_suspicious_activities": {"task": "detect_suspicious_activities"},
+    "refill_account_number_pools": {
+        "task": "refill_account_number_pools",
+        "schedule": timedelta(minutes=5),
+    },
+    "settle_card_holds": {
+        "task": "settle_card_holds",
+        "schedule": timedelta(minutes=1),
+    },
+    "expire_virtual_cards": {
+        "task": "expire_virtual_cards",
+        "schedule": timedelta(hours=1),
+    },
+    "flush_content_views": {
+        "task": "flush_content_views",
+        "schedule": timedelta(minutes=1),
+    },
+    "archive_content_views": {
+        "task": "archive_content_views",
+        "schedule": timedelta(days=1),
+    },
+}
+
+REDIS_URL = getenv("REDIS_URL", "redis://redis:6379/0")
+
+# Seconds before a call on the shared Redis client (get_redis_client) gives up,
+# so a stalled Redis fails the readiness probe, account opening and card
+# authorization quickly instead of hanging them.
+REDIS_SOCKET_TIMEOUT = float(getenv("REDIS_SOCKET_TIMEOUT") or 1)
+REDIS_SOCKET_CONNECT_TIMEOUT = float(getenv("REDIS_SOCKET_CONNECT_TIMEOUT") or 1)
+
+REALTIME_CHANNEL_PREFIX = "pybank"
+
+CACHES = {
+    "default": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": REDIS_URL,
+        "KEY_PREFIX": "pybank",
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "IGNORE_EXCEPTIONS": True,
+        },
+    }
 }
 
+# Bump to discard every cached lookup after a change to the cached models.
+CACHE_LOOKUP_VERSION = 2
+
+CACHE_LOOKUP_TIMEOUT = 5 * 60
+
+# Fraction of cache-aside lookups counted for the cache_stats command; 0 turns
+# the counters off, 1 counts every lookup.
+CACHE_LOOKUP_STATS_SAMPLE_RATE = float(getenv("CACHE_LOOKUP_STATS_SAMPLE_RATE") or 0)
+
+BANK_CODE = getenv("BANK_CODE", "")
+BANK_BRANCH_CODE = getenv("BANK_BRANCH_CODE", "")
+ACCOUNT_CURRENCY_CODES = {
+    "usd": getenv("CURRENCY_CODE_USD"),
+    "eur": getenv("CURRENCY_CODE_EUR"),
+    "xaf": getenv("CURRENCY_CODE_XAF"),
+}
+
+# Pre-generated account numbers kept in Redis per currency; account opening
+# pops from the pool and the beat task tops it back up.
+ACCOUNT_NUMBER_POOL_SIZE = int(getenv("ACCOUNT_NUMBER_POOL_SIZE") or 1000)
+
+# Raw ContentView rows older than this are folded into daily rollups.
+CONTENT_VIEW_RETENTION_DAYS = int(getenv("CONTENT_VIEW_RETENTION_DAYS") or 90)
+
+# Seconds the Redis view counter of an object is kept after its last view;
+# the next read after that seeds it again from the database.
+VIEW_COUNTER_TIMEOUT = int(getenv("VIEW_COUNTER_TIMEOUT") or 7 * 24 * 60 * 60)
+
+TOKEN_USER_CACHE_TIMEOUT = int(getenv("TOKEN_USER_CACHE_TIMEOUT") or 60)
+
 CLOUDINARY_API_KEY = getenv("CLOUDINARY_API_KEY")
 CLOUDINARY_API_SECRET = getenv("CLOUDINARY_API_SECRET")
 CLOUDINARY_CLOUD_NAME = getenv("CLOUDINARY_CLOUD_NAME")
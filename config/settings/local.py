@@ -30,4 +30,10 @@ LOCKOUT_DURATION = timedelta(minutes=1)
 
 LOGIN_ATTEMPTS = 3
 
+# Failed logins are counted over this window, not just the lockout, so slow
+# credential stuffing still reaches LOGIN_ATTEMPTS.
+LOGIN_ATTEMPT_WINDOW = timedelta(hours=1)
+
 OTP_EXPIRATION = timedelta(minutes=1)
+
+OTP_MAX_ATTEMPTS = 5
@@ -0,0 +1,47 @@
+from .base import *  # noqa
+from .base import BASE_DIR
+
+production_env_file = path.join(BASE_DIR, ".envs", ".env.production")
+if path.exists(production_env_file):
+    load_dotenv(production_env_file)
+
+SECRET_KEY = getenv("SECRET_KEY")
+
+DEBUG = False
+
+SITE_NAME = getenv("SITE_NAME")
+
+ALLOWED_HOSTS = getenv("ALLOWED_HOSTS", "").split(",")
+
+ADMIN_URL = getenv("ADMIN_URL")
+
+EMAIL_BACKEND = "djcelery_email.backends.CeleryEmailBackend"
+EMAIL_HOST = getenv("EMAIL_HOST")
+EMAIL_PORT = getenv("EMAIL_PORT")
+DEFAULT_FROM_EMAIL = getenv("DEFAULT_FROM_EMAIL")
+DOMAIN = getenv("DOMAIN")
+ADMIN_EMAIL = getenv("ADMIN_EMAIL")
+
+MAX_UPLOAD_SIZE = 1 * 1024 * 1024
+
+CSRF_TRUSTED_ORIGINS = getenv("CSRF_TRUSTED_ORIGINS", "").split(",")
+
+SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
+
+USE_X_FORWARDED_HOST = True
+
+SESSION_COOKIE_SECURE = True
+
+CSRF_COOKIE_SECURE = True
+
+LOCKOUT_DURATION = timedelta(minutes=1)
+
+LOGIN_ATTEMPTS = 3
+
+# Failed logins are counted over this window, not just the lockout, so slow
+# credential stuffing still reaches LOGIN_ATTEMPTS.
+LOGIN_ATTEMPT_WINDOW = timedelta(hours=1)
+
+OTP_EXPIRATION = timedelta(minutes=1)
+
+OTP_MAX_ATTEMPTS = 5
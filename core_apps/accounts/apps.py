@@ -6,3 +6,6 @@ class AccountsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "core_apps.accounts"
     verbose_name = _("Accounts")
+
+    def ready(self) -> None:
+        import core_apps.accounts.signals
@@ -0,0 +1,22 @@
+from typing import Optional
+
+from core_apps.common.cache import cached_lookup, invalidate_lookup
+from .models import BankAccount
+
+ACCOUNT_BY_NUMBER = "account-by-number"
+
+
+def get_account_by_number(account_number: str) -> Optional[BankAccount]:
+    # The balance is left out of the snapshot: QuerySet.update() writes do not
+    # invalidate it, so reading account_balance always goes to the database.
+    return cached_lookup(
+        ACCOUNT_BY_NUMBER,
+        account_number,
+        lambda: BankAccount.objects.defer("account_balance")
+        .filter(account_number=account_number)
+        .first(),
+    )
+
+
+def invalidate_account(account: BankAccount) -> None:
+    invalidate_lookup(ACCOUNT_BY_NUMBER, account.account_number)
@@ -0,0 +1,114 @@
+import asyncio
+import time
+from contextlib import suppress
+from http.cookies import SimpleCookie
+from typing import Any, Awaitable, Callable, Optional
+
+import redis.asyncio as aioredis
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from loguru import logger
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, TokenError
+
+from core_apps.common.cookie_auth import CustomJWTAuthentication
+from .realtime import user_channel
+
+Scope = dict[str, Any]
+Receive = Callable[[], Awaitable[dict]]
+Send = Callable[[dict], Awaitable[None]]
+
+
+class AccountEventsConsumer:
+    """Streams balance and transaction events for the authenticated user."""
+
+    authentication_class = CustomJWTAuthentication
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        message = await receive()
+        if message["type"] != "websocket.connect":
+            return
+
+        authenticated = await self.authenticate(scope)
+        if authenticated is None:
+            await send({"type": "websocket.close", "code": 4401})
+            return
+        user, expires_at = authenticated
+
+        await send({"type": "websocket.accept"})
+        logger.info(f"Account event stream opened for {user.email}")
+
+        client = aioredis.Redis.from_url(settings.REDIS_URL)
+        pubsub = client.pubsub()
+        await pubsub.subscribe(user_channel(user.id))
+
+        forward_task = asyncio.create_task(self.forward_events(pubsub, send))
+        try:
+            await self.receive_until(receive, send, expires_at)
+        finally:
+            forward_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await forward_task
+            await pubsub.unsubscribe()
+            await pubsub.aclose()
+            await client.aclose()
+            logger.info(f"Account event stream closed for {user.email}")
+
+    async def forward_events(self, pubsub: aioredis.client.PubSub, send: Send) -> None:
+        try:
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                await send({"type": "websocket.send", "text": message["data"].decode()})
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Without the subscription the stream is dead; close it so the
+            # client reconnects instead of waiting on a silent socket.
+            logger.error(f"Account event stream failed: {e}")
+            await send({"type": "websocket.close", "code": 1011})
+
+    async def receive_until(
+        self, receive: Receive, send: Send, expires_at: float
+    ) -> None:
+        """Wait for the client to disconnect.
+
+        The socket is closed when the access token it connected with expires.
+        The client then reconnects with a refreshed token, which a logged-out
+        session cannot get.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + expires_at - time.time()
+        while True:
+            try:
+                message = await asyncio.wait_for(receive(), deadline - loop.time())
+            except asyncio.TimeoutError:
+                await send({"type": "websocket.close", "code": 4401})
+                return
+            if message["type"] == "websocket.disconnect":
+                return
+
+    async def authenticate(self, scope: Scope) -> Optional[tuple[Any, float]]:
+        raw_token = self.get_raw_token(scope)
+        if raw_token is None:
+            return None
+
+        authentication = self.authentication_class()
+        try:
+            validated_token = authentication.get_validated_token(raw_token)
+            user = await sync_to_async(authentication.get_user)(validated_token)
+        except (TokenError, AuthenticationFailed) as e:
+            logger.error(f"Websocket token validation error: {str(e)}")
+            return None
+        if not user.is_active:
+            return None
+        return user, validated_token["exp"]
+
+    def get_raw_token(self, scope: Scope) -> Optional[str]:
+        headers = dict(scope.get("headers", []))
+        cookie_header = headers.get(b"cookie")
+        if not cookie_header:
+            return None
+        cookies = SimpleCookie()
+        cookies.load(cookie_header.decode())
+        morsel = cookies.get(settings.COOKIE_NAME)
+        return morsel.value if morsel else None
@@ -0,0 +1,44 @@
+from os import cpu_count
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core_apps.accounts.onboarding import import_customers
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk onboard customers from a CSV file, creating users, profiles and "
+        "primary bank accounts in batches."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("csv_path")
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--hash-workers",
+            type=int,
+            default=cpu_count() or 1,
+            help="Processes used to hash passwords for this run",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        try:
+            with open(options["csv_path"], newline="", encoding="utf-8") as stream:
+                result = import_customers(
+                    stream,
+                    batch_size=options["batch_size"],
+                    hash_workers=options["hash_workers"],
+                )
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        for error in result["errors"]:
+            self.stderr.write(
+                f"line {error['line']} {error['email']}: {error['error']}"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {result['created']} customers, skipped {result['skipped']}"
+            )
+        )
@@ -108,7 +108,7 @@ class BankAccount(TimeStampedModel):
                 f"Applying daily interest {interest} to account {self.account_number}"
             )
             self.account_balance += interest
-            self.save()
+            self.save(update_fields=["account_balance", "updated_at"])
 
             Transaction.objects.create(
                 user=self.user,
@@ -133,8 +133,11 @@ class BankAccount(TimeStampedModel):
             raise ValidationError(_("Account balance cannot be negative."))
 
     def save(self, *args, **kwargs) -> None:
-        if self.is_primary:
-            BankAccount.objects.filter(user=self.user).update(is_primary=False)
+        update_fields = kwargs.get("update_fields")
+        if self.is_primary and (update_fields is None or "is_primary" in update_fields):
+            BankAccount.objects.filter(user_id=self.user_id, is_primary=True).exclude(
+                pk=self.pk
+            ).update(is_primary=False)
         super().save(*args, **kwargs)
 
 
@@ -0,0 +1,228 @@
+import csv
+from collections import defaultdict
+from typing import IO, Any, Optional
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from loguru import logger
+
+from core_apps.common.utils import chunked
+from core_apps.user_auth.hashing import hash_passwords
+from core_apps.user_auth.managers import (
+    generate_random_username,
+    validate_email_address,
+)
+from core_apps.user_profile.models import Profile
+from core_apps.user_profile.search import refresh_search_documents
+from .models import BankAccount
+from .tasks import send_onboarding_emails
+from .utils import allocate_account_numbers
+
+User = get_user_model()
+
+REQUIRED_COLUMNS = [
+    "email",
+    "first_name",
+    "last_name",
+    "id_no",
+    "security_question",
+    "security_answer",
+]
+
+# Status of customer imports running in Celery, looked up by job id.
+IMPORT_JOB_TIMEOUT = 60 * 60 * 24
+
+
+def import_job_key(job_id: Any) -> str:
+    return f"accounts:customer-import:{job_id}"
+
+
+def get_import_job(job_id: Any) -> Optional[dict]:
+    return cache.get(import_job_key(job_id))
+
+
+def set_import_job(job_id: Any, status: str, **details: Any) -> None:
+    cache.set(
+        import_job_key(job_id),
+        {"job_id": str(job_id), "status": status, **details},
+        timeout=IMPORT_JOB_TIMEOUT,
+    )
+
+
+def import_customers(
+    stream: IO[str], batch_size: int = 500, hash_workers: Optional[int] = None
+) -> dict[str, Any]:
+    rows, errors = read_customer_rows(stream)
+    created = 0
+    for batch in chunked(rows, batch_size):
+        created += import_batch(batch, errors, hash_workers)
+
+    logger.info(f"Onboarded {created} customers, skipped {len(errors)} rows")
+    return {"created": created, "skipped": len(errors), "errors": errors}
+
+
+def read_customer_rows(stream: IO[str]) -> tuple[list[dict], list[dict]]:
+    reader = csv.DictReader(stream)
+    missing = set(REQUIRED_COLUMNS) - set(reader.fieldnames or [])
+    if missing:
+        raise ValueError(f"Missing CSV columns: {', '.join(sorted(missing))}")
+
+    rows, errors = [], []
+    seen_emails, seen_id_nos = set(), set()
+    for line, raw in enumerate(reader, start=2):
+        row = {key: (value or "").strip() for key, value in raw.items() if key}
+        row["line"] = line
+        row["email"] = User.objects.normalize_email(row["email"]).lower()
+        row["currency"] = (
+            row.get("currency") or BankAccount.AccountCurrency.XAF
+        ).lower()
+        row["account_type"] = (
+            row.get("account_type") or BankAccount.AccountType.CURRENT
+        ).lower()
+
+        error = validate_customer_row(row)
+        if not error and row["email"] in seen_emails:
+            error = "Duplicate email in file."
+        if not error and row["id_no"] in seen_id_nos:
+            error = "Duplicate ID number in file."
+        if error:
+            errors.append({"line": line, "email": row["email"], "error": error})
+            continue
+
+        seen_emails.add(row["email"])
+        seen_id_nos.add(row["id_no"])
+        rows.append(row)
+    return rows, errors
+
+
+def validate_customer_row(row: dict) -> str:
+    blank = [column for column in REQUIRED_COLUMNS if not row.get(column)]
+    if blank:
+        return f"Missing values for: {', '.join(blank)}."
+    try:
+        validate_email_address(row["email"])
+    except ValidationError as e:
+        return e.messages[0]
+    if row["security_question"] not in User.SecurityQuestions.values:
+        return "Invalid security question."
+    if row["currency"] not in BankAccount.AccountCurrency.values:
+        return "Invalid currency."
+    if row["account_type"] not in BankAccount.AccountType.values:
+        return "Invalid account type."
+    return ""
+
+
+def import_batch(
+    batch: list[dict], errors: list[dict], hash_workers: Optional[int] = None
+) -> int:
+    batch = exclude_existing_customers(batch, errors)
+    if not batch:
+        return 0
+
+    passwords = hash_passwords(
+        (row.get("password") or None for row in batch), workers=hash_workers
+    )
+    usernames = generate_unique_usernames(len(batch))
+    account_numbers = allocate_batch_account_numbers(batch)
+
+    users = [
+        User(
+            email=row["email"],
+            username=username,
+            password=password,
+            first_name=row["first_name"],
+            middle_name=row.get("middle_name") or None,
+            last_name=row["last_name"],
+            id_no=row["id_no"],
+            security_question=row["security_question"],
+            security_answer=row["security_answer"],
+        )
+        for row, username, password in zip(batch, usernames, passwords)
+    ]
+
+    try:
+        with transaction.atomic():
+            User.objects.bulk_create(users)
+            Profile.objects.bulk_create(
+                Profile(
+                    user=user,
+                    account_currency=row["currency"],
+                    account_type=row["account_type"],
+                )
+                for user, row in zip(users, batch)
+            )
+            accounts = BankAccount.objects.bulk_create(
+                BankAccount(
+                    user=user,
+                    account_number=account_numbers[row["currency"]].pop(),
+                    currency=row["currency"],
+                    account_type=row["account_type"],
+                    is_primary=True,
+                )
+                for user, row in zip(users, batch)
+            )
+            # bulk_create skips the save hooks that keep search documents fresh.
+            refresh_search_documents([user.pk for user in users])
+            account_ids = [str(account.id) for account in accounts]
+            transaction.on_commit(lambda: send_onboarding_emails.delay(account_ids))
+    except IntegrityError as e:
+        logger.error(f"Onboarding batch starting at line {batch[0]['line']}: {e}")
+        errors.extend(
+            {"line": row["line"], "email": row["email"], "error": "Batch failed."}
+            for row in batch
+        )
+        return 0
+    return len(users)
+
+
+def exclude_existing_customers(batch: list[dict], errors: list[dict]) -> list[dict]:
+    existing_emails = set(
+        User.objects.filter(email__in=[row["email"] for row in batch]).values_list(
+            "email", flat=True
+        )
+    )
+    existing_id_nos = set(
+        User.objects.filter(id_no__in=[row["id_no"] for row in batch]).values_list(
+            "id_no", flat=True
+        )
+    )
+    remaining = []
+    for row in batch:
+        if row["email"] in existing_emails or row["id_no"] in existing_id_nos:
+            errors.append(
+                {
+                    "line": row["line"],
+                    "email": row["email"],
+                    "error": "Customer already exists.",
+                }
+            )
+        else:
+            remaining.append(row)
+    return remaining
+
+
+def generate_unique_usernames(count: int) -> list[str]:
+    usernames: set = set()
+    while len(usernames) < count:
+        candidates = {
+            generate_random_username() for _ in range(count - len(usernames))
+        } - usernames
+        taken = set(
+            User.objects.filter(username__in=candidates).values_list(
+                "username", flat=True
+            )
+        )
+        usernames |= candidates - taken
+    return list(usernames)
+
+
+def allocate_batch_account_numbers(batch: list[dict]) -> dict[str, list[str]]:
+    counts: dict = defaultdict(int)
+    for row in batch:
+        counts[row["currency"]] += 1
+    return {
+        currency: allocate_account_numbers(currency, count)
+        for currency, count in counts.items()
+    }
@@ -0,0 +1,20 @@
+import json
+from typing import Any
+
+import redis
+from django.conf import settings
+from loguru import logger
+
+from core_apps.common.redis import get_redis_client
+
+
+def user_channel(user_id: Any) -> str:
+    return f"{settings.REALTIME_CHANNEL_PREFIX}:user:{user_id}"
+
+
+def publish_user_event(user_id: Any, event: str, payload: dict) -> None:
+    message = json.dumps({"event": event, "data": payload}, default=str)
+    try:
+        get_redis_client().publish(user_channel(user_id), message)
+    except redis.RedisError as e:
+        logger.error(f"Failed to publish {event} event for user {user_id}: {e}")
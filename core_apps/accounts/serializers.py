@@ -2,6 +2,9 @@ from decimal import Decimal
 
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
+
+from core_apps.user_auth.otp import OTPPurpose, verify_otp
+from .cache import get_account_by_number
 from .models import BankAccount, Transaction
 
 
@@ -57,13 +60,12 @@ class DepositSerializer(serializers.ModelSerializer):
         fields = ["account_number", "amount"]
 
     def validate_account_number(self, value: str) -> str:
-        try:
-            account = BankAccount.objects.get(account_number=value)
-            self.context["account"] = account
-        except BankAccount.DoesNotExist:
+        account = get_account_by_number(value)
+        if account is None:
             raise serializers.ValidationError(
                 {"account_number": _("Account number does not exist.")}
             )
+        self.context["account"] = account
         return value
 
     def to_representation(self, instance: BankAccount) -> str:
@@ -145,46 +147,41 @@ class TransactionSerializer(serializers.ModelSerializer):
         receiver_account = data.get("receiver_account")
         amount = data.get("amount")
 
-        try:
-            if transaction_type == Transaction.TransactionType.WITHDRAWAL:
-                account = BankAccount.objects.get(account_number=sender_account)
-                data["sender_account"] = account
-                data["receiver_account"] = None
-                if account.account_balance < amount:
-                    raise serializers.ValidationError(
-                        "Insufficient funds for withdrawal"
-                    )
-                elif transaction_type == Transaction.TransactionType.DEPOSIT:
-                    account = BankAccount.objects.get(account_number=receiver_account)
-                    data["receiver_account"] = account
-                    data["sender_account"] = None
-                else:
-                    sender_account = BankAccount.objects.get(
-                        account_number=sender_account
-                    )
-                    receiver_account = BankAccount.objects.get(
-                        account_number=receiver_account
-                    )
-                    data["sender_account"] = sender_account
-                    data["receiver_account"] = receiver_account
-
-                    if sender_account == receiver_account:
-                        raise serializers.ValidationError(
-                            "Sender and receiver accounts cannot be the same"
-                        )
-                    if sender_account.currency != receiver_account.currency:
-                        raise serializers.ValidationError(
-                            "Sender and receiver accounts must have the same currency"
-                        )
-                    if sender_account.account_balance < amount:
-                        raise serializers.ValidationError(
-                            "Insufficient funds for transfer"
-                        )
-
-        except BankAccount.DoesNotExist:
-            raise serializers.ValidationError("One or both accounts not found")
+        if transaction_type == Transaction.TransactionType.WITHDRAWAL:
+            account = self.get_account(sender_account)
+            data["sender_account"] = account
+            data["receiver_account"] = None
+            if account.account_balance < amount:
+                raise serializers.ValidationError("Insufficient funds for withdrawal")
+        elif transaction_type == Transaction.TransactionType.DEPOSIT:
+            account = self.get_account(receiver_account)
+            data["receiver_account"] = account
+            data["sender_account"] = None
+        else:
+            sender_account = self.get_account(sender_account)
+            receiver_account = self.get_account(receiver_account)
+            data["sender_account"] = sender_account
+            data["receiver_account"] = receiver_account
+
+            if sender_account == receiver_account:
+                raise serializers.ValidationError(
+                    "Sender and receiver accounts cannot be the same"
+                )
+            if sender_account.currency != receiver_account.currency:
+                raise serializers.ValidationError(
+                    "Sender and receiver accounts must have the same currency"
+                )
+            if sender_account.account_balance < amount:
+                raise serializers.ValidationError("Insufficient funds for transfer")
+
         return data
 
+    def get_account(self, account_number: str) -> BankAccount:
+        account = get_account_by_number(account_number) if account_number else None
+        if account is None:
+            raise serializers.ValidationError("One or both accounts not found")
+        return account
+
 
 class SecurityQuestionSerializer(serializers.Serializer):
     security_answer = serializers.CharField(max_length=30)
@@ -202,7 +199,7 @@ class OTPVerificationSerializer(serializers.Serializer):
 
     def validate(self, data: dict) -> dict:
         user = self.context["request"].user
-        if not user.verify_otp(data["otp"]):
+        if not verify_otp(user.email, OTPPurpose.TRANSFER, data["otp"]):
             raise serializers.ValidationError("Invalid or expired OTP")
 
         return data
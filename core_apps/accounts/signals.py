@@ -0,0 +1,76 @@
+from typing import Any, Type
+
+from django.db import transaction
+from django.db.models.base import Model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate_account
+from .models import BankAccount, Transaction
+from .realtime import publish_user_event
+
+
+@receiver(post_save, sender=Transaction)
+def publish_transaction_created(
+    sender: Type[Model], instance: Transaction, created: bool, **kwargs: Any
+) -> None:
+    if not created:
+        return
+
+    payload = {
+        "id": str(instance.id),
+        "amount": str(instance.amount),
+        "description": instance.description,
+        "status": instance.status,
+        "transaction_type": instance.transaction_type,
+        "created_at": instance.created_at.isoformat(),
+        # Every caller creates transactions with the account objects, so the
+        # account numbers are read without a query.
+        "sender_account": (
+            instance.sender_account.account_number
+            if instance.sender_account_id
+            else None
+        ),
+        "receiver_account": (
+            instance.receiver_account.account_number
+            if instance.receiver_account_id
+            else None
+        ),
+        "sender_account_id": (
+            str(instance.sender_account_id) if instance.sender_account_id else None
+        ),
+        "receiver_account_id": (
+            str(instance.receiver_account_id) if instance.receiver_account_id else None
+        ),
+    }
+    user_ids = {instance.sender_id, instance.receiver_id} - {None}
+
+    def publish() -> None:
+        for user_id in user_ids:
+            publish_user_event(user_id, "transaction.created", payload)
+
+    transaction.on_commit(publish)
+
+
+@receiver(post_save, sender=BankAccount)
+def publish_balance_updated(
+    sender: Type[Model], instance: BankAccount, created: bool, **kwargs: Any
+) -> None:
+    payload = {
+        "account_number": instance.account_number,
+        "account_balance": str(instance.account_balance),
+        "currency": instance.currency,
+    }
+    user_id = instance.user_id
+
+    transaction.on_commit(
+        lambda: publish_user_event(user_id, "balance.updated", payload)
+    )
+
+
+@receiver(post_save, sender=BankAccount)
+@receiver(post_delete, sender=BankAccount)
+def invalidate_cached_account(
+    sender: Type[Model], instance: BankAccount, **kwargs: Any
+) -> None:
+    invalidate_account(instance)
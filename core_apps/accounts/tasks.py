@@ -1,9 +1,11 @@
-from io import BytesIO
+from io import BytesIO, TextIOWrapper
 
+import redis
 from celery import shared_task
 from dateutil import parser
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
 from django.core.mail import EmailMessage
 from django.db.models import Q, Sum
 from django.utils.translation import gettext_lazy as _
@@ -19,7 +21,8 @@ from os import getenv
 from decimal import Decimal
 from _datetime import timedelta
 from django.utils import timezone
-from .emails import send_suspicious_activity_alert
+from .emails import send_account_creation_email, send_suspicious_activity_alert
+from .utils import refill_account_number_pool
 
 User = get_user_model()
 
@@ -215,3 +218,55 @@ def detect_suspicious_activities():
             else:
                 return f"Suspicious activity check complete. Activities detected but alert email failed to send"
     return f"Suspicious activity check complete. No suspicious activities detected."
+
+
+@shared_task
+def send_onboarding_emails(account_ids: list) -> str:
+    accounts = BankAccount.objects.filter(id__in=account_ids).select_related("user")
+    sent = 0
+    for account in accounts.iterator(chunk_size=500):
+        send_account_creation_email(account.user, account)
+        sent += 1
+    logger.info(f"Sent {sent} onboarding emails")
+    return f"Sent {sent} onboarding emails"
+
+
+@shared_task(name="refill_account_number_pools")
+def refill_account_number_pools() -> str:
+    added = 0
+    for currency in settings.ACCOUNT_CURRENCY_CODES:
+        try:
+            added += refill_account_number_pool(currency)
+        except (ValueError, redis.RedisError) as e:
+            logger.error(f"Failed to refill account number pool for {currency}: {e}")
+    logger.info(f"Added {added} account numbers to the pools")
+    return f"Added {added} account numbers to the pools"
+
+
+# Large files outlive the default task limits. Batches commit as they go, so a
+# file uploaded again after a timeout skips the customers already created.
+@shared_task(name="import_customers", soft_time_limit=30 * 60, time_limit=35 * 60)
+def import_customers_from_file(job_id: str, path: str) -> str:
+    # onboarding imports this module for send_onboarding_emails.
+    from .onboarding import import_customers, set_import_job
+
+    set_import_job(job_id, "running")
+    try:
+        with default_storage.open(path, "rb") as upload:
+            # Outside the web process, hash with a private pool like the
+            # import_customers command instead of queueing behind logins.
+            result = import_customers(
+                TextIOWrapper(upload.file, encoding="utf-8", newline=""),
+                hash_workers=settings.PASSWORD_HASH_WORKERS,
+            )
+    except (UnicodeDecodeError, ValueError) as e:
+        set_import_job(job_id, "failed", error=str(e))
+        return f"Customer import {job_id} failed: {e}"
+    except Exception:
+        set_import_job(job_id, "failed", error="The import stopped unexpectedly.")
+        raise
+    finally:
+        default_storage.delete(path)
+
+    set_import_job(job_id, "completed", **result)
+    return f"Customer import {job_id} onboarded {result['created']} customers"
@@ -0,0 +1,153 @@
+import asyncio
+import tempfile
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core_apps.user_auth.models import User
+from . import tasks
+from .consumers import AccountEventsConsumer
+from .models import BankAccount, Transaction
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+class AccountEventsConsumerTests(SimpleTestCase):
+    def run_consumer(self, expires_in: float) -> list[dict]:
+        user = SimpleNamespace(id="user-id", email="events@example.com")
+        sent = []
+
+        async def receive() -> dict:
+            if not sent:
+                return {"type": "websocket.connect"}
+            # The client stays connected and silent.
+            await asyncio.Event().wait()
+
+        async def send(message: dict) -> None:
+            sent.append(message)
+
+        with mock.patch.object(
+            AccountEventsConsumer,
+            "authenticate",
+            return_value=(user, time.time() + expires_in),
+        ):
+            asyncio.run(asyncio.wait_for(AccountEventsConsumer()({}, receive, send), 5))
+        return sent
+
+    def test_socket_closes_when_the_access_token_expires(self) -> None:
+        sent = self.run_consumer(expires_in=0.2)
+        self.assertEqual(
+            sent,
+            [{"type": "websocket.accept"}, {"type": "websocket.close", "code": 4401}],
+        )
+
+    def test_expired_token_closes_immediately(self) -> None:
+        sent = self.run_consumer(expires_in=-1)
+        self.assertEqual(sent[-1], {"type": "websocket.close", "code": 4401})
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class TransactionEventTests(TestCase):
+    @mock.patch("core_apps.accounts.signals.publish_user_event")
+    def test_payload_carries_account_numbers_and_ids(self, publish) -> None:
+        user = User.objects.create_user(
+            email="payload@example.com",
+            password="Str0ng-Passw0rd!",
+            first_name="Event",
+            last_name="Payload",
+            id_no="EV-0001",
+            security_question=User.SecurityQuestions.PET_NAME,
+            security_answer="rex",
+        )
+        account = BankAccount.objects.create(
+            user=user, account_number="2000000001", currency="usd"
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Transaction.objects.create(
+                user=user,
+                amount=10,
+                sender=user,
+                receiver=user,
+                receiver_account=account,
+            )
+
+        events = {call.args[1]: call.args[2] for call in publish.call_args_list}
+        payload = events["transaction.created"]
+        self.assertEqual(payload["receiver_account"], "2000000001")
+        self.assertEqual(payload["receiver_account_id"], str(account.id))
+        self.assertIsNone(payload["sender_account"])
+        self.assertIsNone(payload["sender_account_id"])
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class CustomerImportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.manager = User.objects.create_user(
+            email="manager@example.com",
+            password="Str0ng-Passw0rd!",
+            first_name="Branch",
+            last_name="Manager",
+            id_no="BM-0001",
+            security_question=User.SecurityQuestions.PET_NAME,
+            security_answer="rex",
+            role=User.RoleChoices.BRANCH_MANAGER,
+        )
+
+    def setUp(self) -> None:
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root.name))
+        self.client = APIClient()
+        self.client.force_authenticate(self.manager)
+
+    def upload(self, content: str):
+        return self.client.post(
+            reverse("customer-import"),
+            {"file": SimpleUploadedFile("customers.csv", content.encode())},
+            format="multipart",
+        )
+
+    def job_status(self, job_id: str):
+        return self.client.get(reverse("customer-import-status", args=[job_id]))
+
+    def test_import_runs_in_a_task_and_reports_its_status(self) -> None:
+        with mock.patch.object(tasks.import_customers_from_file, "delay") as delay:
+            response = self.upload(
+                "email,first_name,last_name,id_no,security_question,"
+                "security_answer,password\n"
+                "new@example.com,New,Customer,IMP-0001,pet_name,rex,Str0ng-Passw0rd!\n"
+            )
+        self.assertEqual(response.status_code, 202)
+        job_id = response.data["job_id"]
+        self.assertEqual(response.data["status"], "queued")
+        self.assertFalse(User.objects.filter(email="new@example.com").exists())
+        self.assertEqual(self.job_status(job_id).data["status"], "queued")
+
+        tasks.import_customers_from_file(*delay.call_args.args)
+
+        job = self.job_status(job_id).data
+        self.assertEqual(
+            (job["status"], job["created"], job["skipped"]), ("completed", 1, 0)
+        )
+        self.assertTrue(User.objects.filter(email="new@example.com").exists())
+
+    def test_invalid_file_fails_the_job(self) -> None:
+        with mock.patch.object(tasks.import_customers_from_file, "delay") as delay:
+            job_id = self.upload("email,first_name\n").data["job_id"]
+        tasks.import_customers_from_file(*delay.call_args.args)
+
+        job = self.job_status(job_id).data
+        self.assertEqual(job["status"], "failed")
+        self.assertIn("Missing CSV columns", job["error"])
+
+    def test_unknown_job_is_not_found(self) -> None:
+        self.assertEqual(
+            self.job_status("00000000-0000-0000-0000-000000000000").status_code, 404
+        )
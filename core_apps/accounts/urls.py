@@ -1,11 +1,14 @@
 from django.urls import path
 from .views import (
     AccountVerificationView,
+    CustomerImportStatusView,
+    CustomerImportView,
     DepositView,
     InitiateTransferView,
     VerifySecurityQuestionView,
     VerifyOTPView,
     TransactionListApiView,
+    AsyncTransactionListApiView,
     TransactionPDFView,
 )
 
@@ -22,5 +25,16 @@ urlpatterns = [
     ),
     path("transfer/verify-otp/", VerifyOTPView.as_view(), name="verify-otp"),
     path("transactions/", TransactionListApiView.as_view(), name="transaction-list"),
+    path(
+        "transactions/async/",
+        AsyncTransactionListApiView.as_view(),
+        name="transaction-list-async",
+    ),
     path("transactions/pdf/", TransactionPDFView.as_view(), name="transaction-pdf"),
+    path("customers/import/", CustomerImportView.as_view(), name="customer-import"),
+    path(
+        "customers/import/<uuid:job_id>/",
+        CustomerImportStatusView.as_view(),
+        name="customer-import-status",
+    ),
 ]
@@ -1,60 +1,97 @@
-import secrets
-from os import getenv
-from typing import Union, List
-from django.db import transaction
-from .emails import send_account_creation_email
+from typing import List
 
-from .models import BankAccount
+import redis
+from django.conf import settings
+from django.db import transaction
+from loguru import logger
 
+from core_apps.common import luhn
+from core_apps.common.redis import get_redis_client
 
-def generate_account_number(currency: str) -> str:
-    bank_code = getenv("BANK_CODE")
-    branch_code = getenv("BANK_BRANCH_CODE")
+from .emails import send_account_creation_email
+from .models import BankAccount
 
-    currency_codes = {
-        "usd": getenv("CURRENCY_CODE_USD"),
-        "eur": getenv("CURRENCY_CODE_EUR"),
-        "xaf": getenv("CURRENCY_CODE_XAF"),
-    }
 
-    currency_code = currency_codes.get(currency)
+def account_number_prefix(currency: str) -> str:
+    currency_code = settings.ACCOUNT_CURRENCY_CODES.get(currency)
     if not currency_code:
         raise ValueError(f"Invalid currency: {currency}")
 
-    prefix = f"{bank_code}{branch_code}{currency_code}"
+    return f"{settings.BANK_CODE}{settings.BANK_BRANCH_CODE}{currency_code}"
+
 
-    remaining_digits = 16 - len(prefix) - 1
+def generate_account_number(currency: str) -> str:
+    return luhn.generate(account_number_prefix(currency), 16)
 
-    random_digits = "".join(
-        secrets.choice("0123456789") for _ in range(remaining_digits)
-    )
-    partial_account_number = f"{prefix}{random_digits}"
 
-    check_digit = calculate_luhn_check_digit(partial_account_number)
-    return f"{partial_account_number}{check_digit}"
+def generate_account_numbers(currency: str, count: int) -> List[str]:
+    return luhn.generate_batch(account_number_prefix(currency), 16, count)
 
 
 def calculate_luhn_check_digit(account_number: str) -> int:
-    def split_into_digits(number: Union[str, int]) -> List[int]:
-        return [int(digit) for digit in str(number)]
+    return luhn.check_digit(account_number)
+
+
+def generate_unique_account_numbers(currency: str, count: int) -> List[str]:
+    account_numbers: set = set()
+    while len(account_numbers) < count:
+        candidates = (
+            set(generate_account_numbers(currency, count - len(account_numbers)))
+            - account_numbers
+        )
+        taken = set(
+            BankAccount.objects.filter(account_number__in=candidates).values_list(
+                "account_number", flat=True
+            )
+        )
+        account_numbers |= candidates - taken
+    return list(account_numbers)
+
+
+def account_number_pool_key(currency: str) -> str:
+    return f"accounts:number-pool:{currency}"
+
+
+def refill_account_number_pool(currency: str, size: int = None) -> int:
+    size = size or settings.ACCOUNT_NUMBER_POOL_SIZE
+    client = get_redis_client()
+    key = account_number_pool_key(currency)
 
-    digits = split_into_digits(account_number)
-    odd_digits = digits[-1::-2]
-    even_digits = digits[-2::-2]
-    total = sum(odd_digits)
+    missing = size - client.scard(key)
+    if missing <= 0:
+        return 0
 
-    for digit in even_digits:
-        total += sum(split_into_digits(digit * 2))
+    return client.sadd(key, *generate_unique_account_numbers(currency, missing))
 
-    return (10 - (total % 10)) % 10
+
+def allocate_account_numbers(currency: str, count: int) -> List[str]:
+    """Hand out account numbers from the pre-generated pool.
+
+    SPOP never returns the same member twice, so concurrent account openings
+    cannot race for a number. If the pool is short or Redis is down the rest
+    are generated on the spot.
+    """
+    try:
+        popped = get_redis_client().spop(account_number_pool_key(currency), count)
+    except redis.RedisError as e:
+        logger.warning(f"Account number pool for {currency} unavailable: {e}")
+        popped = []
+
+    account_numbers = [number.decode() for number in popped or []]
+    if len(account_numbers) < count:
+        logger.warning(
+            f"Account number pool for {currency} ran short, "
+            f"generating {count - len(account_numbers)} numbers inline"
+        )
+        account_numbers += generate_unique_account_numbers(
+            currency, count - len(account_numbers)
+        )
+    return account_numbers
 
 
 def create_bank_account(user, currency: str, account_type: str) -> str:
     with transaction.atomic():  # All operation must before saving to the database for data integrity
-        while True:
-            account_number = generate_account_number(currency)
-            if not BankAccount.objects.filter(account_number=account_number).exists():
-                break
+        account_number = allocate_account_numbers(currency, 1)[0]
         is_primary = not BankAccount.objects.filter(user=user).exists()
 
         bank_account = BankAccount.objects.create(
@@ -65,6 +102,6 @@ def create_bank_account(user, currency: str, account_type: str) -> str:
             is_primary=is_primary,
         )
 
-        send_account_creation_email(user, bank_account)
+        transaction.on_commit(lambda: send_account_creation_email(user, bank_account))
 
     return bank_account
@@ -1,8 +1,9 @@
-import random
 from decimal import Decimal
 from typing import Any
+from uuid import UUID, uuid4
 
 from dateutil import parser
+from django.core.files.storage import default_storage
 from django.db import transaction
 from django.db.models import Q
 from django.utils import timezone
@@ -10,13 +11,17 @@ from django_filters.rest_framework import DjangoFilterBackend
 from loguru import logger
 from rest_framework import generics, status
 from rest_framework.filters import OrderingFilter
+from rest_framework.parsers import MultiPartParser
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework import status
 
-from core_apps.common.permissions import IsAccountExecutive, IsTeller
+from core_apps.common.async_views import AsyncAPIView, AsyncListModelMixin
+from core_apps.common.permissions import IsAccountExecutive, IsBranchManager, IsTeller
 from core_apps.common.renderers import GenericJSONRenderer
+from core_apps.user_auth.otp import OTPPurpose, issue_otp
+from .cache import get_account_by_number
 from .emails import (
     send_full_activation_email,
     send_deposit_email,
@@ -24,7 +29,8 @@ from .emails import (
     send_transfer_email,
 )
 from .models import BankAccount, Transaction
-from .tasks import generate_transaction_pdf
+from .onboarding import get_import_job, set_import_job
+from .tasks import generate_transaction_pdf, import_customers_from_file
 from .pagination import StandardResultsSetPagination
 from .serializers import (
     AccountVerificationSerializer,
@@ -69,7 +75,7 @@ class AccountVerificationView(generics.UpdateAPIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
             instance.kyc_submitted = kyc_submitted
-            instance.save()
+            instance.save(update_fields=["kyc_submitted", "updated_at"])
 
             if kyc_submitted and kyc_approved:
                 instance.kyc_approved = kyc_approved
@@ -82,7 +88,17 @@ class AccountVerificationView(generics.UpdateAPIView):
                 instance.approved_by = request.user
                 instance.fully_activated = True
                 instance.account_status = BankAccount.AccountStatus.ACTIVE
-                instance.save()
+                instance.save(
+                    update_fields=[
+                        "kyc_approved",
+                        "verification_date",
+                        "verification_notes",
+                        "approved_by",
+                        "fully_activated",
+                        "account_status",
+                        "updated_at",
+                    ]
+                )
 
                 send_full_activation_email(instance)
 
@@ -109,27 +125,30 @@ class DepositView(generics.CreateAPIView):
                 {"error": "Account number is required."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        try:
-            account = BankAccount.objects.get(account_number=account_number)
-            serializer = CustomerInfoSerializer(account)
-            return Response(serializer.data)
-        except BankAccount.DoesNotExist:
+        account = get_account_by_number(account_number)
+        if account is None:
             return Response(
                 {"error": "Account does not exist."},
                 status=status.HTTP_404_NOT_FOUND,
             )
+        serializer = CustomerInfoSerializer(account)
+        return Response(serializer.data)
 
     @transaction.atomic
     def create(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        account = serializer.context["account"]
+        # The validated account may come from the cache, so lock the live row
+        # before changing its balance.
+        account = BankAccount.objects.select_for_update().get(
+            pk=serializer.context["account"].pk
+        )
         amount = serializer.validated_data["amount"]
 
         try:
             account.account_balance += amount
             account.full_clean()
-            account.save()
+            account.save(update_fields=["account_balance", "updated_at"])
 
             logger.info(
                 f"Deposit of {amount} made to account {account.account_number} by "
@@ -172,19 +191,8 @@ class InitiateTransferView(generics.CreateAPIView):
         sender_account = data.get("sender_account")
         receiver_account = data.get("receiver_account")
 
-        try:
-            sender = BankAccount.objects.get(
-                account_number=sender_account, user=request.user
-            )
-            if not (sender.fully_activated and sender.kyc_approved):
-                return Response(
-                    {
-                        "error": "Sender account is not fully verified. "
-                        "Please complete the verification process by visiting any of our local branches"
-                    },
-                    status=status.HTTP_403_FORBIDDEN,
-                )
-        except BankAccount.DoesNotExist:
+        sender = get_account_by_number(sender_account) if sender_account else None
+        if sender is None or sender.user_id != request.user.id:
             return Response(
                 {
                     "error": "Sender account number does not exist."
@@ -192,6 +200,14 @@ class InitiateTransferView(generics.CreateAPIView):
                 },
                 status=status.HTTP_404_NOT_FOUND,
             )
+        if not (sender.fully_activated and sender.kyc_approved):
+            return Response(
+                {
+                    "error": "Sender account is not fully verified. "
+                    "Please complete the verification process by visiting any of our local branches"
+                },
+                status=status.HTTP_403_FORBIDDEN,
+            )
 
         serializer = self.get_serializer(data=data)
 
@@ -224,8 +240,7 @@ class VerifySecurityQuestionView(generics.CreateAPIView):
             data=request.data, context={"request": request}
         )
         if serializer.is_valid():
-            otp = "".join([str(random.randint(0, 9)) for _ in range(6)])
-            request.user.set_otp(otp)
+            otp = issue_otp(request.user.email, OTPPurpose.TRANSFER)
             send_transfer_otp_email(request.user.email, otp)
 
             return Response(
@@ -259,42 +274,54 @@ class VerifyOTPView(generics.CreateAPIView):
                 {"error": "Transfer data not found. Please start a new transfer."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        try:
-            sender_account = BankAccount.objects.get(
-                account_number=transfer_data["sender_account"]
-            )
-            receiver_account = BankAccount.objects.get(
-                account_number=transfer_data["receiver_account"]
-            )
-        except BankAccount.DoesNotExist:
-            return Response(
-                {"error": "Sender or receiver account not found."},
-                status=status.HTTP_404_NOT_FOUND,
-            )
         amount = Decimal(transfer_data["amount"])
 
-        if sender_account.account_balance < amount:
-            return Response(
-                {"error": "Insufficient funds."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
+        with transaction.atomic():
+            # The balance check only counts on the locked rows; earlier checks
+            # ran against unlocked reads. Locking in pk order keeps two
+            # opposing transfers from deadlocking.
+            accounts = {
+                account.account_number: account
+                for account in BankAccount.objects.select_for_update(of=("self",))
+                .select_related("user")
+                .filter(
+                    account_number__in=[
+                        transfer_data["sender_account"],
+                        transfer_data["receiver_account"],
+                    ]
+                )
+                .order_by("pk")
+            }
+            sender_account = accounts.get(transfer_data["sender_account"])
+            receiver_account = accounts.get(transfer_data["receiver_account"])
+            if sender_account is None or receiver_account is None:
+                return Response(
+                    {"error": "Sender or receiver account not found."},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
 
-        sender_account.account_balance -= amount
-        receiver_account.account_balance += amount
-        sender_account.save()
-        receiver_account.save()
-
-        transfer_transaction = Transaction.objects.create(
-            user=request.user,
-            sender=request.user,
-            sender_account=sender_account,
-            receiver=receiver_account.user,
-            receiver_account=receiver_account,
-            amount=amount,
-            description=transfer_data["description"],
-            transaction_type=Transaction.TransactionType.TRANSFER,
-            status=Transaction.TransactionStatus.COMPLETED,
-        )
+            if sender_account.account_balance < amount:
+                return Response(
+                    {"error": "Insufficient funds."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            sender_account.account_balance -= amount
+            receiver_account.account_balance += amount
+            sender_account.save(update_fields=["account_balance", "updated_at"])
+            receiver_account.save(update_fields=["account_balance", "updated_at"])
+
+            transfer_transaction = Transaction.objects.create(
+                user=request.user,
+                sender=request.user,
+                sender_account=sender_account,
+                receiver=receiver_account.user,
+                receiver_account=receiver_account,
+                amount=amount,
+                description=transfer_data["description"],
+                transaction_type=Transaction.TransactionType.TRANSFER,
+                status=Transaction.TransactionStatus.COMPLETED,
+            )
 
         del request.session["transfer_data"]
         send_transfer_email(
@@ -330,7 +357,14 @@ class TransactionListApiView(generics.ListAPIView):
 
     def get_queryset(self):
         user = self.request.user
-        queryset = Transaction.objects.filter(Q(sender=user) | Q(receiver=user))
+        queryset = Transaction.objects.filter(
+            Q(sender=user) | Q(receiver=user)
+        ).select_related(
+            "sender",
+            "receiver",
+            "sender_account__user",
+            "receiver_account__user",
+        )
         start_date = self.request.query_params.get("start_date")
         end_date = self.request.query_params.get("end_date")
         account_number = self.request.query_params.get("account_number")
@@ -373,6 +407,23 @@ class TransactionListApiView(generics.ListAPIView):
         return response
 
 
+class AsyncTransactionListApiView(
+    AsyncListModelMixin, AsyncAPIView, TransactionListApiView
+):
+    async def get(self, request, *args, **kwargs) -> Response:
+        response = await self.alist(request, *args, **kwargs)
+
+        account_number = request.query_params.get("account_number")
+        if account_number:
+            logger.info(
+                f"User {request.user.email} retrieved transactions for account {account_number}"
+            )
+        else:
+            logger.info(f"User {request.user.email} retrieved all transactions")
+
+        return response
+
+
 class TransactionPDFView(APIView):
     renderer_classes = [GenericJSONRenderer]
     object_label = "transaction_pdf"
@@ -410,3 +461,43 @@ class TransactionPDFView(APIView):
             {"message": "PDF generation initiated. You will receive an email shortly."},
             status=status.HTTP_202_ACCEPTED,
         )
+
+
+class CustomerImportView(APIView):
+    permission_classes = [IsBranchManager]
+    parser_classes = [MultiPartParser]
+    renderer_classes = [GenericJSONRenderer]
+    object_label = "customer_import"
+
+    def post(self, request: Request) -> Response:
+        upload = request.FILES.get("file")
+        if not upload:
+            return Response(
+                {"error": "A CSV file is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        job_id = uuid4()
+        path = default_storage.save(f"customer_imports/{job_id}.csv", upload)
+        set_import_job(job_id, "queued")
+        import_customers_from_file.delay(str(job_id), path)
+
+        logger.info(
+            f"Branch Manager {request.user.email} queued customer import {job_id}"
+        )
+        return Response(get_import_job(job_id), status=status.HTTP_202_ACCEPTED)
+
+
+class CustomerImportStatusView(APIView):
+    permission_classes = [IsBranchManager]
+    renderer_classes = [GenericJSONRenderer]
+    object_label = "customer_import"
+
+    def get(self, request: Request, job_id: UUID) -> Response:
+        job = get_import_job(job_id)
+        if job is None:
+            return Response(
+                {"error": "Customer import not found."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        return Response(job)
@@ -6,3 +6,6 @@ class CardsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "core_apps.cards"
     verbose_name = _("Cards")
+
+    def ready(self) -> None:
+        import core_apps.cards.signals
@@ -0,0 +1,328 @@
+import hmac
+import json
+import uuid
+from collections import defaultdict
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any
+
+import redis
+from django.db import transaction
+from django.db.models import Case, DecimalField, F, Value, When
+from django.utils import timezone
+from loguru import logger
+
+from core_apps.accounts.models import Transaction
+from core_apps.common.redis import get_redis_client
+from .cache import get_card_snapshot, invalidate_card
+from .models import VirtualCard
+from .utils import from_cents, to_cents
+
+# Every card with at least one unsettled hold.
+PENDING_CARDS_KEY = "cards:pending-holds"
+
+# Seeds the ledger from the card balance minus its pending and settling holds,
+# so a ledger key lost to eviction is rebuilt without counting any hold twice.
+_SEED_LEDGER = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    local held = 0
+    for _, key in ipairs({KEYS[2], KEYS[3]}) do
+        for _, hold in ipairs(redis.call('HVALS', key)) do
+            held = held + cjson.decode(hold)['amount']
+        end
+    end
+    redis.call('SET', KEYS[1], tonumber(ARGV[1]) - held)
+end
+"""
+
+AUTHORIZE_SCRIPT = (
+    _SEED_LEDGER
+    + """
+local amount = tonumber(ARGV[2])
+local available = tonumber(redis.call('GET', KEYS[1]))
+if available < amount then
+    return {0, available}
+end
+redis.call('DECRBY', KEYS[1], amount)
+redis.call('HSET', KEYS[2], ARGV[3], ARGV[4])
+redis.call('SADD', KEYS[4], ARGV[5])
+return {1, available - amount}
+"""
+)
+
+# A hold that a settlement run has claimed is about to be charged, so it can
+# no longer be released.
+RELEASE_SCRIPT = """
+local hold = redis.call('HGET', KEYS[2], ARGV[1])
+if not hold then
+    return 0
+end
+redis.call('HDEL', KEYS[2], ARGV[1])
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('INCRBY', KEYS[1], cjson.decode(hold)['amount'])
+end
+if redis.call('HLEN', KEYS[2]) + redis.call('HLEN', KEYS[3]) == 0 then
+    redis.call('SREM', KEYS[4], ARGV[2])
+end
+return 1
+"""
+
+CREDIT_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return redis.call('INCRBY', KEYS[1], ARGV[1])
+end
+return false
+"""
+
+# Moves every pending hold of a card into its settling hash and returns the
+# settling hash, which still holds the claims of a run that failed.
+CLAIM_SCRIPT = """
+local holds = redis.call('HGETALL', KEYS[1])
+for i = 1, #holds, 2 do
+    redis.call('HSET', KEYS[2], holds[i], holds[i + 1])
+end
+redis.call('DEL', KEYS[1])
+return redis.call('HGETALL', KEYS[2])
+"""
+
+# Settled holds are already part of the card balance; drop them without
+# touching the ledger, which deducted them at authorization time.
+CLEAR_SETTLED_SCRIPT = """
+redis.call('HDEL', KEYS[2], unpack(ARGV, 2))
+if redis.call('HLEN', KEYS[1]) + redis.call('HLEN', KEYS[2]) == 0 then
+    redis.call('SREM', KEYS[3], ARGV[1])
+end
+"""
+
+
+class CardDeclined(Exception):
+    def __init__(self, reason: str) -> None:
+        super().__init__(reason)
+        self.reason = reason
+
+
+def available_key(card_id: Any) -> str:
+    return f"cards:available:{card_id}"
+
+
+def holds_key(card_id: Any) -> str:
+    return f"cards:holds:{card_id}"
+
+
+def settling_key(card_id: Any) -> str:
+    return f"cards:settling:{card_id}"
+
+
+@lru_cache(maxsize=None)
+def script(source: str):
+    return get_redis_client().register_script(source)
+
+
+def authorize(
+    card_number: str, cvv: str, amount: Decimal, merchant: str
+) -> dict[str, Any]:
+    """Place a hold for amount on the card, or raise CardDeclined.
+
+    Reads only the cached card snapshot and the Redis ledger; the hold reaches
+    the database when settle_pending_holds runs.
+    """
+    card = get_card_snapshot(card_number)
+    if card is None:
+        raise CardDeclined("card_not_found")
+    if card["status"] != VirtualCard.CardStatus.ACTIVE:
+        raise CardDeclined("card_inactive")
+    if card["expiry_date"] < timezone.localdate():
+        raise CardDeclined("card_expired")
+    if not hmac.compare_digest(card["cvv"], str(cvv)):
+        raise CardDeclined("invalid_cvv")
+
+    cents = to_cents(amount)
+    if cents <= 0:
+        raise CardDeclined("invalid_amount")
+
+    hold_id = str(uuid.uuid4())
+    hold = json.dumps(
+        {
+            "amount": cents,
+            "merchant": merchant,
+            "created_at": timezone.now().isoformat(),
+        }
+    )
+    try:
+        approved, available = script(AUTHORIZE_SCRIPT)(
+            keys=[
+                available_key(card["id"]),
+                holds_key(card["id"]),
+                settling_key(card["id"]),
+                PENDING_CARDS_KEY,
+            ],
+            args=[card["balance_cents"], cents, hold_id, hold, card["id"]],
+        )
+    except redis.RedisError as e:
+        logger.error(f"Card authorization ledger unavailable: {e}")
+        raise CardDeclined("issuer_unavailable")
+
+    if not approved:
+        raise CardDeclined("insufficient_funds")
+    return {"hold_id": hold_id, "available": from_cents(available)}
+
+
+def release_hold(card_id: Any, hold_id: str) -> bool:
+    """Void a pending hold and give its amount back to the card.
+
+    Returns False when the hold is unknown or a settlement run has already
+    claimed it.
+    """
+    return bool(
+        script(RELEASE_SCRIPT)(
+            keys=[
+                available_key(card_id),
+                holds_key(card_id),
+                settling_key(card_id),
+                PENDING_CARDS_KEY,
+            ],
+            args=[hold_id, str(card_id)],
+        )
+    )
+
+
+def credit_available(card_id: Any, amount: Decimal) -> None:
+    try:
+        script(CREDIT_SCRIPT)(keys=[available_key(card_id)], args=[to_cents(amount)])
+    except redis.RedisError as e:
+        # Drop the ledger so the next authorization seeds it from the database.
+        logger.error(f"Failed to credit card ledger {card_id}: {e}")
+        reset_ledger(card_id)
+
+
+def reset_ledger(card_id: Any) -> None:
+    try:
+        get_redis_client().delete(available_key(card_id))
+    except redis.RedisError as e:
+        logger.error(f"Failed to reset card ledger {card_id}: {e}")
+
+
+def settle_pending_holds(batch_size: int = 500) -> int:
+    client = get_redis_client()
+    card_ids = [card_id.decode() for card_id in client.smembers(PENDING_CARDS_KEY)]
+
+    settled = 0
+    for start in range(0, len(card_ids), batch_size):
+        settled += settle_cards(card_ids[start : start + batch_size])
+    return settled
+
+
+def settle_cards(card_ids: list[str]) -> int:
+    """Write the pending holds of card_ids to the database in one transaction.
+
+    The holds are first claimed into the settling hash of their card, so they
+    cannot be released while they are being charged. Each hold becomes a
+    Transaction whose id is the hold id, so a run that dies between the
+    commit and clearing Redis cannot charge a hold twice; a run that dies
+    before the commit leaves its claims for the next run.
+    """
+    pipe = get_redis_client().pipeline(transaction=False)
+    for card_id in card_ids:
+        script(CLAIM_SCRIPT)(
+            keys=[holds_key(card_id), settling_key(card_id)], client=pipe
+        )
+    holds_by_card = {
+        card_id: {hold_id.decode(): json.loads(hold) for hold_id, hold in holds.items()}
+        for card_id, holds in zip(card_ids, map(pairs, pipe.execute()))
+    }
+
+    hold_ids = [hold_id for holds in holds_by_card.values() for hold_id in holds]
+    already_settled = {
+        str(pk)
+        for pk in Transaction.objects.filter(id__in=hold_ids).values_list(
+            "id", flat=True
+        )
+    }
+    cards = {
+        str(card.id): card
+        for card in VirtualCard.objects.filter(id__in=card_ids).only(
+            "id", "user_id", "bank_account_id", "card_number"
+        )
+    }
+
+    totals: dict = defaultdict(int)
+    transactions = []
+    for card_id, holds in holds_by_card.items():
+        card = cards.get(card_id)
+        if card is None:
+            logger.warning(f"Dropping {len(holds)} holds for deleted card {card_id}")
+            continue
+        for hold_id, hold in holds.items():
+            if hold_id in already_settled:
+                continue
+            totals[card_id] += hold["amount"]
+            transactions.append(settlement_transaction(card, hold_id, hold))
+
+    with transaction.atomic():
+        if totals:
+            VirtualCard.objects.filter(id__in=totals).update(
+                balance=F("balance")
+                - Case(
+                    *[
+                        When(id=card_id, then=Value(from_cents(cents)))
+                        for card_id, cents in totals.items()
+                    ],
+                    output_field=DecimalField(max_digits=10, decimal_places=2),
+                ),
+                updated_at=timezone.now(),
+            )
+            Transaction.objects.bulk_create(transactions)
+        transaction.on_commit(
+            lambda: finish_settlement(holds_by_card, list(cards.values()))
+        )
+
+    logger.info(f"Settled {len(transactions)} card holds on {len(totals)} cards")
+    return len(transactions)
+
+
+def pairs(flat: list) -> dict:
+    """Turn a flat HGETALL reply returned by a script into a dict."""
+    return dict(zip(flat[::2], flat[1::2]))
+
+
+def settlement_transaction(card: VirtualCard, hold_id: str, hold: dict) -> Transaction:
+    return Transaction(
+        id=hold_id,
+        user_id=card.user_id,
+        amount=from_cents(hold["amount"]),
+        description=(
+            f"Card payment to {hold['merchant']} with Visa card ending in "
+            f"{card.card_number[-4:]}"
+        ),
+        transaction_type=Transaction.TransactionType.WITHDRAWAL,
+        status=Transaction.TransactionStatus.COMPLETED,
+        sender_id=card.user_id,
+        sender_account_id=card.bank_account_id,
+    )
+
+
+def finish_settlement(holds_by_card: dict[str, dict], cards: list[VirtualCard]) -> None:
+    """Clear the settled holds, then drop the cached card snapshots.
+
+    A ledger seeded while the settled holds are still in Redis subtracts them
+    from the balance, so it must see the old balance: a snapshot dropped
+    before the commit or the clear would be reloaded with the new one and the
+    holds counted twice.
+    """
+    try:
+        clear_settled_holds(holds_by_card)
+    finally:
+        for card in cards:
+            invalidate_card(card)
+
+
+def clear_settled_holds(holds_by_card: dict[str, dict]) -> None:
+    pipe = get_redis_client().pipeline(transaction=False)
+    for card_id, holds in holds_by_card.items():
+        if holds:
+            script(CLEAR_SETTLED_SCRIPT)(
+                keys=[holds_key(card_id), settling_key(card_id), PENDING_CARDS_KEY],
+                args=[card_id, *holds],
+                client=pipe,
+            )
+    pipe.execute()
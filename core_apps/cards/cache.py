@@ -0,0 +1,30 @@
+from typing import Optional
+
+from core_apps.common.cache import cached_lookup, invalidate_lookup
+from .models import VirtualCard
+from .utils import to_cents
+
+CARD_BY_NUMBER = "card-by-number"
+
+
+def card_snapshot(card: VirtualCard) -> dict:
+    return {
+        "id": str(card.id),
+        "user_id": str(card.user_id),
+        "status": card.status,
+        "expiry_date": card.expiry_date,
+        "cvv": card.cvv,
+        "balance_cents": to_cents(card.balance),
+    }
+
+
+def get_card_snapshot(card_number: str) -> Optional[dict]:
+    def load() -> Optional[dict]:
+        card = VirtualCard.objects.filter(card_number=card_number).first()
+        return card_snapshot(card) if card else None
+
+    return cached_lookup(CARD_BY_NUMBER, card_number, load)
+
+
+def invalidate_card(card: VirtualCard) -> None:
+    invalidate_lookup(CARD_BY_NUMBER, card.card_number)
@@ -1,5 +1,5 @@
 from django.conf import settings
-from django.core.mail import EmailMultiAlternatives
+from django.core.mail import EmailMultiAlternatives, get_connection
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
 from loguru import logger
@@ -26,4 +26,31 @@ def send_virtual_card_topup_email(user, virtual_card, amount, new_balance):
         email.send()
         logger.info(f"Virtual card top-up email sent to {user.email}")
     except Exception as e:
-        logger.error(f"Failed to send virtual card top-up email to {user.email}: {e}")
\ No newline at end of file
+        logger.error(f"Failed to send virtual card top-up email to {user.email}: {e}")
+
+
+def send_virtual_card_expired_emails(cards):
+    subject = "Your Virtual Card Has Expired"
+    from_email = settings.DEFAULT_FROM_EMAIL
+
+    messages = []
+    for card in cards:
+        context = {
+            "user_full_name": card.user.fullname,
+            "card_last_four": card.card_number[-4:],
+            "expiry_date": card.expiry_date,
+            "site_name": settings.SITE_NAME,
+        }
+        html_email = render_to_string("emails/virtual_card_expired.html", context)
+        text_email = strip_tags(html_email)
+        messages.append(
+            EmailMultiAlternatives(subject, text_email, from_email, [card.user.email])
+        )
+
+    try:
+        sent = get_connection().send_messages(messages) or 0
+        logger.info(f"Sent {sent} virtual card expiry emails")
+        return sent
+    except Exception as e:
+        logger.error(f"Failed to send virtual card expiry emails: {e}")
+        return 0
@@ -0,0 +1,100 @@
+from typing import Any, Iterable
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count
+from django.utils import timezone
+from loguru import logger
+
+from core_apps.accounts.models import BankAccount
+from core_apps.common.utils import chunked
+from .models import VirtualCard
+from .utils import generate_cvv, generate_unique_card_numbers
+
+CARD_VALIDITY = timezone.timedelta(days=365 * 3)
+
+
+def card_expiry_date():
+    return (timezone.now() + CARD_VALIDITY).date()
+
+
+def issue_virtual_cards(
+    account_numbers: Iterable[str], batch_size: int = 500
+) -> dict[str, Any]:
+    """Issue one virtual card per account number, in order.
+
+    Each card belongs to the owner of its account. Accounts that do not
+    exist, are not active, or whose owner would go over
+    VirtualCard.MAX_CARDS_PER_USER, are skipped and reported in errors.
+    """
+    account_numbers = [number.strip() for number in account_numbers if number.strip()]
+    accounts = {
+        account.account_number: account
+        for account in BankAccount.objects.filter(
+            account_number__in=set(account_numbers)
+        ).only("id", "user_id", "account_number", "account_status")
+    }
+    card_counts = count_cards_per_user(
+        {account.user_id for account in accounts.values()}
+    )
+
+    errors, eligible = [], []
+    for account_number in account_numbers:
+        account = accounts.get(account_number)
+        if account is None:
+            error = "Bank account not found."
+        elif account.account_status != BankAccount.AccountStatus.ACTIVE:
+            # Bulk issuance is for accounts that are already open; a customer
+            # creating a card for their own account is not held to this.
+            error = "Bank account is not active."
+        elif card_counts.get(account.user_id, 0) >= VirtualCard.MAX_CARDS_PER_USER:
+            error = f"Card holder already has {VirtualCard.MAX_CARDS_PER_USER} virtual cards."
+        else:
+            card_counts[account.user_id] = card_counts.get(account.user_id, 0) + 1
+            eligible.append(account)
+            continue
+        errors.append({"account_number": account_number, "error": error})
+
+    created = 0
+    for batch in chunked(eligible, batch_size):
+        created += issue_batch(batch, errors)
+
+    logger.info(f"Issued {created} virtual cards, skipped {len(errors)}")
+    return {"created": created, "skipped": len(errors), "errors": errors}
+
+
+def count_cards_per_user(user_ids: set) -> dict:
+    return dict(
+        VirtualCard.objects.filter(user_id__in=user_ids)
+        .values("user_id")
+        .annotate(cards=Count("id"))
+        .values_list("user_id", "cards")
+    )
+
+
+def issue_batch(batch: list[BankAccount], errors: list[dict]) -> int:
+    card_numbers = generate_unique_card_numbers(len(batch))
+    expiry_date = card_expiry_date()
+    cvv_expiry = expiry_date.strftime("%m/%y")
+
+    cards = [
+        VirtualCard(
+            user_id=account.user_id,
+            bank_account=account,
+            card_number=card_number,
+            expiry_date=expiry_date,
+            cvv=generate_cvv(card_number, cvv_expiry),
+        )
+        for account, card_number in zip(batch, card_numbers)
+    ]
+
+    try:
+        with transaction.atomic():
+            VirtualCard.objects.bulk_create(cards)
+    except IntegrityError as e:
+        logger.error(f"Virtual card batch starting at {batch[0].account_number}: {e}")
+        errors.extend(
+            {"account_number": account.account_number, "error": "Batch failed."}
+            for account in batch
+        )
+        return 0
+    return len(cards)
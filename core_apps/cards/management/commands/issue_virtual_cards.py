@@ -0,0 +1,31 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core_apps.cards.issuance import issue_virtual_cards
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk issue virtual cards for a corporate programme, one card per bank "
+        "account number listed in the file (one per line)."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("accounts_path")
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        try:
+            with open(options["accounts_path"], encoding="utf-8") as stream:
+                result = issue_virtual_cards(stream, batch_size=options["batch_size"])
+        except OSError as e:
+            raise CommandError(str(e))
+
+        for error in result["errors"]:
+            self.stderr.write(f"{error['account_number']}: {error['error']}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Issued {result['created']} virtual cards, skipped {result['skipped']}"
+            )
+        )
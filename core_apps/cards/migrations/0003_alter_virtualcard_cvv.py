@@ -0,0 +1,18 @@
+# Generated by Django 4.2.15 on 2026-10-19 08:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cards", "0002_rename_expiration_date_virtualcard_expiry_date"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="virtualcard",
+            name="cvv",
+            field=models.CharField(max_length=16),
+        ),
+    ]
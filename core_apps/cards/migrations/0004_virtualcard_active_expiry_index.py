@@ -0,0 +1,21 @@
+# Generated by Django 4.2.15 on 2026-10-19 08:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cards", "0003_alter_virtualcard_cvv"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="virtualcard",
+            index=models.Index(
+                condition=models.Q(("status", "active")),
+                fields=["expiry_date"],
+                name="card_active_expiry_idx",
+            ),
+        ),
+    ]
@@ -15,6 +15,8 @@ class VirtualCard(TimeStampedModel):
         BLOCKED = "blocked", _("Blocked")
         EXPIRED = "expired", _("Expired")
 
+    MAX_CARDS_PER_USER = 3
+
     user = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name="virtual_cards"
     )
@@ -23,11 +25,20 @@ class VirtualCard(TimeStampedModel):
     )
     card_number = models.CharField(max_length=16, unique=True)
     expiry_date = models.DateField()
-    cvv = models.CharField(max_length=16, unique=True)
+    cvv = models.CharField(max_length=16)
     balance = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     status = models.CharField(
         max_length=10, choices=CardStatus.choices, default=CardStatus.ACTIVE
     )
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["expiry_date"],
+                condition=models.Q(status="active"),
+                name="card_active_expiry_idx",
+            )
+        ]
+
     def __str__(self):
         return f"{self.user.username}'s Virtual Card - {self.card_number}"
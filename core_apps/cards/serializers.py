@@ -1,10 +1,10 @@
 from decimal import Decimal
 
-from django.utils import timezone
 from rest_framework import serializers
 
+from .issuance import card_expiry_date
 from .models import VirtualCard
-from .utils import generate_card_number, generate_cvv
+from .utils import generate_cvv, generate_unique_card_numbers
 
 
 class UUIDField(serializers.Field):
@@ -31,20 +31,13 @@ class VirtualCardCreateSerializer(serializers.ModelSerializer):
         model = VirtualCard
         fields = ["bank_account_number"]
 
-    def validate(self, attrs):
-        user = self.context["request"].user
-        if user.virtual_cards.count() >= 3:
-            raise serializers.ValidationError(
-                "You can only have 3 virtual cards at a time."
-            )
-        return attrs
-
     def create(self, validated_data):
         user = validated_data["user"]
-        bank_account_number = validated_data["bank_account_number"]
-        bank_account = user.bank_accounts.get(account_number=bank_account_number)
-        card_number = generate_card_number()
-        expiry_date = (timezone.now() + timezone.timedelta(days=365 * 3)).date()
+        bank_account = validated_data.get("bank_account") or user.bank_accounts.get(
+            account_number=validated_data["bank_account_number"]
+        )
+        card_number = generate_unique_card_numbers(1)[0]
+        expiry_date = card_expiry_date()
         cvv = generate_cvv(card_number, expiry_date.strftime("%m/%y"))
 
         virtual_card = VirtualCard.objects.create(
@@ -55,3 +48,11 @@ class VirtualCardCreateSerializer(serializers.ModelSerializer):
             cvv=cvv,
         )
         return virtual_card
+
+
+class VirtualCardBulkIssueSerializer(serializers.Serializer):
+    bank_account_numbers = serializers.ListField(
+        child=serializers.CharField(max_length=20),
+        allow_empty=False,
+        max_length=10000,
+    )
@@ -0,0 +1,33 @@
+from typing import Any, Type
+
+from django.db import transaction
+from django.db.models.base import Model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authorization import reset_ledger
+from .cache import invalidate_card
+from .models import VirtualCard
+
+
+@receiver(post_save, sender=VirtualCard)
+def invalidate_cached_card(
+    sender: Type[Model], instance: VirtualCard, **kwargs: Any
+) -> None:
+    invalidate_card(instance)
+
+    # A balance written outside the authorization engine (admin, scripts)
+    # makes the ledger stale; rebuild it from the new balance on next use.
+    update_fields = kwargs.get("update_fields")
+    if update_fields is None or "balance" in update_fields:
+        card_id = instance.id
+        transaction.on_commit(lambda: reset_ledger(card_id))
+
+
+@receiver(post_delete, sender=VirtualCard)
+def delete_cached_card(
+    sender: Type[Model], instance: VirtualCard, **kwargs: Any
+) -> None:
+    invalidate_card(instance)
+    card_id = instance.id
+    transaction.on_commit(lambda: reset_ledger(card_id))
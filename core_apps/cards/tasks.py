@@ -0,0 +1,60 @@
+from celery import shared_task
+from django.db import transaction
+from django.utils import timezone
+from loguru import logger
+
+from .authorization import settle_pending_holds
+from .cache import invalidate_card
+from .emails import send_virtual_card_expired_emails
+from .models import VirtualCard
+
+
+@shared_task(name="settle_card_holds")
+def settle_card_holds(batch_size: int = 500) -> str:
+    settled = settle_pending_holds(batch_size)
+    logger.info(f"Settled {settled} card holds")
+    return f"Settled {settled} card holds"
+
+
+@shared_task(name="expire_virtual_cards")
+def expire_virtual_cards(batch_size: int = 1000) -> str:
+    """Mark active cards past their expiry date as expired, batch by batch.
+
+    Both the SELECT and the UPDATE of each batch are served by the partial
+    card_active_expiry_idx index.
+    """
+    today = timezone.localdate()
+    expiring = VirtualCard.objects.filter(
+        status=VirtualCard.CardStatus.ACTIVE, expiry_date__lt=today
+    )
+    expired = 0
+    while True:
+        cards = list(expiring.only("id", "card_number")[:batch_size])
+        if not cards:
+            break
+
+        card_ids = [card.id for card in cards]
+        with transaction.atomic():
+            expired += expiring.filter(id__in=card_ids).update(
+                status=VirtualCard.CardStatus.EXPIRED, updated_at=timezone.now()
+            )
+            transaction.on_commit(lambda cards=cards: finish_expiry(cards))
+
+    logger.info(f"Expired {expired} virtual cards")
+    return f"Expired {expired} virtual cards"
+
+
+def finish_expiry(cards: list[VirtualCard]) -> None:
+    # After the commit, so a snapshot reloaded right away sees the new status.
+    for card in cards:
+        invalidate_card(card)
+    send_card_expiry_notifications.delay([str(card.id) for card in cards])
+
+
+@shared_task(name="send_card_expiry_notifications")
+def send_card_expiry_notifications(card_ids: list) -> str:
+    cards = VirtualCard.objects.filter(
+        id__in=card_ids, status=VirtualCard.CardStatus.EXPIRED
+    ).select_related("user")
+    sent = send_virtual_card_expired_emails(cards)
+    return f"Sent {sent} virtual card expiry emails"
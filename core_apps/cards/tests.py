@@ -0,0 +1,296 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.core import mail
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core_apps.accounts.models import BankAccount, Transaction
+from core_apps.common.redis import get_redis_client
+from core_apps.user_auth.models import User
+from . import authorization, tasks
+from .cache import get_card_snapshot
+from .issuance import issue_virtual_cards
+from .models import VirtualCard
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+def create_customer(email: str, id_no: str) -> User:
+    return User.objects.create_user(
+        email=email,
+        password="Str0ng-Passw0rd!",
+        first_name="Card",
+        last_name="Holder",
+        id_no=id_no,
+        security_question=User.SecurityQuestions.PET_NAME,
+        security_answer="rex",
+    )
+
+
+def create_account(
+    user: User,
+    account_number: str,
+    status: str,
+    currency: str = BankAccount.AccountCurrency.USD,
+) -> BankAccount:
+    return BankAccount.objects.create(
+        user=user,
+        account_number=account_number,
+        currency=currency,
+        account_status=status,
+    )
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class VirtualCardIssuanceTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = create_customer("holder@example.com", "VC-0001")
+        cls.active = create_account(
+            cls.user, "1000000001", BankAccount.AccountStatus.ACTIVE
+        )
+        cls.inactive = create_account(
+            cls.user,
+            "1000000002",
+            BankAccount.AccountStatus.INACTIVE,
+            BankAccount.AccountCurrency.EUR,
+        )
+
+    def test_bulk_issue_skips_inactive_accounts(self) -> None:
+        result = issue_virtual_cards(
+            [self.active.account_number, self.inactive.account_number, "404"]
+        )
+
+        self.assertEqual(result["created"], 1)
+        self.assertEqual(
+            result["errors"],
+            [
+                {
+                    "account_number": self.inactive.account_number,
+                    "error": "Bank account is not active.",
+                },
+                {"account_number": "404", "error": "Bank account not found."},
+            ],
+        )
+        card = VirtualCard.objects.get()
+        self.assertEqual(card.bank_account_id, self.active.id)
+        self.assertEqual(card.user_id, self.user.id)
+
+    def test_create_rejects_foreign_accounts_only(self) -> None:
+        other = create_customer("other@example.com", "VC-0002")
+        foreign = create_account(other, "1000000003", BankAccount.AccountStatus.ACTIVE)
+        client = APIClient()
+        client.force_authenticate(self.user)
+        url = reverse("virtual-card-list-create")
+
+        response = client.post(url, {"bank_account_number": foreign.account_number})
+        self.assertEqual(response.status_code, 403)
+
+        # Unlike bulk issuance, a customer may add a card to an account that
+        # is not active yet.
+        for account in (self.active, self.inactive):
+            response = client.post(url, {"bank_account_number": account.account_number})
+            self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            set(VirtualCard.objects.values_list("bank_account_id", flat=True)),
+            {self.active.id, self.inactive.id},
+        )
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class CardSettlementTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        user = create_customer("settle@example.com", "VC-0003")
+        account = create_account(user, "1000000004", BankAccount.AccountStatus.ACTIVE)
+        cls.card = VirtualCard.objects.create(
+            user=user,
+            bank_account=account,
+            card_number="4000000000000002",
+            expiry_date=date(2099, 12, 31),
+            cvv="123",
+            balance=Decimal("100.00"),
+        )
+
+    def setUp(self) -> None:
+        # Card snapshots cached by an earlier test carry its balance.
+        cache.clear()
+        self.card_id = str(self.card.id)
+        self.redis = get_redis_client()
+        self.addCleanup(self.clear_redis)
+
+    def clear_redis(self) -> None:
+        self.redis.delete(
+            authorization.available_key(self.card_id),
+            authorization.holds_key(self.card_id),
+            authorization.settling_key(self.card_id),
+        )
+        self.redis.srem(authorization.PENDING_CARDS_KEY, self.card_id)
+
+    def authorize(self, amount: str) -> str:
+        return authorization.authorize(
+            self.card.card_number, "123", Decimal(amount), "Coffee Shop"
+        )["hold_id"]
+
+    def available(self) -> int:
+        return int(self.redis.get(authorization.available_key(self.card_id)))
+
+    def settle(self) -> int:
+        with self.captureOnCommitCallbacks(execute=True):
+            return authorization.settle_cards([self.card_id])
+
+    def test_release_during_settlement_is_refused(self) -> None:
+        hold_id = self.authorize("30.00")
+        released = []
+        settlement_transaction = authorization.settlement_transaction
+
+        def release_mid_settlement(card, hold_id, hold):
+            released.append(authorization.release_hold(self.card_id, hold_id))
+            return settlement_transaction(card, hold_id, hold)
+
+        with mock.patch.object(
+            authorization, "settlement_transaction", release_mid_settlement
+        ):
+            self.assertEqual(self.settle(), 1)
+
+        self.assertEqual(released, [False])
+        self.card.refresh_from_db()
+        self.assertEqual(self.card.balance, Decimal("70.00"))
+        self.assertTrue(Transaction.objects.filter(id=hold_id).exists())
+        # The refused release gave nothing back to the ledger.
+        self.assertEqual(
+            int(self.redis.get(authorization.available_key(self.card_id))), 7000
+        )
+        self.assertFalse(self.redis.exists(authorization.settling_key(self.card_id)))
+        self.assertFalse(
+            self.redis.sismember(authorization.PENDING_CARDS_KEY, self.card_id)
+        )
+
+    def test_ledger_reseeded_around_settlement_counts_holds_once(self) -> None:
+        self.authorize("30.00")
+        clear_settled_holds = authorization.clear_settled_holds
+
+        def reseed_then_clear(holds_by_card):
+            # The ledger is lost and rebuilt after the commit, while the
+            # settled hold is still in the settling hash.
+            authorization.reset_ledger(self.card_id)
+            self.authorize("10.00")
+            clear_settled_holds(holds_by_card)
+
+        with mock.patch.object(authorization, "clear_settled_holds", reseed_then_clear):
+            self.assertEqual(self.settle(), 1)
+        self.assertEqual(self.available(), 6000)
+
+        # Rebuilt again once settlement is done, from the new balance.
+        authorization.reset_ledger(self.card_id)
+        self.authorize("5.00")
+        self.assertEqual(self.available(), 5500)
+
+    def test_released_hold_is_not_settled(self) -> None:
+        released_hold = self.authorize("30.00")
+        kept_hold = self.authorize("20.00")
+        self.assertTrue(authorization.release_hold(self.card_id, released_hold))
+
+        self.assertEqual(self.settle(), 1)
+        self.card.refresh_from_db()
+        self.assertEqual(self.card.balance, Decimal("80.00"))
+        self.assertFalse(Transaction.objects.filter(id=released_hold).exists())
+        self.assertTrue(Transaction.objects.filter(id=kept_hold).exists())
+        self.assertFalse(authorization.release_hold(self.card_id, kept_hold))
+
+    def test_failed_settlement_is_retried(self) -> None:
+        hold_id = self.authorize("30.00")
+
+        with mock.patch.object(
+            Transaction.objects, "bulk_create", side_effect=RuntimeError
+        ):
+            with self.assertRaises(RuntimeError):
+                self.settle()
+        # The claim survives the failed run and still cannot be released.
+        self.assertFalse(authorization.release_hold(self.card_id, hold_id))
+        self.assertTrue(
+            self.redis.sismember(authorization.PENDING_CARDS_KEY, self.card_id)
+        )
+
+        self.assertEqual(self.settle(), 1)
+        self.card.refresh_from_db()
+        self.assertEqual(self.card.balance, Decimal("70.00"))
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class CardExpiryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        user = create_customer("expiry@example.com", "VC-0004")
+        account = create_account(user, "1000000005", BankAccount.AccountStatus.ACTIVE)
+        yesterday = timezone.localdate() - timedelta(days=1)
+
+        def card(number: str, expiry_date: date, status: str) -> VirtualCard:
+            return VirtualCard.objects.create(
+                user=user,
+                bank_account=account,
+                card_number=number,
+                expiry_date=expiry_date,
+                cvv="123",
+                status=status,
+            )
+
+        active = VirtualCard.CardStatus.ACTIVE
+        cls.overdue = [card(f"400000000000001{i}", yesterday, active) for i in range(3)]
+        cls.blocked = card(
+            "4000000000000020", yesterday, VirtualCard.CardStatus.BLOCKED
+        )
+        cls.current = card("4000000000000021", date(2099, 12, 31), active)
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_expires_overdue_active_cards_in_batches(self) -> None:
+        for card in self.overdue:
+            get_card_snapshot(card.card_number)
+
+        with mock.patch.object(tasks.send_card_expiry_notifications, "delay") as notify:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.assertEqual(
+                    tasks.expire_virtual_cards(batch_size=2), "Expired 3 virtual cards"
+                )
+
+        # One notification per batch, for the cards that batch expired.
+        self.assertEqual([len(call.args[0]) for call in notify.call_args_list], [2, 1])
+        self.assertEqual(
+            {card_id for call in notify.call_args_list for card_id in call.args[0]},
+            {str(card.id) for card in self.overdue},
+        )
+        statuses = dict(VirtualCard.objects.values_list("card_number", "status"))
+        for card in self.overdue:
+            self.assertEqual(statuses[card.card_number], VirtualCard.CardStatus.EXPIRED)
+            # The cached snapshot was dropped and reloads with the new status.
+            self.assertEqual(
+                get_card_snapshot(card.card_number)["status"],
+                VirtualCard.CardStatus.EXPIRED,
+            )
+        self.assertEqual(
+            statuses[self.blocked.card_number], VirtualCard.CardStatus.BLOCKED
+        )
+        self.assertEqual(
+            statuses[self.current.card_number], VirtualCard.CardStatus.ACTIVE
+        )
+
+    def test_notifications_skip_cards_whose_status_changed(self) -> None:
+        expired, reactivated = self.overdue[:2]
+        VirtualCard.objects.filter(pk=expired.pk).update(
+            status=VirtualCard.CardStatus.EXPIRED
+        )
+
+        result = tasks.send_card_expiry_notifications(
+            [str(expired.id), str(reactivated.id), str(self.blocked.id)]
+        )
+
+        self.assertEqual(result, "Sent 1 virtual card expiry emails")
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn(expired.card_number[-4:], mail.outbox[0].body)
@@ -0,0 +1,80 @@
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core_apps.accounts.cache import invalidate_account
+from core_apps.accounts.models import BankAccount, Transaction
+from core_apps.accounts.realtime import publish_user_event
+from .authorization import credit_available
+from .cache import invalidate_card
+from .emails import send_virtual_card_topup_email
+from .models import VirtualCard
+
+
+class InsufficientFunds(Exception):
+    pass
+
+
+def top_up_virtual_card(
+    user, virtual_card: VirtualCard, amount: Decimal
+) -> Transaction:
+    """Move amount from the card's linked account onto the card.
+
+    The debit is a conditional UPDATE, so the balance check and the write are
+    one statement and concurrent top-ups can neither overdraw the account nor
+    lose an update. No row is locked beyond the UPDATE itself.
+    """
+    bank_account = virtual_card.bank_account
+    now = timezone.now()
+
+    with transaction.atomic():
+        debited = BankAccount.objects.filter(
+            pk=bank_account.pk, account_balance__gte=amount
+        ).update(account_balance=F("account_balance") - amount, updated_at=now)
+        if not debited:
+            raise InsufficientFunds
+
+        VirtualCard.objects.filter(pk=virtual_card.pk).update(
+            balance=F("balance") + amount, updated_at=now
+        )
+        virtual_card.balance, bank_account.account_balance = (
+            VirtualCard.objects.filter(pk=virtual_card.pk)
+            .values_list("balance", "bank_account__account_balance")
+            .get()
+        )
+
+        topup = Transaction.objects.create(
+            user=user,
+            amount=amount,
+            description=f"Top-up for Visa card ending in {virtual_card.card_number[-4:]}",
+            transaction_type=Transaction.TransactionType.DEPOSIT,
+            status=Transaction.TransactionStatus.COMPLETED,
+            sender=user,
+            receiver=user,
+            sender_account=bank_account,
+            receiver_account=bank_account,
+        )
+
+        # QuerySet.update() skips post_save, so do what the account and card
+        # signals would have done; the card ledger is credited, not rebuilt.
+        invalidate_account(bank_account)
+        invalidate_card(virtual_card)
+        transaction.on_commit(lambda: credit_available(virtual_card.pk, amount))
+        balance_payload = {
+            "account_number": bank_account.account_number,
+            "account_balance": str(bank_account.account_balance),
+            "currency": bank_account.currency,
+        }
+        transaction.on_commit(
+            lambda: publish_user_event(
+                bank_account.user_id, "balance.updated", balance_payload
+            )
+        )
+        transaction.on_commit(
+            lambda: send_virtual_card_topup_email(
+                user, virtual_card, amount, virtual_card.balance
+            )
+        )
+    return topup
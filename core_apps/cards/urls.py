@@ -1,6 +1,8 @@
 from django.urls import path
 
 from .views import (
+    AsyncVirtualCardListAPIView,
+    VirtualCardBulkIssueAPIView,
     VirtualCardDetailApiView,
     VirtualCardListCreateAPIView,
     VirtualCardTopUpAPIView
@@ -8,6 +10,8 @@ from .views import (
 
 urlpatterns = [
     path("virtual-cards/", VirtualCardListCreateAPIView.as_view(), name="virtual-card-list-create"),
+    path("virtual-cards/bulk-issue/", VirtualCardBulkIssueAPIView.as_view(), name="virtual-card-bulk-issue"),
+    path("virtual-cards/async/", AsyncVirtualCardListAPIView.as_view(), name="virtual-card-list-async"),
     path("virtual-cards/<uuid:pk>/", VirtualCardDetailApiView.as_view(), name="virtual-card-detail"),
     path("virtual-cards/<uuid:pk>/top-up/", VirtualCardTopUpAPIView.as_view(), name="virtual-card-topup"),
 ]
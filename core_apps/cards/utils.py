@@ -1,38 +1,73 @@
 import hashlib
 import hmac
-import random
+from decimal import ROUND_HALF_UP, Decimal
+from functools import lru_cache
 from os import getenv
+from typing import List
+
+from core_apps.common import luhn
+from .models import VirtualCard
 
 BANK_CARD_PREFIX = getenv("BANK_CARD_PREFIX")
 BANK_CARD_CODE = getenv("BANK_CARD_CODE")
+CVV_SECRET_KEY = getenv("CVV_SECRET_KEY")
+CENT = Decimal("0.01")
+
 
-def generate_card_number(prefix=BANK_CARD_PREFIX, card_code=BANK_CARD_CODE, length=16) -> str:
+def generate_card_number(
+    prefix=BANK_CARD_PREFIX, card_code=BANK_CARD_CODE, length=16
+) -> str:
     total_prefix = prefix + card_code
-    random_digits_length = length - len(total_prefix)-1
 
-    if random_digits_length < 0:
+    if length - len(total_prefix) - 1 < 0:
         raise ValueError("Prefix and code are too long for the specified card length")
 
-    number = total_prefix + ''.join([str(random.randint(0, 9)) for _ in range(random_digits_length)])
+    return luhn.generate(total_prefix, length)
 
-    digits = [int(d) for d in number]
 
-    for i in range(len(digits) - 1, -1, -2):
-        digits[i] *= 2
-        if digits[i] > 9:
-            digits[i] -= 9
+def generate_unique_card_numbers(
+    count: int, prefix=BANK_CARD_PREFIX, card_code=BANK_CARD_CODE, length=16
+) -> List[str]:
+    card_numbers: set = set()
+    while len(card_numbers) < count:
+        candidates = (
+            set(
+                luhn.generate_batch(
+                    prefix + card_code, length, count - len(card_numbers)
+                )
+            )
+            - card_numbers
+        )
+        taken = set(
+            VirtualCard.objects.filter(card_number__in=candidates).values_list(
+                "card_number", flat=True
+            )
+        )
+        card_numbers |= candidates - taken
+    return list(card_numbers)
 
-    check_digit = (10 - (sum(digits) % 10)) % 10
 
-    return number + str(check_digit)
+@lru_cache(maxsize=1)
+def cvv_hmac() -> "hmac.HMAC":
+    # Keying the HMAC hashes the secret into the inner/outer pads; copy() of a
+    # keyed object skips that work for every CVV derived afterwards.
+    return hmac.new(CVV_SECRET_KEY.encode(), digestmod=hashlib.sha256)
 
-def generate_cvv(card_number, expiry_date):
-    secret_key = getenv("CVV_SECRET_KEY")
 
-    data = f"{card_number}{expiry_date}{secret_key}"
+def generate_cvv(card_number, expiry_date):
+    data = f"{card_number}{expiry_date}{CVV_SECRET_KEY}"
 
-    hmac_obj = hmac.new(secret_key.encode(), data.encode(), hashlib.sha256)
+    hmac_obj = cvv_hmac().copy()
+    hmac_obj.update(data.encode())
 
     cvv = str(int(hmac_obj.hexdigest(), 16))[:3]
 
-    return cvv.zfill(3)
\ No newline at end of file
+    return cvv.zfill(3)
+
+
+def to_cents(amount: Decimal) -> int:
+    return int(Decimal(amount).quantize(CENT, rounding=ROUND_HALF_UP) * 100)
+
+
+def from_cents(cents: int) -> Decimal:
+    return (Decimal(cents) / 100).quantize(CENT)
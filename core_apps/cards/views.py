@@ -1,16 +1,23 @@
 from decimal import Decimal, InvalidOperation
 
-from django.db import transaction
 from loguru import logger
 from rest_framework import generics, status
 from rest_framework.exceptions import PermissionDenied
+from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
-from core_apps.accounts.models import Transaction
+from core_apps.common.async_views import AsyncAPIView, AsyncListModelMixin
+from core_apps.common.permissions import IsBranchManager
 from core_apps.common.renderers import GenericJSONRenderer
-from .emails import send_virtual_card_topup_email
+from .issuance import issue_virtual_cards
 from .models import VirtualCard
-from .serializers import VirtualCardCreateSerializer, VirtualCardSerializer
+from .serializers import (
+    VirtualCardBulkIssueSerializer,
+    VirtualCardCreateSerializer,
+    VirtualCardSerializer,
+)
+from .topup import InsufficientFunds, top_up_virtual_card
 
 
 class VirtualCardListCreateAPIView(generics.ListCreateAPIView):
@@ -27,25 +34,29 @@ class VirtualCardListCreateAPIView(generics.ListCreateAPIView):
         return VirtualCardSerializer
 
     def create(self, request, *args, **kwargs) -> Response:
-        if request.user.virtual_cards.count() >= 3:
+        if request.user.virtual_cards.count() >= VirtualCard.MAX_CARDS_PER_USER:
             return Response(
-                {"error": "You can only have 3 virtual cards at a time."},
+                {
+                    "error": f"You can only have {VirtualCard.MAX_CARDS_PER_USER} virtual cards at a time."
+                },
                 status=status.HTTP_400_BAD_REQUEST,
             )
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
         bank_account_number = serializer.validated_data["bank_account_number"]
-        bank_account = request.user.bank_accounts.all()
+        bank_account = request.user.bank_accounts.filter(
+            account_number=bank_account_number
+        ).first()
 
-        if not bank_account.filter(account_number=bank_account_number).exists():
+        if bank_account is None:
             return Response(
                 {
                     "error": "You can only create a virtual card linked to your own bank account"
                 },
                 status=status.HTTP_403_FORBIDDEN,
             )
-        virtual_card = serializer.save(user=request.user)
+        virtual_card = serializer.save(user=request.user, bank_account=bank_account)
         logger.info(
             f"Virtual card number {virtual_card.card_number} created for user {request.user.username}"
         )
@@ -55,6 +66,21 @@ class VirtualCardListCreateAPIView(generics.ListCreateAPIView):
         )
 
 
+class AsyncVirtualCardListAPIView(
+    AsyncListModelMixin, AsyncAPIView, generics.GenericAPIView
+):
+    renderer_classes = [GenericJSONRenderer]
+    serializer_class = VirtualCardSerializer
+    object_label = "visa_card"
+
+    def get_queryset(self):
+        user = self.request.user
+        return VirtualCard.objects.filter(user=user)
+
+    async def get(self, request, *args, **kwargs) -> Response:
+        return await self.alist(request, *args, **kwargs)
+
+
 class VirtualCardDetailApiView(generics.RetrieveDestroyAPIView):
     renderer_classes = [GenericJSONRenderer]
     serializer_class = VirtualCardSerializer
@@ -111,9 +137,8 @@ class VirtualCardTopUpAPIView(generics.UpdateAPIView):
 
     def get_queryset(self):
         user = self.request.user
-        return VirtualCard.objects.filter(user=user)
+        return VirtualCard.objects.filter(user=user).select_related("bank_account")
 
-    @transaction.atomic
     def update(self, request, *args, **kwargs):
         virtual_card = self.get_object()
         amount = request.data.get("amount")
@@ -130,39 +155,42 @@ class VirtualCardTopUpAPIView(generics.UpdateAPIView):
                 {"error": "Invalid top-up amount."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
+        if not amount.is_finite():
+            return Response(
+                {"error": "Invalid top-up amount."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
         if amount <= 0:
             return Response(
                 {"error": "Top-up amount must be greater than 0."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        bank_account = virtual_card.bank_account
-        if bank_account.account_balance < amount:
+        try:
+            topup = top_up_virtual_card(request.user, virtual_card, amount)
+        except InsufficientFunds:
             return Response(
                 {"error": "Insufficient funds in the linked bank account."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        bank_account.account_balance -= amount
-        virtual_card.balance += amount
-        bank_account.save()
-        virtual_card.save()
-
-        transaction = Transaction.objects.create(
-            user=request.user,
-            amount=amount,
-            description=f"Top-up for Visa card ending in {virtual_card.card_number[-4:]}",
-            transaction_type=Transaction.TransactionType.DEPOSIT,
-            status=Transaction.TransactionStatus.COMPLETED,
-            sender=request.user,
-            receiver=request.user,
-            sender_account=bank_account,
-            receiver_account=bank_account,
-        )
-        send_virtual_card_topup_email(
-            request.user, virtual_card, amount, virtual_card.balance
-        )
         logger.info(
-            f"Virtual card number {virtual_card.card_number} topped up with {amount} for user {request.user.fullname}. Transaction ID: {transaction.id}"
+            f"Virtual card number {virtual_card.card_number} topped up with {amount} for user {request.user.fullname}. Transaction ID: {topup.id}"
         )
 
         return Response(VirtualCardSerializer(virtual_card).data)
+
+
+class VirtualCardBulkIssueAPIView(APIView):
+    permission_classes = [IsBranchManager]
+    renderer_classes = [GenericJSONRenderer]
+    object_label = "virtual_card_issue"
+
+    def post(self, request: Request) -> Response:
+        serializer = VirtualCardBulkIssueSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        result = issue_virtual_cards(serializer.validated_data["bank_account_numbers"])
+        logger.info(
+            f"Branch Manager {request.user.email} issued {result['created']} virtual cards"
+        )
+        return Response(result, status=status.HTTP_201_CREATED)
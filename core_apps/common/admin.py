@@ -4,7 +4,7 @@ from django.contrib.contenttypes.admin import GenericTabularInline
 from django.http import HttpRequest
 from django.utils.translation import gettext_lazy as _
 
-from .models import ContentView
+from .models import ContentView, ContentViewDailyRollup
 
 
 @admin.register(ContentView)
@@ -67,6 +67,19 @@ class ContentViewAdmin(admin.ModelAdmin):
         return False
 
 
+@admin.register(ContentViewDailyRollup)
+class ContentViewDailyRollupAdmin(admin.ModelAdmin):
+    list_display = ["content_type", "object_id", "day", "viewers"]
+    list_filter = ["content_type", "day"]
+    search_fields = ["object_id"]
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        return False
+
+    def has_change_permission(self, request: HttpRequest, obj: Any = None) -> bool:
+        return False
+
+
 class ContentViewInline(GenericTabularInline):
     model = ContentView
     readonly_fields = ["user", "viewer_ip", "last_viewed_at", "created_at"]
@@ -0,0 +1,85 @@
+from typing import Any, Optional
+
+from asgiref.sync import sync_to_async
+from django.core.paginator import InvalidPage
+from django.db.models import QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+
+class AsyncAPIView(APIView):
+    """APIView with coroutine handlers; auth, permissions and throttles run in a thread."""
+
+    async def dispatch(self, request, *args: Any, **kwargs: Any):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(
+                    self, request.method.lower(), self.http_method_not_allowed
+                )
+            else:
+                handler = self.http_method_not_allowed
+
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def options(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return await sync_to_async(super().options)(request, *args, **kwargs)
+
+
+class AsyncListModelMixin:
+    """Async ListModelMixin; serializers must not lazy-load relations (use select_related)."""
+
+    async def alist(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        queryset = await sync_to_async(self.get_queryset)()
+        queryset = self.filter_queryset(queryset)
+
+        page = await self.apaginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.get_serializer([obj async for obj in queryset], many=True)
+        return Response(serializer.data)
+
+    async def apaginate_queryset(self, queryset: QuerySet) -> Optional[list]:
+        pagination = self.paginator
+        if pagination is None:
+            return None
+
+        page_size = pagination.get_page_size(self.request)
+        if not page_size:
+            return None
+
+        paginator = pagination.django_paginator_class(queryset, page_size)
+        paginator.count = await queryset.acount()
+        page_number = pagination.get_page_number(self.request, paginator)
+
+        try:
+            pagination.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(
+                pagination.invalid_page_message.format(
+                    page_number=page_number, message=str(exc)
+                )
+            )
+
+        pagination.page.object_list = [obj async for obj in pagination.page.object_list]
+        if paginator.num_pages > 1 and pagination.template is not None:
+            pagination.display_page_controls = True
+
+        pagination.request = self.request
+        return list(pagination.page)
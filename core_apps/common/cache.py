@@ -0,0 +1,76 @@
+import random
+from typing import Any, Callable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+_MISSING = object()
+
+
+def lookup_key(namespace: str, identifier: Any) -> str:
+    return f"lookup:{namespace}:{identifier}"
+
+
+def stats_key(namespace: str, outcome: str) -> str:
+    return f"lookup-stats:{namespace}:{outcome}"
+
+
+def cached_lookup(
+    namespace: str,
+    identifier: Any,
+    loader: Callable[[], Optional[Any]],
+    timeout: Optional[int] = None,
+) -> Optional[Any]:
+    key = lookup_key(namespace, identifier)
+    value = cache.get(key, _MISSING, version=settings.CACHE_LOOKUP_VERSION)
+
+    if value is not _MISSING:
+        record_lookup(namespace, "hits")
+        return value
+
+    record_lookup(namespace, "misses")
+    value = loader()
+    if value is not None:
+        cache.set(
+            key,
+            value,
+            timeout=timeout or settings.CACHE_LOOKUP_TIMEOUT,
+            version=settings.CACHE_LOOKUP_VERSION,
+        )
+    return value
+
+
+def invalidate_lookup(namespace: str, identifier: Any) -> None:
+    key = lookup_key(namespace, identifier)
+    cache.delete(key, version=settings.CACHE_LOOKUP_VERSION)
+    # A reader may repopulate the key from the old row before the writing
+    # transaction commits, so drop it again once the new row is visible.
+    transaction.on_commit(
+        lambda: cache.delete(key, version=settings.CACHE_LOOKUP_VERSION)
+    )
+
+
+def record_lookup(namespace: str, outcome: str) -> None:
+    # Every counted lookup costs a cache write, so only a sample is counted.
+    # Hits and misses are sampled alike, which keeps the ratio unbiased.
+    sample_rate = settings.CACHE_LOOKUP_STATS_SAMPLE_RATE
+    if sample_rate <= 0 or random.random() >= sample_rate:
+        return
+
+    key = stats_key(namespace, outcome)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+def lookup_hit_ratio(namespace: str) -> dict:
+    hits = cache.get(stats_key(namespace, "hits"), 0)
+    misses = cache.get(stats_key(namespace, "misses"), 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": hits / total if total else 0.0,
+    }
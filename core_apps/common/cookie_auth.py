@@ -4,19 +4,19 @@ from django.conf import settings
 from loguru import logger
 from rest_framework.request import Request
 from rest_framework_simplejwt.authentication import AuthUser, JWTAuthentication
-from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken,
+    TokenError,
+)
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.tokens import Token
+from rest_framework_simplejwt.utils import get_md5_hash_password
 
 
 class CustomJWTAuthentication(JWTAuthentication):
     def authenticate(self, request: Request) -> Optional[tuple[AuthUser, Token]]:
-        header = self.get_header(request)
-        raw_token = None
-
-        if header is not None:
-            raw_token = self.get_raw_token(header)
-        elif settings.COOKIE_NAME in request.COOKIES:
-            raw_token = request.COOKIES.get(settings.COOKIE_NAME)
+        raw_token = self.get_request_raw_token(request)
 
         if raw_token is not None:
             try:
@@ -25,3 +25,39 @@ class CustomJWTAuthentication(JWTAuthentication):
             except TokenError as e:
                 logger.error(f"Token validation error: {str(e)}")
         return None
+
+    def get_user(self, validated_token: Token) -> AuthUser:
+        from core_apps.user_auth.cache import get_user_for_token
+
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken("Token contained no recognizable user identification")
+
+        user = get_user_for_token(validated_token)
+        if user is None:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(
+                "The user's password has been changed.", code="password_changed"
+            )
+        return user
+
+    def get_request_raw_token(self, request: Request) -> Optional[bytes]:
+        header = self.get_header(request)
+
+        if header is not None:
+            return self.get_raw_token(header)
+        return request.COOKIES.get(settings.COOKIE_NAME)
+
+    def get_request_user_id(self, request: Request) -> Optional[str]:
+        raw_token = self.get_request_raw_token(request)
+        if raw_token is None:
+            return None
+        try:
+            validated_token = self.get_validated_token(raw_token)
+        except InvalidToken:
+            return None
+        return validated_token.get(api_settings.USER_ID_CLAIM)
@@ -0,0 +1,54 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional
+
+from django.conf import settings
+from django.db.models import Model
+
+_read_from_replica: ContextVar[bool] = ContextVar("read_from_replica", default=False)
+_request_writes: ContextVar[Optional[set]] = ContextVar("request_writes", default=None)
+
+
+def replica_configured() -> bool:
+    return settings.REPLICA_DATABASE in settings.DATABASES
+
+
+@contextmanager
+def use_replica(enabled: bool = True) -> Iterator[None]:
+    token = _read_from_replica.set(enabled)
+    try:
+        yield
+    finally:
+        _read_from_replica.reset(token)
+
+
+@contextmanager
+def track_writes() -> Iterator[set]:
+    writes: set = set()
+    token = _request_writes.set(writes)
+    try:
+        yield writes
+    finally:
+        _request_writes.reset(token)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model: type[Model], **hints: Any) -> Optional[str]:
+        if _read_from_replica.get() and replica_configured():
+            if not _request_writes.get():
+                return settings.REPLICA_DATABASE
+        return "default"
+
+    def db_for_write(self, model: type[Model], **hints: Any) -> Optional[str]:
+        writes = _request_writes.get()
+        if writes is not None:
+            writes.add(model._meta.label)
+        return "default"
+
+    def allow_relation(self, obj1: Model, obj2: Model, **hints: Any) -> Optional[bool]:
+        return True
+
+    def allow_migrate(
+        self, db: str, app_label: str, model_name: Optional[str] = None, **hints: Any
+    ) -> Optional[bool]:
+        return db == "default"
@@ -0,0 +1,24 @@
+from typing import Any, Optional
+
+from loguru import logger
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import exception_handler
+
+from core_apps.user_auth.hashing import PasswordHashingBusy
+
+
+def api_exception_handler(
+    exc: Exception, context: dict[str, Any]
+) -> Optional[Response]:
+    if isinstance(exc, PasswordHashingBusy):
+        view = context.get("view")
+        logger.warning(
+            f"Password hashing queue is full, rejecting {type(view).__name__}: {exc}"
+        )
+        return Response(
+            {"error": "The service is busy. Please try again shortly."},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={"Retry-After": "1"},
+        )
+    return exception_handler(exc, context)
@@ -0,0 +1,118 @@
+import secrets
+from collections import defaultdict
+from typing import List, Sequence
+
+import numpy as np
+
+# Digit sum of 2 * d for every digit d, i.e. the value a doubled digit adds.
+_DOUBLED = np.array([0, 2, 4, 6, 8, 1, 3, 5, 7, 9], dtype=np.uint8)
+_DOUBLE_TABLE = str.maketrans("0123456789", "0246813579")
+
+
+def check_digit(partial: str) -> int:
+    """Return the Luhn check digit to append to partial.
+
+    The rightmost digit of partial sits next to the check digit, so it is the
+    first one doubled.
+    """
+    digits = partial[::-1]
+    total = sum(map(int, digits[::2].translate(_DOUBLE_TABLE)))
+    total += sum(map(int, digits[1::2]))
+    return -total % 10
+
+
+def is_valid(number: str) -> bool:
+    if len(number) < 2 or not (number.isascii() and number.isdigit()):
+        return False
+    return check_digit(number[:-1]) == int(number[-1])
+
+
+def random_digits(length: int) -> str:
+    if length <= 0:
+        return ""
+    return f"{secrets.randbelow(10**length):0{length}d}"
+
+
+def generate(prefix: str, length: int) -> str:
+    random_length = length - len(prefix) - 1
+    if random_length < 0:
+        raise ValueError("Prefix is too long for the requested length")
+
+    partial = prefix + random_digits(random_length)
+    return f"{partial}{check_digit(partial)}"
+
+
+def to_digit_array(numbers: Sequence[str]) -> np.ndarray:
+    """Pack equal-length digit strings into an (n, length) uint8 array."""
+    if not numbers:
+        return np.empty((0, 0), dtype=np.uint8)
+
+    length = len(numbers[0])
+    raw = np.frombuffer("".join(numbers).encode("ascii"), dtype=np.uint8)
+    if raw.size != length * len(numbers):
+        raise ValueError("All numbers in a batch must have the same length")
+    return raw.reshape(len(numbers), length) - ord("0")
+
+
+def from_digit_array(digits: np.ndarray) -> List[str]:
+    if digits.size == 0:
+        return [""] * len(digits)
+
+    length = digits.shape[1]
+    text = (digits + ord("0")).astype(np.uint8).tobytes().decode("ascii")
+    return [text[i : i + length] for i in range(0, len(text), length)]
+
+
+def check_digits_batch(digits: np.ndarray) -> np.ndarray:
+    """Vectorised check_digit over the rows of an (n, length) digit array."""
+    reversed_digits = digits[:, ::-1]
+    total = _DOUBLED[reversed_digits[:, ::2]].sum(axis=1, dtype=np.int64)
+    total += reversed_digits[:, 1::2].sum(axis=1, dtype=np.int64)
+    return ((-total) % 10).astype(np.uint8)
+
+
+def validate_batch(numbers: Sequence[str]) -> np.ndarray:
+    """Return a boolean array telling which of numbers pass the Luhn check.
+
+    Numbers of different lengths are checked in one pass per length; anything
+    that is not made of digits is reported as invalid.
+    """
+    result = np.zeros(len(numbers), dtype=bool)
+    by_length: dict = defaultdict(list)
+    for index, number in enumerate(numbers):
+        if len(number) >= 2 and number.isascii() and number.isdigit():
+            by_length[len(number)].append(index)
+
+    for indexes in by_length.values():
+        digits = to_digit_array([numbers[i] for i in indexes])
+        result[indexes] = check_digits_batch(digits[:, :-1]) == digits[:, -1]
+    return result
+
+
+def random_digit_array(rows: int, columns: int) -> np.ndarray:
+    """Uniform random digits drawn from the OS CSPRNG."""
+    needed = rows * columns
+    chunks = [np.empty(0, dtype=np.uint8)]
+    drawn = 0
+    while drawn < needed:
+        raw = np.frombuffer(
+            secrets.token_bytes((needed - drawn) * 11 // 10 + 16), dtype=np.uint8
+        )
+        # 250 is the largest multiple of 10 below 256; rejecting the bytes
+        # above it keeps every digit equally likely.
+        accepted = raw[raw < 250] % 10
+        chunks.append(accepted)
+        drawn += accepted.size
+    return np.concatenate(chunks)[:needed].reshape(rows, columns)
+
+
+def generate_batch(prefix: str, length: int, count: int) -> List[str]:
+    random_length = length - len(prefix) - 1
+    if random_length < 0:
+        raise ValueError("Prefix is too long for the requested length")
+
+    digits = np.empty((count, length), dtype=np.uint8)
+    digits[:, : len(prefix)] = to_digit_array([prefix])[0] if prefix else 0
+    digits[:, len(prefix) : -1] = random_digit_array(count, random_length)
+    digits[:, -1] = check_digits_batch(digits[:, :-1])
+    return from_digit_array(digits)
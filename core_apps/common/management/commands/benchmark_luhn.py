@@ -0,0 +1,49 @@
+import time
+from typing import Any, Callable
+
+from django.core.management.base import BaseCommand
+
+from core_apps.common import luhn
+
+PREFIX = "123484"
+LENGTH = 16
+
+
+class Command(BaseCommand):
+    help = "Measure Luhn generation and validation throughput, scalar and batched."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--count", type=int, default=1_000_000)
+        parser.add_argument("--scalar-count", type=int, default=100_000)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        count = options["count"]
+        scalar_count = options["scalar_count"]
+
+        numbers = self.measure(
+            "batch generate",
+            count,
+            lambda: luhn.generate_batch(PREFIX, LENGTH, count),
+        )
+        self.measure(
+            "batch validate",
+            count,
+            lambda: luhn.validate_batch(numbers),
+        )
+        self.measure(
+            "scalar generate",
+            scalar_count,
+            lambda: [luhn.generate(PREFIX, LENGTH) for _ in range(scalar_count)],
+        )
+        self.measure(
+            "scalar validate",
+            scalar_count,
+            lambda: [luhn.is_valid(number) for number in numbers[:scalar_count]],
+        )
+
+    def measure(self, label: str, count: int, run: Callable[[], Any]) -> Any:
+        started = time.perf_counter()
+        result = run()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f"{label:16} {count / elapsed:12,.0f} numbers/s")
+        return result
@@ -0,0 +1,25 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from core_apps.accounts.cache import ACCOUNT_BY_NUMBER
+from core_apps.common.cache import lookup_hit_ratio
+from core_apps.user_auth.cache import USER_BY_ID
+from core_apps.user_profile.cache import PROFILE_BY_USER
+
+NAMESPACES = [ACCOUNT_BY_NUMBER, USER_BY_ID, PROFILE_BY_USER]
+
+
+class Command(BaseCommand):
+    help = (
+        "Report cache hit ratios for the cache-aside lookups. Only the share "
+        "of lookups set by CACHE_LOOKUP_STATS_SAMPLE_RATE is counted."
+    )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        for namespace in NAMESPACES:
+            stats = lookup_hit_ratio(namespace)
+            self.stdout.write(
+                f"{namespace:<20} hits={stats['hits']:<8} "
+                f"misses={stats['misses']:<8} ratio={stats['hit_ratio']:.1%}"
+            )
@@ -0,0 +1,89 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+DEFAULT_PAIRS = [
+    ("/api/v1/accounts/transactions/", "/api/v1/accounts/transactions/async/"),
+    ("/api/v1/cards/virtual-cards/", "/api/v1/cards/virtual-cards/async/"),
+    ("/api/v1/profiles/my-profile/", "/api/v1/profiles/my-profile/async/"),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare throughput and latency of the sync read endpoints served by "
+        "gunicorn's gthread workers over WSGI (the api-wsgi service, started "
+        "with `--profile loadtest`) against the sync and async endpoints "
+        "served over ASGI. Raise the user throttle rate for the run, "
+        "otherwise most requests will be rejected with 429."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--asgi-url", default="http://localhost:8080", help="uvicorn, via nginx"
+        )
+        parser.add_argument(
+            "--wsgi-url",
+            default="http://localhost:8001",
+            help="gunicorn gthread workers running config.wsgi",
+        )
+        parser.add_argument(
+            "--token", required=True, help="Access token sent as the auth cookie"
+        )
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--concurrency", type=int, default=50)
+        parser.add_argument("--timeout", type=float, default=30.0)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        for sync_path, async_path in DEFAULT_PAIRS:
+            runs = (
+                ("wsgi", options["wsgi_url"], sync_path),
+                ("asgi", options["asgi_url"], sync_path),
+                ("asgi", options["asgi_url"], async_path),
+            )
+            for label, base_url, path in runs:
+                result = self.run_load(base_url + path, options)
+                self.stdout.write(
+                    f"{label:<5} {path:<45} "
+                    f"{result['rps']:>8.1f} req/s  "
+                    f"p50 {result['p50']:>7.1f} ms  "
+                    f"p95 {result['p95']:>7.1f} ms  "
+                    f"p99 {result['p99']:>7.1f} ms  "
+                    f"errors {result['errors']}"
+                )
+
+    def run_load(self, url: str, options: dict) -> dict:
+        headers = {"Cookie": f"{settings.COOKIE_NAME}={options['token']}"}
+
+        def fetch(_: int) -> tuple[float, bool]:
+            start = time.perf_counter()
+            try:
+                with urlopen(
+                    Request(url, headers=headers), timeout=options["timeout"]
+                ) as response:
+                    response.read()
+                    ok = response.status == 200
+            except (HTTPError, URLError, TimeoutError):
+                ok = False
+            return (time.perf_counter() - start) * 1000, ok
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as executor:
+            results = list(executor.map(fetch, range(options["requests"])))
+        elapsed = time.perf_counter() - started
+
+        latencies = sorted(latency for latency, _ in results)
+        quantiles = statistics.quantiles(latencies, n=100)
+        return {
+            "rps": len(results) / elapsed,
+            "p50": statistics.median(latencies),
+            "p95": quantiles[94],
+            "p99": quantiles[98],
+            "errors": sum(1 for _, ok in results if not ok),
+        }
@@ -0,0 +1,67 @@
+from typing import Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+
+from .cookie_auth import CustomJWTAuthentication
+from .db_routers import replica_configured, track_writes, use_replica
+
+
+def primary_pin_key(user_id: str) -> str:
+    return f"db:primary-pin:{user_id}"
+
+
+class ReadReplicaMiddleware:
+    """Serve safe requests from the replica unless the user wrote recently.
+
+    Any write made while handling a request pins that user's reads to the
+    primary for REPLICA_STICKINESS_WINDOW so they always read their own writes.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        user_id = self.get_user_id(request)
+        with use_replica(self.should_use_replica(request, user_id)):
+            with track_writes() as writes:
+                response = self.get_response(request)
+        self.pin_to_primary(user_id, writes)
+        return response
+
+    async def __acall__(self, request):
+        user_id = self.get_user_id(request)
+        use = await sync_to_async(self.should_use_replica)(request, user_id)
+        with use_replica(use):
+            with track_writes() as writes:
+                response = await self.get_response(request)
+        await sync_to_async(self.pin_to_primary)(user_id, writes)
+        return response
+
+    def get_user_id(self, request) -> Optional[str]:
+        return CustomJWTAuthentication().get_request_user_id(request)
+
+    def should_use_replica(self, request, user_id: Optional[str]) -> bool:
+        if request.method not in SAFE_METHODS or not replica_configured():
+            return False
+        if user_id and cache.get(primary_pin_key(user_id)):
+            return False
+        return True
+
+    def pin_to_primary(self, user_id: Optional[str], writes: set) -> None:
+        if user_id and writes:
+            cache.set(
+                primary_pin_key(user_id),
+                True,
+                timeout=settings.REPLICA_STICKINESS_WINDOW.total_seconds(),
+            )
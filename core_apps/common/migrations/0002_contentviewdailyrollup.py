@@ -0,0 +1,54 @@
+# Generated by Django 4.2.15 on 2026-10-19 08:28
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("common", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ContentViewDailyRollup",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("object_id", models.UUIDField(verbose_name="Object ID")),
+                ("day", models.DateField(verbose_name="Day")),
+                (
+                    "viewers",
+                    models.PositiveIntegerField(default=0, verbose_name="Viewers"),
+                ),
+            ],
+            options={
+                "verbose_name": "Content View Daily Rollup",
+                "verbose_name_plural": "Content View Daily Rollups",
+            },
+        ),
+        migrations.AddField(
+            model_name="contentviewdailyrollup",
+            name="content_type",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                to="contenttypes.contenttype",
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="contentviewdailyrollup",
+            unique_together={("content_type", "object_id", "day")},
+        ),
+    ]
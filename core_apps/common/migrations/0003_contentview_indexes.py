@@ -0,0 +1,30 @@
+# Generated by Django 4.2.15 on 2026-10-19 08:28
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # ContentView takes a row per viewer; build the indexes without locking
+    # out the view flush.
+    atomic = False
+
+    dependencies = [
+        ("common", "0002_contentviewdailyrollup"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="contentview",
+            index=models.Index(
+                fields=["content_type", "object_id"],
+                name="common_cont_content_bca6cb_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="contentview",
+            index=models.Index(
+                fields=["last_viewed_at"], name="common_cont_last_vi_9c241c_idx"
+            ),
+        ),
+    ]
@@ -1,9 +1,9 @@
 import uuid
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.fields import GenericForeignKey
-from django.db import models, IntegrityError
+from django.db import models
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
 
@@ -40,6 +40,10 @@ class ContentView(TimeStampedModel):
         verbose_name = _("Content View")
         verbose_name_plural = _("Content Views")
         unique_together = ("user", "content_type", "object_id", "viewer_ip")
+        indexes = [
+            models.Index(fields=["content_type", "object_id"]),
+            models.Index(fields=["last_viewed_at"]),
+        ]
 
     def __str__(self) -> str:
         return (
@@ -54,19 +58,72 @@ class ContentView(TimeStampedModel):
         user: Optional[User],
         viewer_ip: Optional[str] = None,
     ) -> None:
-        content_type = ContentType.objects.get_for_model(content_object)
-        try:
-            view, created = cls.objects.get_or_create(
+        cls.record_views_bulk([(content_object, user, viewer_ip)])
+
+    @classmethod
+    def record_views_bulk(
+        cls,
+        views: Iterable[tuple[Any, Optional[User], Optional[str]]],
+        batch_size: int = 1000,
+    ) -> int:
+        """Upsert (content_object, user, viewer_ip) views, one statement per batch.
+
+        Request paths should use view_tracking.queue_views instead, which
+        buffers in Redis and lands here on the next flush.
+        """
+        viewed_at = timezone.now()
+        rows = {}
+        for content_object, user, viewer_ip in views:
+            content_type = ContentType.objects.get_for_model(content_object)
+            user_id = user.pk if user is not None and user.is_authenticated else None
+            key = (user_id, content_type.id, content_object.pk, viewer_ip)
+            rows[key] = cls(
+                user_id=user_id,
                 content_type=content_type,
-                object_id=content_object.id,
-                defaults={
-                    "last_viewed_at": timezone.now(),
-                    "user": user,
-                    "viewer_ip": viewer_ip,
-                },
+                object_id=content_object.pk,
+                viewer_ip=viewer_ip,
+                last_viewed_at=viewed_at,
+            )
+        return cls.upsert_views(rows.values(), batch_size)
+
+    @classmethod
+    def upsert_views(
+        cls, views: Iterable["ContentView"], batch_size: int = 1000
+    ) -> int:
+        # Rows in one statement must not share a unique key, or Postgres
+        # refuses to update the same row twice; callers pass distinct keys.
+        views = list(views)
+        for start in range(0, len(views), batch_size):
+            cls.objects.bulk_create(
+                views[start : start + batch_size],
+                update_conflicts=True,
+                unique_fields=["user", "content_type", "object_id", "viewer_ip"],
+                update_fields=["last_viewed_at", "updated_at"],
             )
-            if not created:
-                view.last_viewed_at = timezone.now()
-                view.save()
-        except IntegrityError:
-            pass
+        return len(views)
+
+
+class ContentViewDailyRollup(TimeStampedModel):
+    """Viewer rows archived out of ContentView, counted per object and day."""
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.UUIDField(verbose_name=_("Object ID"))
+    day = models.DateField(verbose_name=_("Day"))
+    viewers = models.PositiveIntegerField(verbose_name=_("Viewers"), default=0)
+
+    class Meta:
+        verbose_name = _("Content View Daily Rollup")
+        verbose_name_plural = _("Content View Daily Rollups")
+        unique_together = ("content_type", "object_id", "day")
+
+    def __str__(self) -> str:
+        return f"{self.viewers} viewers of {self.object_id} on {self.day}"
+
+    @classmethod
+    def archived_viewers(cls, content_type: ContentType, object_id: Any) -> int:
+        return (
+            cls.objects.filter(
+                content_type=content_type, object_id=object_id
+            ).aggregate(total=models.Sum("viewers"))["total"]
+            or 0
+        )
@@ -0,0 +1,18 @@
+from celery import shared_task
+from django.conf import settings
+from loguru import logger
+
+from .view_tracking import archive_views, flush_views
+
+
+@shared_task(name="flush_content_views")
+def flush_content_views() -> str:
+    flushed = flush_views()
+    logger.info(f"Flushed {flushed} buffered content views")
+    return f"Flushed {flushed} buffered content views"
+
+
+@shared_task(name="archive_content_views")
+def archive_content_views() -> str:
+    archived = archive_views(settings.CONTENT_VIEW_RETENTION_DAYS)
+    return f"Archived {archived} content views"
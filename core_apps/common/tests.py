@@ -1,3 +1,204 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock
+from uuid import uuid4
 
-# Create your tests here.
+import numpy as np
+from django.contrib.contenttypes.models import ContentType
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from hypothesis import given
+from hypothesis import strategies as st
+
+from core_apps.accounts.utils import calculate_luhn_check_digit
+from core_apps.user_auth.models import User
+from core_apps.user_profile.models import Profile
+from . import luhn, view_tracking
+from .models import ContentView
+from .redis import get_redis_client
+from .view_tracking import (
+    annotate_view_counts,
+    archive_views,
+    count_views_in_db,
+    flush_views,
+    get_view_count,
+    queue_views,
+    seeded_key,
+    viewers_key,
+)
+
+digit_strings = st.text(alphabet="0123456789", min_size=1, max_size=30)
+
+
+def previous_card_check_digit(number: str) -> int:
+    # The loop core_apps.cards.utils used before it switched to luhn.
+    digits = [int(d) for d in number]
+
+    for i in range(len(digits) - 1, -1, -2):
+        digits[i] *= 2
+        if digits[i] > 9:
+            digits[i] -= 9
+
+    return (10 - (sum(digits) % 10)) % 10
+
+
+def previous_account_check_digit(account_number: str) -> int:
+    # core_apps.accounts.utils.calculate_luhn_check_digit before it switched
+    # to luhn; it doubled every other digit starting one place too far left.
+    def split_into_digits(number) -> list[int]:
+        return [int(digit) for digit in str(number)]
+
+    digits = split_into_digits(account_number)
+    odd_digits = digits[-1::-2]
+    even_digits = digits[-2::-2]
+    total = sum(odd_digits)
+
+    for digit in even_digits:
+        total += sum(split_into_digits(digit * 2))
+
+    return (10 - (total % 10)) % 10
+
+
+class LuhnPropertyTests(SimpleTestCase):
+    @given(digit_strings)
+    def test_check_digit_matches_previous_card_loop(self, partial) -> None:
+        expected = previous_card_check_digit(partial)
+        self.assertEqual(luhn.check_digit(partial), expected)
+        self.assertEqual(calculate_luhn_check_digit(partial), expected)
+
+    @given(digit_strings)
+    def test_previous_account_check_digit_was_shifted_one_place(self, partial) -> None:
+        # The old accounts function computed the check digit of partial + "0".
+        self.assertEqual(
+            luhn.check_digit(partial + "0"), previous_account_check_digit(partial)
+        )
+
+    @given(prefix=digit_strings, extra=st.integers(min_value=1, max_value=20))
+    def test_generated_numbers_are_valid(self, prefix, extra) -> None:
+        length = len(prefix) + extra
+        number = luhn.generate(prefix, length)
+        self.assertEqual(len(number), length)
+        self.assertTrue(number.startswith(prefix))
+        self.assertTrue(luhn.is_valid(number))
+
+    @given(prefix=digit_strings, extra=st.integers(min_value=1, max_value=20))
+    def test_generated_batches_are_valid(self, prefix, extra) -> None:
+        numbers = luhn.generate_batch(prefix, len(prefix) + extra, 5)
+        self.assertTrue(all(map(luhn.is_valid, numbers)))
+        self.assertTrue(luhn.validate_batch(numbers).all())
+
+    @given(
+        st.integers(min_value=1, max_value=30).flatmap(
+            lambda length: st.lists(
+                st.text(alphabet="0123456789", min_size=length, max_size=length),
+                min_size=1,
+                max_size=20,
+            )
+        )
+    )
+    def test_check_digits_batch_matches_check_digit(self, partials) -> None:
+        digits = luhn.to_digit_array(partials)
+        self.assertEqual(
+            luhn.check_digits_batch(digits).tolist(),
+            [luhn.check_digit(partial) for partial in partials],
+        )
+
+    @given(st.lists(st.text(max_size=25), max_size=20))
+    def test_validate_batch_matches_is_valid(self, numbers) -> None:
+        self.assertEqual(
+            luhn.validate_batch(numbers).tolist(),
+            [luhn.is_valid(number) for number in numbers],
+        )
+
+    @given(
+        number=st.text(alphabet="0123456789", min_size=2, max_size=25),
+        junk=st.characters(
+            blacklist_categories=("Cs",), blacklist_characters="0123456789"
+        ),
+        position=st.integers(min_value=0),
+    )
+    def test_validate_batch_rejects_malformed_numbers(
+        self, number, junk, position
+    ) -> None:
+        position %= len(number) + 1
+        malformed = number[:position] + junk + number[position:]
+        self.assertFalse(luhn.is_valid(malformed))
+        self.assertEqual(luhn.validate_batch([malformed]).tolist(), [False])
+
+    def test_validate_batch_rejects_short_and_non_ascii_numbers(self) -> None:
+        # "٤" is an Arabic-Indic digit: str.isdigit() accepts it.
+        numbers = ["", "0", "79927398713", "٤٤", "7992739871٣"]
+        self.assertEqual(
+            luhn.validate_batch(numbers).tolist(), [False, False, True, False, False]
+        )
+
+    @given(st.integers(min_value=1, max_value=30), st.integers(1, 9))
+    def test_changed_check_digit_is_rejected(self, length, shift) -> None:
+        number = luhn.generate("", length + 1)
+        changed = number[:-1] + str((int(number[-1]) + shift) % 10)
+        self.assertFalse(luhn.is_valid(changed))
+        self.assertEqual(luhn.validate_batch([number, changed]).tolist(), [True, False])
+
+    def test_digit_array_round_trip(self) -> None:
+        numbers = ["0123", "9876"]
+        digits = luhn.to_digit_array(numbers)
+        self.assertEqual(digits.dtype, np.uint8)
+        self.assertEqual(luhn.from_digit_array(digits), numbers)
+
+
+class ViewCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        user = User.objects.create_user(
+            email="viewed@example.com",
+            password="Str0ng-Passw0rd!",
+            first_name="Viewed",
+            last_name="Profile",
+            id_no="VW-0001",
+            security_question=User.SecurityQuestions.PET_NAME,
+            security_answer="rex",
+        )
+        cls.profile = user.profile
+
+    def setUp(self) -> None:
+        content_type = ContentType.objects.get_for_model(Profile)
+        self.content_type = content_type
+        # Flushes only see this test's buffer, never the shared views:buffer.
+        prefix = f"test:{uuid4()}:"
+        for name in ("BUFFER_KEY", "FLUSHING_KEY"):
+            key = prefix + getattr(view_tracking, name)
+            self.enterContext(mock.patch.object(view_tracking, name, key))
+        redis = get_redis_client()
+        self.addCleanup(
+            redis.delete,
+            view_tracking.BUFFER_KEY,
+            view_tracking.FLUSHING_KEY,
+            viewers_key(content_type.id, self.profile.pk),
+            seeded_key(content_type.id, self.profile.pk),
+        )
+
+    def view(self, *viewer_ips: str) -> None:
+        queue_views((self.profile, None, viewer_ip) for viewer_ip in viewer_ips)
+
+    def counts(self) -> tuple[int, int, int]:
+        annotated = annotate_view_counts(Profile.objects.filter(pk=self.profile.pk))
+        return (
+            get_view_count(self.profile),
+            count_views_in_db(self.content_type, self.profile.pk),
+            annotated.get().view_count,
+        )
+
+    def test_returning_archived_viewer_is_counted_again_everywhere(self) -> None:
+        self.view("10.0.0.1", "10.0.0.2", "10.0.0.1")
+        flush_views()
+        self.assertEqual(self.counts(), (2, 2, 2))
+
+        ContentView.objects.update(last_viewed_at=timezone.now() - timedelta(days=60))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(archive_views(retention_days=30), 2)
+        self.assertEqual(self.counts(), (2, 2, 2))
+
+        self.view("10.0.0.1")
+        # Buffered views reach the database counts on the next flush.
+        self.assertEqual(get_view_count(self.profile), 3)
+        flush_views()
+        self.assertEqual(self.counts(), (3, 3, 3))
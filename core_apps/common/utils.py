@@ -0,0 +1,15 @@
+from typing import Iterator, Optional
+
+from django.http import HttpRequest
+
+
+def get_client_ip(request: HttpRequest) -> Optional[str]:
+    x_forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR")
+    if x_forwarded_for:
+        return x_forwarded_for.split(",")[0]
+    return request.META.get("REMOTE_ADDR")
+
+
+def chunked(rows: list, size: int) -> Iterator[list]:
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
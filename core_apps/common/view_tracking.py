@@ -0,0 +1,301 @@
+from datetime import timedelta
+from functools import partial
+from typing import Any, Iterable, Optional
+
+import redis
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, QuerySet, Subquery, Sum
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from loguru import logger
+
+from .models import ContentView, ContentViewDailyRollup
+from .redis import get_redis_client
+
+# The view count of an object is the number of viewers archived into its
+# rollups plus the number of distinct viewers still in ContentView. A viewer
+# who comes back after their row was archived is counted again, so counts are
+# distinct viewers per retention window. The Redis counter, count_views_in_db
+# and annotate_view_counts all follow this definition.
+
+# Viewer -> last seen timestamp for every view not yet written to ContentView.
+BUFFER_KEY = "views:buffer"
+FLUSHING_KEY = "views:buffer:flushing"
+
+
+def object_key(content_type_id: int, object_id: Any) -> str:
+    return f"{content_type_id}:{object_id}"
+
+
+def viewers_key(content_type_id: int, object_id: Any) -> str:
+    return f"views:viewers:{object_key(content_type_id, object_id)}"
+
+
+def seeded_key(content_type_id: int, object_id: Any) -> str:
+    return f"views:seeded:{object_key(content_type_id, object_id)}"
+
+
+def viewer_id(user_id: Any, viewer_ip: Optional[str]) -> str:
+    return f"{user_id or ''}|{viewer_ip or ''}"
+
+
+def record_view(
+    content_object: Any, user: Optional[Any], viewer_ip: Optional[str] = None
+) -> None:
+    queue_views([(content_object, user, viewer_ip)])
+
+
+def queue_views(views: Iterable[tuple[Any, Optional[Any], Optional[str]]]) -> None:
+    """Buffer views in Redis; flush_content_views writes them to the database.
+
+    Each viewer goes into a HyperLogLog per object, which is what view counts
+    are served from. The whole call is one pipelined round trip.
+    """
+    views = list(views)
+    viewed_at = timezone.now().isoformat()
+    try:
+        pipe = get_redis_client().pipeline(transaction=False)
+        for content_object, user, viewer_ip in views:
+            content_type = ContentType.objects.get_for_model(content_object)
+            user_id = user.pk if user is not None and user.is_authenticated else None
+            viewer = viewer_id(user_id, viewer_ip)
+            pipe.pfadd(viewers_key(content_type.id, content_object.pk), viewer)
+            expire_counter(pipe, content_type.id, content_object.pk)
+            pipe.hset(
+                BUFFER_KEY, f"{content_type.id}|{content_object.pk}|{viewer}", viewed_at
+            )
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"View buffer unavailable, recording views directly: {e}")
+        ContentView.record_views_bulk(views)
+
+
+def get_view_count(content_object: Any) -> int:
+    """Return the view count of content_object.
+
+    The first read of an object loads its stored and buffered viewers into
+    the HyperLogLog and remembers how many were already archived to the
+    rollup. After that the count never touches the database until
+    archive_views drops both keys, or they expire VIEW_COUNTER_TIMEOUT after
+    the last view.
+    """
+    content_type = ContentType.objects.get_for_model(content_object)
+    object_id = content_object.pk
+    try:
+        client = get_redis_client()
+        archived = client.get(seeded_key(content_type.id, object_id))
+        if archived is None:
+            archived = seed_viewers(client, content_type, object_id)
+        return int(archived) + client.pfcount(viewers_key(content_type.id, object_id))
+    except redis.RedisError as e:
+        logger.warning(f"View counter unavailable, counting in the database: {e}")
+        return count_views_in_db(content_type, object_id)
+
+
+def count_views_in_db(content_type: ContentType, object_id: Any) -> int:
+    recent = ContentView.objects.filter(
+        content_type=content_type, object_id=object_id
+    ).count()
+    return ContentViewDailyRollup.archived_viewers(content_type, object_id) + recent
+
+
+def annotate_view_counts(queryset: QuerySet) -> QuerySet:
+    """Annotate each row of queryset with view_count, counted in the database.
+
+    Two correlated subqueries on the (content_type, object_id) indexes, so a
+    page of rows costs one query however long it is. Views still sitting in
+    the Redis buffer are not included until the next flush.
+    """
+    content_type = ContentType.objects.get_for_model(queryset.model)
+    recent = (
+        ContentView.objects.filter(content_type=content_type, object_id=OuterRef("pk"))
+        .order_by()
+        .values("object_id")
+        .annotate(viewers=Count("id"))
+        .values("viewers")
+    )
+    archived = (
+        ContentViewDailyRollup.objects.filter(
+            content_type=content_type, object_id=OuterRef("pk")
+        )
+        .order_by()
+        .values("object_id")
+        .annotate(viewers=Sum("viewers"))
+        .values("viewers")
+    )
+    return queryset.annotate(
+        view_count=Coalesce(Subquery(recent, output_field=IntegerField()), 0)
+        + Coalesce(Subquery(archived, output_field=IntegerField()), 0)
+    )
+
+
+def seed_viewers(client: redis.Redis, content_type: ContentType, object_id: Any) -> int:
+    # PFADD is idempotent, so viewers recorded before seeding are not counted
+    # twice. The buffers are read before ContentView so a viewer that a flush
+    # moves in between is still found in one of them.
+    viewers = buffered_viewers(client, content_type.id, object_id)
+    viewers += [
+        viewer_id(user_id, viewer_ip)
+        for user_id, viewer_ip in ContentView.objects.filter(
+            content_type=content_type, object_id=object_id
+        ).values_list("user_id", "viewer_ip")
+    ]
+    pipe = client.pipeline(transaction=False)
+    key = viewers_key(content_type.id, object_id)
+    for start in range(0, len(viewers), 1000):
+        pipe.pfadd(key, *viewers[start : start + 1000])
+    archived = ContentViewDailyRollup.archived_viewers(content_type, object_id)
+    pipe.set(seeded_key(content_type.id, object_id), archived)
+    expire_counter(pipe, content_type.id, object_id)
+    pipe.execute()
+    return archived
+
+
+def expire_counter(
+    pipe: redis.client.Pipeline, content_type_id: int, object_id: Any
+) -> None:
+    # Both keys get the same deadline: a seeded count without its viewers
+    # would undercount, so they must go together.
+    for key in (
+        viewers_key(content_type_id, object_id),
+        seeded_key(content_type_id, object_id),
+    ):
+        pipe.expire(key, settings.VIEW_COUNTER_TIMEOUT)
+
+
+def buffered_viewers(
+    client: redis.Redis, content_type_id: int, object_id: Any
+) -> list[str]:
+    prefix = f"{content_type_id}|{object_id}|"
+    return [
+        field.decode()[len(prefix) :]
+        for key in (BUFFER_KEY, FLUSHING_KEY)
+        for field, _ in client.hscan_iter(key, match=f"{prefix}*", count=1000)
+    ]
+
+
+def forget_viewers(objects: Iterable[tuple[int, Any]]) -> None:
+    """Drop the HyperLogLogs of objects so the next read seeds them again."""
+    try:
+        pipe = get_redis_client().pipeline(transaction=False)
+        for content_type_id, object_id in objects:
+            pipe.delete(
+                viewers_key(content_type_id, object_id),
+                seeded_key(content_type_id, object_id),
+            )
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.error(f"Failed to reset view counters after archiving: {e}")
+
+
+def flush_views(batch_size: int = 1000) -> int:
+    """Upsert buffered views into ContentView.
+
+    The buffer is renamed before it is read so views recorded during the
+    flush land in a fresh buffer. A flush that dies part way leaves the
+    renamed buffer behind and the next run finishes it first.
+    """
+    client = get_redis_client()
+    if not client.exists(FLUSHING_KEY):
+        try:
+            client.rename(BUFFER_KEY, FLUSHING_KEY)
+        except redis.ResponseError:
+            return 0
+
+    rows = []
+    for field, viewed_at in client.hscan_iter(FLUSHING_KEY, count=batch_size):
+        content_type_id, object_id, user_id, viewer_ip = field.decode().split("|")
+        rows.append(
+            ContentView(
+                content_type_id=int(content_type_id),
+                object_id=object_id,
+                user_id=user_id or None,
+                viewer_ip=viewer_ip or None,
+                last_viewed_at=parse_datetime(viewed_at.decode()),
+            )
+        )
+
+    # The buffer is keyed by viewer, so every row here is a distinct upsert key.
+    ContentView.upsert_views(rows, batch_size)
+    client.delete(FLUSHING_KEY)
+    return len(rows)
+
+
+def archive_views(retention_days: int, batch_size: int = 5000) -> int:
+    """Fold ContentView rows older than retention_days into daily rollups.
+
+    Each batch locks its rows, counts them per object and day, adds the
+    counts to the rollup and deletes the rows in one transaction, so a row is
+    always counted exactly once, either raw or rolled up. The Redis counters
+    of the archived objects are dropped afterwards so they forget the
+    archived viewers, as the database counts do.
+    """
+    cutoff = timezone.now() - timedelta(days=retention_days)
+    expired = ContentView.objects.filter(last_viewed_at__lt=cutoff)
+    archived = 0
+    while True:
+        with transaction.atomic():
+            ids = list(
+                expired.order_by("last_viewed_at").values_list("id", flat=True)[
+                    :batch_size
+                ]
+            )
+            if not ids:
+                break
+
+            # Locking re-checks the cutoff, so a row that a flush moved forward
+            # since the ids were read is left alone, and a flush cannot move
+            # a row between counting and deleting it.
+            batch = expired.filter(id__in=ids).select_for_update()
+            ids = list(batch.values_list("id", flat=True))
+            counts = {
+                (row["content_type_id"], row["object_id"], row["day"]): row["viewers"]
+                # FOR UPDATE cannot be combined with GROUP BY, so the locked
+                # rows are counted by id.
+                for row in ContentView.objects.filter(id__in=ids)
+                .annotate(day=TruncDate("last_viewed_at"))
+                .values("content_type_id", "object_id", "day")
+                .annotate(viewers=Count("id"))
+            }
+            add_to_rollups(counts)
+            batch.delete()
+            transaction.on_commit(partial(forget_viewers, {key[:2] for key in counts}))
+        archived += len(ids)
+
+    logger.info(f"Archived {archived} content views older than {cutoff:%Y-%m-%d}")
+    return archived
+
+
+def add_to_rollups(counts: dict[tuple, int]) -> None:
+    rollups = {
+        (rollup.content_type_id, rollup.object_id, rollup.day): rollup
+        for rollup in ContentViewDailyRollup.objects.select_for_update().filter(
+            content_type_id__in={key[0] for key in counts},
+            object_id__in={key[1] for key in counts},
+            day__in={key[2] for key in counts},
+        )
+    }
+    new_rollups = []
+    for (content_type_id, object_id, day), viewers in counts.items():
+        rollup = rollups.get((content_type_id, object_id, day))
+        if rollup is None:
+            new_rollups.append(
+                ContentViewDailyRollup(
+                    content_type_id=content_type_id,
+                    object_id=object_id,
+                    day=day,
+                    viewers=viewers,
+                )
+            )
+        else:
+            rollup.viewers += viewers
+            rollup.updated_at = timezone.now()
+
+    ContentViewDailyRollup.objects.bulk_update(
+        [rollup for key, rollup in rollups.items() if key in counts],
+        ["viewers", "updated_at"],
+    )
+    ContentViewDailyRollup.objects.bulk_create(new_rollups)
@@ -0,0 +1,51 @@
+from django.db import connections
+from django.db.utils import DatabaseError
+from loguru import logger
+from redis import RedisError
+from rest_framework import permissions, status
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .redis import get_redis_client
+
+
+class HealthCheckView(APIView):
+    permission_classes = [permissions.AllowAny]
+    authentication_classes = []
+    throttle_classes = []
+
+    def get(self, request: Request) -> Response:
+        return Response({"status": "ok"}, status=status.HTTP_200_OK)
+
+
+class ReadinessCheckView(APIView):
+    permission_classes = [permissions.AllowAny]
+    authentication_classes = []
+    throttle_classes = []
+
+    def get(self, request: Request) -> Response:
+        checks = {"database": self.check_database(), "redis": self.check_redis()}
+        ready = all(checks.values())
+        return Response(
+            {"status": "ready" if ready else "unavailable", "checks": checks},
+            status=(
+                status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE
+            ),
+        )
+
+    def check_database(self) -> bool:
+        try:
+            with connections["default"].cursor() as cursor:
+                cursor.execute("SELECT 1")
+            return True
+        except DatabaseError as e:
+            logger.error(f"Readiness check failed for database: {e}")
+            return False
+
+    def check_redis(self) -> bool:
+        try:
+            return get_redis_client().ping()
+        except RedisError as e:
+            logger.error(f"Readiness check failed for redis: {e}")
+            return False
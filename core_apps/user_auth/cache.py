@@ -0,0 +1,91 @@
+import time
+from typing import Any, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+
+from core_apps.common.cache import cached_lookup, invalidate_lookup
+from .models import User
+
+USER_BY_ID = "user-by-id"
+
+TOKEN_USER_FIELDS = ("id", "email", "role", "account_status", "is_active")
+
+
+def token_user_key(jti: str) -> str:
+    return f"auth:token-user:{jti}"
+
+
+def user_generation_key(user_id: Any) -> str:
+    return f"auth:user-generation:{user_id}"
+
+
+def get_user_by_id(user_id: Any) -> Optional[User]:
+    # Keep the password hash out of Redis; check_password loads it on demand.
+    return cached_lookup(
+        USER_BY_ID,
+        user_id,
+        lambda: User.objects.defer("password").filter(id=user_id).first(),
+    )
+
+
+def get_user_for_token(validated_token: Token) -> Optional[User]:
+    user_id = validated_token[api_settings.USER_ID_CLAIM]
+    jti = validated_token.get(api_settings.JTI_CLAIM)
+    if jti is None:
+        return get_user_by_id(user_id)
+
+    token_key = token_user_key(jti)
+    generation_key = user_generation_key(user_id)
+    cached = cache.get_many([token_key, generation_key])
+    generation = cached.get(generation_key, 0)
+
+    snapshot = cached.get(token_key)
+    if snapshot and snapshot["generation"] == generation:
+        return user_from_snapshot(snapshot)
+
+    user = get_user_by_id(user_id)
+    if user is not None:
+        timeout = min(
+            settings.TOKEN_USER_CACHE_TIMEOUT,
+            int(validated_token.get("exp", 0) - time.time()),
+        )
+        if timeout > 0:
+            cache.set(token_key, user_snapshot(user, generation), timeout=timeout)
+    return user
+
+
+def user_snapshot(user: User, generation: int) -> dict:
+    return {
+        "generation": generation,
+        "fields": {name: getattr(user, name) for name in TOKEN_USER_FIELDS},
+    }
+
+
+def user_from_snapshot(snapshot: dict) -> User:
+    # from_db expects the loaded values in concrete field order; every other
+    # field is deferred and fetched together on first access.
+    fields = snapshot["fields"]
+    field_names = [
+        field.attname for field in User._meta.concrete_fields if field.attname in fields
+    ]
+    return User.from_db("default", field_names, [fields[name] for name in field_names])
+
+
+def invalidate_user(user: User) -> None:
+    invalidate_lookup(USER_BY_ID, user.id)
+    bump_user_generation(user.id)
+    transaction.on_commit(lambda: bump_user_generation(user.id))
+
+
+def bump_user_generation(user_id: Any) -> None:
+    # Every jti snapshot stores the generation it was taken at, so bumping it
+    # retires all of the user's cached tokens in one write.
+    key = user_generation_key(user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2 with costs taken from settings.
+
+    The algorithm name is unchanged, so existing hashes still verify and
+    must_update() flags them for a rehash on the next successful login once
+    the configured costs differ.
+    """
+
+    time_cost = settings.ARGON2_TIME_COST
+    memory_cost = settings.ARGON2_MEMORY_COST
+    parallelism = settings.ARGON2_PARALLELISM
@@ -0,0 +1,110 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterable, Optional
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+
+_pool: Optional[tuple[ProcessPoolExecutor, threading.BoundedSemaphore]] = None
+_pool_lock = threading.Lock()
+
+
+class PasswordHashingBusy(Exception):
+    pass
+
+
+def init_hashing_worker() -> None:
+    django.setup()
+
+
+def verify_encoded_password(password: str, encoded: str) -> tuple[bool, bool]:
+    needs_rehash = []
+    valid = check_password(password, encoded, setter=needs_rehash.append)
+    return valid, bool(needs_rehash)
+
+
+def create_pool(workers: int) -> ProcessPoolExecutor:
+    # Spawned workers do not inherit the threads of the web server process.
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_hashing_worker,
+    )
+
+
+def get_pool() -> tuple[ProcessPoolExecutor, threading.BoundedSemaphore]:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = (
+                    create_pool(settings.PASSWORD_HASH_WORKERS),
+                    threading.BoundedSemaphore(settings.PASSWORD_HASH_QUEUE_SIZE),
+                )
+    return _pool
+
+
+def reset_pool() -> None:
+    global _pool
+    _pool = None
+
+
+os.register_at_fork(after_in_child=reset_pool)
+
+
+def run_in_pool(fn, *args):
+    pool, slots = get_pool()
+    if not slots.acquire(timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT):
+        raise PasswordHashingBusy("Password hashing queue is full.")
+    try:
+        return pool.submit(fn, *args).result()
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM killed); start a fresh pool on the next call.
+        reset_pool()
+        pool.shutdown(wait=False)
+        raise PasswordHashingBusy("Password hashing pool was restarted.")
+    finally:
+        slots.release()
+
+
+def hash_password(password: Optional[str]) -> str:
+    if password is None:
+        return make_password(None)
+    return run_in_pool(make_password, password)
+
+
+def verify_password(password: str, encoded: str) -> tuple[bool, bool]:
+    """Return (valid, needs_rehash) for a raw password against a stored hash."""
+    return run_in_pool(verify_encoded_password, password, encoded)
+
+
+def hash_passwords(
+    passwords: Iterable[Optional[str]], workers: Optional[int] = None
+) -> list[str]:
+    """Hash passwords in order.
+
+    With workers=None (inside the web process) every hash takes a slot in the
+    shared pool's queue, like a login does, and at most PASSWORD_HASH_WORKERS
+    are in flight, so a bulk import cannot crowd logins out of the queue and
+    raises PasswordHashingBusy when it is full. Management commands pass
+    workers and get a private pool of that many processes.
+    """
+    passwords = list(passwords)
+    if workers is None:
+        with ThreadPoolExecutor(settings.PASSWORD_HASH_WORKERS) as submitters:
+            return list(submitters.map(hash_password, passwords))
+
+    if workers <= 1 or len(passwords) <= 1:
+        return [make_password(password) for password in passwords]
+    with create_pool(workers) as pool:
+        return list(
+            pool.map(make_password, passwords, chunksize=chunk(passwords, workers))
+        )
+
+
+def chunk(items: list, workers: int) -> int:
+    return max(1, len(items) // (workers * 4))
@@ -0,0 +1,54 @@
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+def normalize_email(email: Optional[str]) -> str:
+    return (email or "").strip().lower()
+
+
+def failed_logins_key(email: Optional[str]) -> str:
+    return f"auth:failed-logins:{normalize_email(email)}"
+
+
+def lockout_key(email: Optional[str]) -> str:
+    return f"auth:lockout:{normalize_email(email)}"
+
+
+def is_login_locked(email: Optional[str]) -> bool:
+    return bool(cache.get(lockout_key(email)))
+
+
+def record_failed_login(email: Optional[str]) -> tuple[int, bool]:
+    """Count a failed login and return (attempts, locked_now).
+
+    Failures are counted over LOGIN_ATTEMPT_WINDOW, which is independent of
+    (and longer than) LOCKOUT_DURATION, so attempts spaced out to outlive the
+    lockout still add up. locked_now is only True for the attempt that
+    crosses LOGIN_ATTEMPTS, so the caller writes the lock to the database
+    once per lockout; the count then starts over for when the lock expires.
+    """
+    window = int(settings.LOGIN_ATTEMPT_WINDOW.total_seconds())
+    key = failed_logins_key(email)
+    cache.add(key, 0, timeout=window)
+    try:
+        attempts = cache.incr(key) or 0
+    except ValueError:
+        cache.set(key, 1, timeout=window)
+        attempts = 1
+
+    locked_now = attempts >= settings.LOGIN_ATTEMPTS and bool(
+        cache.add(
+            lockout_key(email),
+            True,
+            timeout=int(settings.LOCKOUT_DURATION.total_seconds()),
+        )
+    )
+    if locked_now:
+        cache.delete(key)
+    return attempts, locked_now
+
+
+def clear_failed_logins(email: Optional[str]) -> None:
+    cache.delete_many([failed_logins_key(email), lockout_key(email)])
@@ -0,0 +1,56 @@
+import time
+from os import cpu_count
+from typing import Any
+
+from django.contrib.auth.hashers import get_hasher, make_password
+from django.core.management.base import BaseCommand
+
+from core_apps.user_auth.hashing import create_pool, verify_encoded_password
+
+PASSWORD = "benchmark-Passw0rd!"
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure password verifications (one per login) per second with the "
+        "configured hasher, in-process and on a process pool."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--iterations", type=int, default=50)
+        parser.add_argument("--workers", type=int, default=cpu_count() or 1)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        iterations = options["iterations"]
+        workers = options["workers"]
+        hasher = get_hasher()
+        encoded = make_password(PASSWORD)
+        self.stdout.write(f"hasher: {type(hasher).__name__} ({hasher.algorithm})")
+
+        started = time.perf_counter()
+        for _ in range(iterations):
+            verify_encoded_password(PASSWORD, encoded)
+        inline_rate = iterations / (time.perf_counter() - started)
+        self.stdout.write(f"in-process: {inline_rate:8.1f} logins/s on 1 core")
+
+        with create_pool(workers) as pool:
+            # Warm the workers up so process start-up is not measured.
+            list(
+                pool.map(
+                    verify_encoded_password, [PASSWORD] * workers, [encoded] * workers
+                )
+            )
+            started = time.perf_counter()
+            list(
+                pool.map(
+                    verify_encoded_password,
+                    [PASSWORD] * iterations,
+                    [encoded] * iterations,
+                )
+            )
+            pool_rate = iterations / (time.perf_counter() - started)
+
+        self.stdout.write(
+            f"pool:       {pool_rate:8.1f} logins/s on {workers} workers "
+            f"({pool_rate / workers:.1f} per core)"
+        )
@@ -3,7 +3,6 @@ import string
 from os import getenv
 from typing import Any, Optional
 
-from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import UserManager as DjangoUserManager
 from django.core.exceptions import ValidationError
 from django.core.validators import validate_email
@@ -44,7 +43,7 @@ class UserManager(DjangoUserManager):
         validate_email_address(email)
 
         user = self.model(email=email, username=username, **extra_fields)
-        user.password = make_password(password)
+        user.set_password(password)
         user.save(using=self._db)
         return user
 
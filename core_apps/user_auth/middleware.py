@@ -1,9 +1,27 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+
+
 class CustomHeaderMiddleware:
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
         response = self.get_response(request)
+        self.add_user_header(request, response)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        await sync_to_async(self.add_user_header)(request, response)
+        return response
+
+    def add_user_header(self, request, response) -> None:
         if request.user.is_authenticated:
             response["X-Django-User"] = request.user.email
-        return response
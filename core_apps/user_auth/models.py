@@ -1,12 +1,19 @@
 import uuid
+from typing import Iterable, Optional
 
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from django.conf import settings
 from django.utils import timezone
+from django.contrib.auth.hashers import is_password_usable
 from django.contrib.auth.models import AbstractUser
 from django.utils.translation import gettext_lazy as _
 
 from .emails import send_account_locked_email
+from .hashing import hash_password, verify_password
+from .lockout import clear_failed_logins, is_login_locked, record_failed_login
+from .otp import OTPPurpose, issue_otp, verify_otp
 from .managers import UserManager
 
 
@@ -90,8 +97,6 @@ class User(AbstractUser):
     )
     failed_login_attempts = models.PositiveSmallIntegerField(default=0)
     last_failed_login = models.DateTimeField(null=True, blank=True)
-    otp = models.CharField(_("OTP"), max_length=6, blank=True)
-    otp_expiry_time = models.DateTimeField(_("OTP Expiry Time"), null=True, blank=True)
 
     objects = UserManager()
     USERNAME_FIELD = "email"
@@ -103,44 +108,101 @@ class User(AbstractUser):
         "security_answer",
     ]
 
-    def set_otp(self, otp: str) -> None:
-        self.otp = otp
-        self.otp_expiry_time = timezone.now() + settings.OTP_EXPIRATION
-        self.save()
-
-    def verify_otp(self, otp: str) -> bool:
-        if self.otp == otp and self.otp_expiry_time > timezone.now():
-            self.otp = ""
-            self.otp_expiry_time = None
-            self.save()
-            return True
-        return False
+    @classmethod
+    def from_db(cls, db, field_names, values) -> "User":
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def changed_fields(self, field_names: Iterable[str]) -> set[str]:
+        loaded = getattr(self, "_loaded_values", None)
+        if loaded is None:
+            return set(field_names)
+        changed = set()
+        for name in field_names:
+            if name in loaded:
+                if getattr(self, name) != loaded[name]:
+                    changed.add(name)
+            elif name in self.__dict__:
+                changed.add(name)
+        return changed
+
+    def set_password(self, raw_password: Optional[str]) -> None:
+        self.password = hash_password(raw_password)
+        self._password = raw_password
+
+    def check_password(self, raw_password: Optional[str]) -> bool:
+        if raw_password is None or not is_password_usable(self.password):
+            return False
+        valid, needs_rehash = verify_password(raw_password, self.password)
+        if valid and needs_rehash:
+            # The hasher or its cost settings changed since this hash was made.
+            self.set_password(raw_password)
+            self._password = None
+            self.save(update_fields=["password"])
+        return valid
+
+    def refresh_from_db(self, using=None, fields=None) -> None:
+        # Users rebuilt from a token snapshot defer most fields; load them all
+        # on first access instead of issuing one query per attribute.
+        deferred = self.get_deferred_fields()
+        if fields is not None and deferred and set(fields) <= deferred:
+            fields = list(deferred)
+        super().refresh_from_db(using=using, fields=fields)
+
+    def set_otp(self, otp: str, purpose: str = OTPPurpose.LOGIN) -> None:
+        issue_otp(self.email, purpose, otp)
+
+    def verify_otp(self, otp: str, purpose: str = OTPPurpose.LOGIN) -> bool:
+        return verify_otp(self.email, purpose, otp)
 
     def handle_failed_login_attempt(self) -> None:
-        self.failed_login_attempts += 1
+        attempts, locked_now = record_failed_login(self.email)
+        self.failed_login_attempts = min(attempts, settings.LOGIN_ATTEMPTS)
+        if locked_now:
+            self.lock_account()
+
+    def lock_account(self) -> None:
+        self.account_status = self.AccountStatus.LOCKED
         self.last_failed_login = timezone.now()
-        if self.failed_login_attempts >= settings.LOGIN_ATTEMPTS:
-            self.account_status = self.AccountStatus.LOCKED
-            self.save()
-            send_account_locked_email(self)
-        self.save()
+        self.save(
+            update_fields=[
+                "account_status",
+                "failed_login_attempts",
+                "last_failed_login",
+            ]
+        )
+        send_account_locked_email(self)
 
     def reset_failed_login_attempts(self) -> None:
-        self.failed_login_attempts = 0
-        self.last_failed_login = None
-        self.account_status = self.AccountStatus.ACTIVE
-        self.save()
+        clear_failed_logins(self.email)
+        if (
+            self.failed_login_attempts
+            or self.last_failed_login
+            or self.account_status == self.AccountStatus.LOCKED
+        ):
+            self.failed_login_attempts = 0
+            self.last_failed_login = None
+            self.account_status = self.AccountStatus.ACTIVE
+            self.save(
+                update_fields=[
+                    "account_status",
+                    "failed_login_attempts",
+                    "last_failed_login",
+                ]
+            )
 
     def unlock_account(self) -> None:
         if self.account_status == self.AccountStatus.LOCKED:
-            self.account_status = self.AccountStatus.ACTIVE
-            self.failed_login_attempts = 0
-            self.last_failed_login = None
-            self.save()
+            self.reset_failed_login_attempts()
 
     @property
     def is_locked_out(self) -> bool:
+        if is_login_locked(self.email):
+            return True
         if self.account_status == self.AccountStatus.LOCKED:
+            # The Redis window may be gone (expired or flushed); fall back to
+            # the lock recorded on the row.
             lockout_duration = settings.LOCKOUT_DURATION
             if self.last_failed_login:
                 time_since_last_attempt = timezone.now() - self.last_failed_login
@@ -162,6 +224,22 @@ class User(AbstractUser):
         verbose_name = _("User")
         verbose_name_plural = _("Users")
         ordering = ["-date_joined"]
+        # icontains compares UPPER(column) with LIKE '%term%'; trigram indexes
+        # on the same expression serve the profile list search.
+        indexes = [
+            GinIndex(
+                OpClass(Upper("id_no"), name="gin_trgm_ops"),
+                name="user_id_no_trgm_idx",
+            ),
+            GinIndex(
+                OpClass(Upper("first_name"), name="gin_trgm_ops"),
+                name="user_first_name_trgm_idx",
+            ),
+            GinIndex(
+                OpClass(Upper("last_name"), name="gin_trgm_ops"),
+                name="user_last_name_trgm_idx",
+            ),
+        ]
 
     def has_role(self, role_name: str) -> bool:
         return hasattr(self, "role") and self.role == role_name
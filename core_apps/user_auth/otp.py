@@ -0,0 +1,63 @@
+import hashlib
+import hmac
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .lockout import normalize_email
+from .utils import generate_otp
+
+
+class OTPPurpose:
+    LOGIN = "login"
+    TRANSFER = "transfer"
+
+
+def otp_key(email: str, purpose: str) -> str:
+    return f"otp:{purpose}:{normalize_email(email)}"
+
+
+def otp_attempts_key(email: str, purpose: str) -> str:
+    return f"otp-attempts:{purpose}:{normalize_email(email)}"
+
+
+def hash_otp(email: str, purpose: str, otp: str) -> str:
+    message = f"{purpose}:{normalize_email(email)}:{otp}".encode()
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
+
+def issue_otp(email: str, purpose: str, otp: Optional[str] = None) -> str:
+    otp = otp or generate_otp()
+    timeout = int(settings.OTP_EXPIRATION.total_seconds())
+    cache.set_many(
+        {
+            otp_key(email, purpose): hash_otp(email, purpose, otp),
+            otp_attempts_key(email, purpose): 0,
+        },
+        timeout=timeout,
+    )
+    return otp
+
+
+def verify_otp(email: str, purpose: str, otp: str) -> bool:
+    key = otp_key(email, purpose)
+    attempts_key = otp_attempts_key(email, purpose)
+    expected = cache.get(key)
+    if not expected or not otp:
+        return False
+
+    if hmac.compare_digest(expected, hash_otp(email, purpose, otp)):
+        # delete() only reports True for the caller that removed the key, so a
+        # code can be redeemed once even under concurrent requests.
+        redeemed = bool(cache.delete(key))
+        cache.delete(attempts_key)
+        return redeemed
+
+    try:
+        attempts = cache.incr(attempts_key)
+    except ValueError:
+        attempts = settings.OTP_MAX_ATTEMPTS
+    if attempts >= settings.OTP_MAX_ATTEMPTS:
+        cache.delete_many([key, attempts_key])
+    return False
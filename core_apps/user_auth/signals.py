@@ -0,0 +1,14 @@
+from typing import Any, Type
+
+from django.db.models.base import Model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate_user
+from .models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender: Type[Model], instance: User, **kwargs: Any) -> None:
+    invalidate_user(instance)
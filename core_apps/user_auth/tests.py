@@ -0,0 +1,204 @@
+import time
+from unittest import mock
+
+import redis
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.backends import base, locmem
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework_simplejwt.settings import api_settings
+
+from core_apps.common.redis import get_redis_client
+from .hashing import PasswordHashingBusy
+from .lockout import failed_logins_key, is_login_locked, record_failed_login
+from .models import User
+from .tokens import RedisBlacklistRefreshToken, blacklist_key
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class LoginQueryBudgetTests(TestCase):
+    password = "Str0ng-Passw0rd!"
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = User.objects.create_user(
+            email="budget@example.com",
+            password=cls.password,
+            first_name="Query",
+            last_name="Budget",
+            id_no="QB-0001",
+            security_question=User.SecurityQuestions.PET_NAME,
+            security_answer="rex",
+        )
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def login(self, password: str):
+        return self.client.post(
+            reverse("login"), {"email": self.user.email, "password": password}
+        )
+
+    @mock.patch("core_apps.user_auth.views.send_otp_email")
+    @mock.patch("core_apps.user_auth.views.generate_otp", return_value="123456")
+    def test_login_and_otp_verification(self, generate_otp, send_otp_email) -> None:
+        # One SELECT to authenticate; lockout state and the OTP live in the
+        # cache, and a clean login writes nothing.
+        with self.assertNumQueries(1):
+            response = self.login(self.password)
+        self.assertEqual(response.status_code, 200)
+        send_otp_email.assert_called_once_with(self.user.email, "123456")
+
+        # One SELECT to load the user the OTP was issued to.
+        with self.assertNumQueries(1):
+            # The accounts app reuses the "verify-otp" URL name for transfers.
+            response = self.client.post(
+                "/api/v1/auth/verify-otp/", {"email": self.user.email, "otp": "123456"}
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("access", response.cookies)
+        self.assertIn("refresh", response.cookies)
+
+    @mock.patch("core_apps.user_auth.models.send_account_locked_email")
+    def test_lockout_is_one_update_without_profile_cascade(self, send_email) -> None:
+        # A failed attempt is authenticate() plus djoser's fallback lookup.
+        for _ in range(settings.LOGIN_ATTEMPTS - 1):
+            with self.assertNumQueries(2):
+                response = self.login("wrong-password")
+            self.assertEqual(response.status_code, 400)
+
+        # The attempt that crosses the limit also loads the user and writes
+        # the lock columns in a single UPDATE; the profile is not touched.
+        with self.assertNumQueries(4):
+            response = self.login("wrong-password")
+        self.assertEqual(response.status_code, 403)
+        send_email.assert_called_once()
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.account_status, User.AccountStatus.LOCKED)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class PasswordHashingBusyTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+    def assertServiceUnavailable(self, response) -> None:
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "1")
+
+    @mock.patch(
+        "core_apps.user_auth.models.verify_password", side_effect=PasswordHashingBusy
+    )
+    def test_busy_login_is_503_and_not_a_failed_attempt(self, verify) -> None:
+        User.objects.create_user(
+            email="busy@example.com",
+            password="Str0ng-Passw0rd!",
+            first_name="Busy",
+            last_name="Pool",
+            id_no="BP-0001",
+            security_question=User.SecurityQuestions.PET_NAME,
+            security_answer="rex",
+        )
+        response = self.client.post(
+            reverse("login"),
+            {"email": "busy@example.com", "password": "Str0ng-Passw0rd!"},
+        )
+        self.assertServiceUnavailable(response)
+        self.assertIsNone(cache.get(failed_logins_key("busy@example.com")))
+
+    @mock.patch(
+        "core_apps.user_auth.models.hash_password", side_effect=PasswordHashingBusy
+    )
+    def test_busy_registration_is_503(self, hash_password) -> None:
+        response = self.client.post(
+            "/api/v1/auth/users/",
+            {
+                "email": "new@example.com",
+                "username": "newcustomer",
+                "first_name": "New",
+                "last_name": "Customer",
+                "password": "Str0ng-Passw0rd!",
+                "re_password": "Str0ng-Passw0rd!",
+                "id_no": "BP-0002",
+                "security_question": User.SecurityQuestions.PET_NAME,
+                "security_answer": "rex",
+            },
+        )
+        self.assertServiceUnavailable(response)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class LoginLockoutWindowTests(TestCase):
+    email = "slow@example.com"
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_failures_spread_past_the_lockout_duration_still_lock(self) -> None:
+        now = [time.time()]
+        gap = settings.LOCKOUT_DURATION.total_seconds() + 1
+        clock = mock.Mock(time=lambda: now[0])
+        with mock.patch.object(base, "time", clock), mock.patch.object(
+            locmem, "time", clock
+        ):
+            for attempt in range(1, settings.LOGIN_ATTEMPTS):
+                self.assertEqual(record_failed_login(self.email), (attempt, False))
+                now[0] += gap
+
+            attempts, locked_now = record_failed_login(self.email)
+            self.assertEqual((attempts, locked_now), (settings.LOGIN_ATTEMPTS, True))
+            self.assertTrue(is_login_locked(self.email))
+
+            # The lock expires after LOCKOUT_DURATION and the count starts over.
+            now[0] += gap
+            self.assertFalse(is_login_locked(self.email))
+            self.assertEqual(record_failed_login(self.email), (1, False))
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class RefreshTokenBlacklistTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = User.objects.create_user(
+            email="refresh@example.com",
+            password="Str0ng-Passw0rd!",
+            first_name="Refresh",
+            last_name="Token",
+            id_no="RT-0001",
+            security_question=User.SecurityQuestions.PET_NAME,
+            security_answer="rex",
+        )
+
+    def setUp(self) -> None:
+        self.refresh = RedisBlacklistRefreshToken.for_user(self.user)
+        self.addCleanup(
+            get_redis_client().delete,
+            blacklist_key(self.refresh[api_settings.JTI_CLAIM]),
+        )
+
+    def refresh_tokens(self):
+        # Post the original token, not the rotated one set as a cookie.
+        self.client.cookies.clear()
+        return self.client.post(
+            reverse("token_refresh"), {"refresh": str(self.refresh)}
+        )
+
+    def test_rotated_token_is_rejected(self) -> None:
+        self.assertEqual(self.refresh_tokens().status_code, 200)
+        self.assertEqual(self.refresh_tokens().status_code, 401)
+
+    def test_token_is_rejected_while_redis_is_down(self) -> None:
+        down = mock.Mock()
+        down.exists.side_effect = redis.ConnectionError
+        down.set.side_effect = redis.ConnectionError
+        with mock.patch(
+            "core_apps.user_auth.tokens.get_redis_client", return_value=down
+        ):
+            self.assertEqual(self.refresh_tokens().status_code, 401)
+        # Nothing was rotated, so the token works again once Redis is back.
+        self.assertEqual(self.refresh_tokens().status_code, 200)
@@ -0,0 +1,119 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+import redis
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.backends import TokenBackend
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken, BlacklistMixin, RefreshToken
+
+from core_apps.common.redis import get_redis_client
+
+
+def blacklist_key(jti: str) -> str:
+    return f"auth:blacklist:{jti}"
+
+
+class CachedTokenBackend(TokenBackend):
+    """Token backend that remembers recently verified tokens.
+
+    The verifying key is prepared once by TokenBackend; on top of that, tokens
+    whose signature was already checked are served from a per-process LRU
+    until they expire.
+    """
+
+    def __init__(self, *args: Any, cache_size: int, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.cache_size = cache_size
+        self.verified: OrderedDict = OrderedDict()
+        self.lock = threading.Lock()
+
+    def decode(self, token: Any, verify: bool = True) -> dict[str, Any]:
+        if not verify or self.cache_size <= 0:
+            return super().decode(token, verify=verify)
+
+        with self.lock:
+            payload = self.verified.get(token)
+            if payload is not None:
+                if self.is_expired(payload):
+                    del self.verified[token]
+                    payload = None
+                else:
+                    self.verified.move_to_end(token)
+
+        if payload is None:
+            payload = super().decode(token, verify=True)
+            with self.lock:
+                self.verified[token] = payload
+                if len(self.verified) > self.cache_size:
+                    self.verified.popitem(last=False)
+        return dict(payload)
+
+    def is_expired(self, payload: dict[str, Any]) -> bool:
+        exp = payload.get("exp")
+        if exp is None:
+            return False
+        return exp + self.get_leeway().total_seconds() <= time.time()
+
+
+token_backend = CachedTokenBackend(
+    api_settings.ALGORITHM,
+    api_settings.SIGNING_KEY,
+    api_settings.VERIFYING_KEY,
+    api_settings.AUDIENCE,
+    api_settings.ISSUER,
+    api_settings.JWK_URL,
+    api_settings.LEEWAY,
+    api_settings.JSON_ENCODER,
+    cache_size=settings.JWT_VERIFY_CACHE_SIZE,
+)
+
+
+class CachedAccessToken(AccessToken):
+    _token_backend = token_backend
+
+
+class RedisBlacklistRefreshToken(RefreshToken):
+    """Refresh token whose blacklist lives in Redis instead of the
+    token_blacklist tables. Entries expire together with the token.
+
+    The blacklist goes through the raw Redis client rather than the Django
+    cache, which swallows connection errors: when Redis is unreachable the
+    token is rejected instead of being treated as not blacklisted.
+    """
+
+    access_token_class = CachedAccessToken
+
+    def check_blacklist(self) -> None:
+        try:
+            blacklisted = get_redis_client().exists(
+                blacklist_key(self.payload[api_settings.JTI_CLAIM])
+            )
+        except redis.RedisError:
+            raise TokenError(_("Token blacklist is unavailable"))
+        if blacklisted:
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self) -> None:
+        timeout = int(self.payload["exp"] - time.time())
+        if timeout > 0:
+            try:
+                get_redis_client().set(
+                    blacklist_key(self.payload[api_settings.JTI_CLAIM]),
+                    1,
+                    ex=timeout,
+                )
+            except redis.RedisError:
+                raise TokenError(_("Token blacklist is unavailable"))
+
+    def outstand(self) -> Optional[Any]:
+        return None
+
+    @classmethod
+    def for_user(cls, user: Any) -> "RedisBlacklistRefreshToken":
+        # Skip BlacklistMixin.for_user, which records an OutstandingToken row.
+        return super(BlacklistMixin, cls).for_user(user)
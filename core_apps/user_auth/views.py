@@ -2,17 +2,20 @@ from typing import Any, Optional
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.utils import timezone
 from loguru import logger
 from djoser.views import TokenCreateView, User
 from rest_framework import permissions, status
 from rest_framework.response import Response
 from rest_framework.request import Request
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework_simplejwt.views import TokenRefreshView
 
 from .emails import send_otp_email
+from .hashing import PasswordHashingBusy
+from .lockout import is_login_locked, record_failed_login
+from .otp import OTPPurpose, verify_otp
+from .tokens import RedisBlacklistRefreshToken
 from .utils import generate_otp
 
 User = get_user_model()
@@ -48,13 +51,7 @@ class CustomTokenCreateView(TokenCreateView):
     def _action(self, serializer):
         user = serializer.user
         if user.is_locked_out:
-            return Response(
-                {
-                    "error": f"Account is locked due to multiple failed login attempts "
-                    f"Please try again after {settings.LOCKOUT_DURATION.total_seconds() / 60} minutes.",
-                },
-                status=status.HTTP_403_FORBIDDEN,
-            )
+            return self.locked_response()
         user.reset_failed_login_attempts()
 
         otp = generate_otp()
@@ -69,31 +66,37 @@ class CustomTokenCreateView(TokenCreateView):
         )
 
     def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        email = request.data.get("email")
+        if is_login_locked(email):
+            return self.locked_response()
+
         serializer = self.get_serializer(data=request.data)
 
         try:
             serializer.is_valid(raise_exception=True)
+        except PasswordHashingBusy:
+            # Not a failed login; the exception handler answers with a 503.
+            raise
         except Exception:
-            email = request.data.get("email")
-            user = User.objects.filter(email=email).first()
-            if user:
-                user.handle_failed_login_attempt()
-                failed_attempts = user.failed_login_attempts
-                logger.error(
-                    f"Failed login attempt for {email}. Failed attempts: {failed_attempts}"
+            failed_attempts, locked_now = record_failed_login(email)
+            logger.error(
+                f"Failed login attempt for {email}. Failed attempts: {failed_attempts}"
+            )
+            if locked_now:
+                user = User.objects.filter(email=email).first()
+                if user:
+                    user.failed_login_attempts = settings.LOGIN_ATTEMPTS
+                    user.lock_account()
+            if failed_attempts >= settings.LOGIN_ATTEMPTS:
+                return Response(
+                    {
+                        "error": f"You have exceeded the maximum number of failed login attempts. "
+                        f"Your account has been locked for "
+                        f"{settings.LOCKOUT_DURATION.total_seconds() / 60} minutes. "
+                        f"An email has been sent to you with futher instructions",
+                    },
+                    status=status.HTTP_403_FORBIDDEN,
                 )
-                if failed_attempts >= settings.LOGIN_ATTEMPTS:
-                    return Response(
-                        {
-                            "error": f"You have exceeded the maximum number of failed login attempts. "
-                            f"Your account has been locked for "
-                            f"{settings.LOCKOUT_DURATION.total_seconds() / 60} minutes. "
-                            f"An email has been sent to you with futher instructions",
-                        },
-                        status=status.HTTP_403_FORBIDDEN,
-                    )
-            else:
-                logger.error(f"Failed login attempt for non-existent user: {email}")
 
             return Response(
                 {"error": "Invalid credentials. Please check your email and password."},
@@ -101,6 +104,15 @@ class CustomTokenCreateView(TokenCreateView):
             )
         return self._action(serializer)
 
+    def locked_response(self) -> Response:
+        return Response(
+            {
+                "error": f"Account is locked due to multiple failed login attempts "
+                f"Please try again after {settings.LOCKOUT_DURATION.total_seconds() / 60} minutes.",
+            },
+            status=status.HTTP_403_FORBIDDEN,
+        )
+
 
 class CustomTokenRefreshView(TokenRefreshView):
     def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
@@ -140,13 +152,18 @@ class OTPVerifyView(APIView):
     permission_classes = [permissions.AllowAny]
 
     def post(self, request):
+        email = request.data.get("email")
         otp = request.data.get("otp")
 
-        if not otp:
+        if not email or not otp:
             return Response(
-                {"error": "OTP is required."}, status=status.HTTP_400_BAD_REQUEST
+                {"error": "Email and OTP are required."},
+                status=status.HTTP_400_BAD_REQUEST,
             )
-        user = User.objects.filter(otp=otp, otp_expiry_time__gt=timezone.now()).first()
+
+        user = None
+        if verify_otp(email, OTPPurpose.LOGIN, otp):
+            user = User.objects.filter(email=email).first()
 
         if not user:
             return Response(
@@ -162,9 +179,7 @@ class OTPVerifyView(APIView):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        user.verify_otp(otp)
-
-        refresh = RefreshToken.for_user(user)
+        refresh = RedisBlacklistRefreshToken.for_user(user)
         access_token = str(refresh.access_token)
         refresh_token = str(refresh)
 
@@ -180,6 +195,13 @@ class OTPVerifyView(APIView):
 
 class LogoutView(APIView):
     def post(self, request, *args, **kwargs):
+        refresh_token = request.COOKIES.get("refresh")
+        if refresh_token:
+            try:
+                RedisBlacklistRefreshToken(refresh_token).blacklist()
+            except TokenError:
+                pass
+
         response = Response(status=status.HTTP_204_NO_CONTENT)
         response.delete_cookie("access")
         response.delete_cookie("refresh")
@@ -127,6 +127,18 @@ class ProfileAdmin(admin.ModelAdmin):
 
     photo_preview.short_description = _("Photo Preview")
 
+    # The admin forms already ran full_clean on these instances.
+    def save_model(self, request, obj, form, change):
+        obj.save(validate=False)
+
+    def save_formset(self, request, form, formset, change):
+        instances = formset.save(commit=False)
+        for obj in formset.deleted_objects:
+            obj.delete()
+        for instance in instances:
+            instance.save(validate=False)
+        formset.save_m2m()
+
     @admin.register(NextOfKin)
     class NextOfKinAdmin(admin.ModelAdmin):
         list_display = [
@@ -146,3 +158,6 @@ class ProfileAdmin(admin.ModelAdmin):
             return f"{obj.first_name} {obj.last_name}"
 
         full_name.short_description = _("Full Name")
+
+        def save_model(self, request, obj, form, change):
+            obj.save(validate=False)
@@ -0,0 +1,18 @@
+from typing import Any, Optional
+
+from core_apps.common.cache import cached_lookup, invalidate_lookup
+from .models import Profile
+
+PROFILE_BY_USER = "profile-by-user"
+
+
+def get_profile_by_user(user_id: Any) -> Optional[Profile]:
+    return cached_lookup(
+        PROFILE_BY_USER,
+        user_id,
+        lambda: Profile.objects.filter(user_id=user_id).first(),
+    )
+
+
+def invalidate_profile(user_id: Any) -> None:
+    invalidate_lookup(PROFILE_BY_USER, user_id)
@@ -0,0 +1,27 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from core_apps.user_profile.search import (
+    iter_user_id_batches,
+    refresh_search_documents,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the customer search documents of every profile from their "
+        "user details, phone number and bank account numbers."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        rebuilt = 0
+        for user_ids in iter_user_id_batches(options["batch_size"]):
+            rebuilt += refresh_search_documents(
+                user_ids, batch_size=options["batch_size"]
+            )
+            self.stdout.write(f"Rebuilt {rebuilt} search documents")
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rebuilt} search documents"))
@@ -0,0 +1,47 @@
+# Generated by Django 4.2.15 on 2026-10-19 08:33
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # The profile table is large; build the indexes without locking out
+    # writes. Populate the new columns with rebuild_customer_search.
+    atomic = False
+
+    dependencies = [
+        ("user_profile", "0003_alter_profile_account_currency"),
+        # Enables pg_trgm.
+        ("user_auth", "0005_user_search_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="search_text",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AddField(
+            model_name="profile",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                blank=True, editable=False, null=True
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="profile",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="profile_search_vector_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="profile",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_text"],
+                name="profile_search_text_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
@@ -3,6 +3,8 @@ from typing import Any
 from cloudinary.models import CloudinaryField
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils.translation import gettext_lazy as _
@@ -210,6 +212,19 @@ class Profile(TimeStampedModel):
         blank=True,
         null=True,
     )
+    # Maintained by core_apps.user_profile.search; see refresh_search_documents.
+    search_vector = SearchVectorField(null=True, blank=True, editable=False)
+    search_text = models.TextField(default="", blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_vector"], name="profile_search_vector_idx"),
+            GinIndex(
+                fields=["search_text"],
+                opclasses=["gin_trgm_ops"],
+                name="profile_search_text_trgm_idx",
+            ),
+        ]
 
     def clean(self) -> None:
         super().clean()
@@ -223,8 +238,9 @@ class Profile(TimeStampedModel):
                     }
                 )
 
-    def save(self, *args: Any, **kwargs: Any) -> None:
-        self.full_clean()
+    def save(self, *args: Any, validate: bool = True, **kwargs: Any) -> None:
+        if validate:
+            self.full_clean()
         super().save(*args, **kwargs)
 
     def is_complete_with_next_of_kin(self):
@@ -340,8 +356,9 @@ class NextOfKin(TimeStampedModel):
                     }
                 )
 
-    def save(self, *args: Any, **kwargs: Any) -> None:
-        self.full_clean()
+    def save(self, *args: Any, validate: bool = True, **kwargs: Any) -> None:
+        if validate:
+            self.full_clean()
         super().save(*args, **kwargs)
 
     def __str__(self) -> str:
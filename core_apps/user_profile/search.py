@@ -0,0 +1,159 @@
+import re
+from collections import defaultdict
+from typing import Any, Iterable, Iterator
+
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramWordSimilarity,
+)
+from django.db.models import F, Q, QuerySet, Value
+
+from core_apps.accounts.models import BankAccount
+from .models import Profile
+
+# Names and identifiers are not language words; "simple" lowercases without
+# stemming or stop words.
+SEARCH_CONFIG = "simple"
+
+# Document weights, most specific match first.
+NAME_WEIGHT = "A"
+IDENTIFIER_WEIGHT = "B"
+EMAIL_WEIGHT = "C"
+PHONE_WEIGHT = "D"
+
+_TOKEN = re.compile(r"[^\W_]+")
+
+
+def normalize(*values: Any) -> str:
+    """Lowercase values and split them into plain alphanumeric words.
+
+    Queries and documents go through the same function, so punctuation in
+    emails, phone numbers or ID numbers never changes what matches.
+    """
+    return " ".join(
+        token
+        for value in values
+        if value
+        for token in _TOKEN.findall(str(value).lower())
+    )
+
+
+def phone_values(phone_number: Any) -> list[str]:
+    if not phone_number:
+        return []
+    values = [str(phone_number)]
+    national_number = getattr(phone_number, "national_number", None)
+    if national_number:
+        values.append(str(national_number))
+    return values
+
+
+def search_document(profile: Profile, account_numbers: list[str]) -> dict[str, str]:
+    user = profile.user
+    return {
+        NAME_WEIGHT: normalize(user.first_name, user.middle_name, user.last_name),
+        IDENTIFIER_WEIGHT: normalize(user.id_no, *account_numbers),
+        EMAIL_WEIGHT: normalize(user.email),
+        PHONE_WEIGHT: normalize(*phone_values(profile.phone_number)),
+    }
+
+
+def search_vector(document: dict[str, str]) -> SearchVector:
+    vectors = [
+        SearchVector(Value(text), weight=weight, config=SEARCH_CONFIG)
+        for weight, text in document.items()
+    ]
+    vector = vectors[0]
+    for other in vectors[1:]:
+        vector = vector + other
+    return vector
+
+
+def refresh_search_documents(user_ids: Iterable[Any], batch_size: int = 500) -> int:
+    """Rebuild the search columns of the profiles belonging to user_ids.
+
+    Reads the profiles and their account numbers in two queries and writes
+    every profile back with one UPDATE per batch.
+    """
+    user_ids = list(user_ids)
+    profiles = list(
+        Profile.objects.filter(user_id__in=user_ids)
+        .select_related("user")
+        .only(
+            "id",
+            "phone_number",
+            "user__first_name",
+            "user__middle_name",
+            "user__last_name",
+            "user__email",
+            "user__id_no",
+        )
+    )
+    account_numbers = defaultdict(list)
+    for user_id, account_number in BankAccount.objects.filter(
+        user_id__in=user_ids
+    ).values_list("user_id", "account_number"):
+        account_numbers[user_id].append(account_number)
+
+    for profile in profiles:
+        document = search_document(profile, account_numbers[profile.user_id])
+        profile.search_vector = search_vector(document)
+        profile.search_text = " ".join(text for text in document.values() if text)
+
+    Profile.objects.bulk_update(
+        profiles, ["search_vector", "search_text"], batch_size=batch_size
+    )
+    return len(profiles)
+
+
+def iter_user_id_batches(batch_size: int) -> Iterator[list]:
+    user_ids = Profile.objects.order_by("user_id").values_list("user_id", flat=True)
+    last_id = None
+    while True:
+        page = user_ids if last_id is None else user_ids.filter(user_id__gt=last_id)
+        batch = list(page[:batch_size])
+        if not batch:
+            return
+        yield batch
+        last_id = batch[-1]
+
+
+def search_query(text: str) -> SearchQuery:
+    # Tokens are alphanumeric only, so they are safe to splice into a raw
+    # tsquery; ":*" makes every word a prefix match.
+    return SearchQuery(
+        " & ".join(f"{token}:*" for token in text.split()),
+        search_type="raw",
+        config=SEARCH_CONFIG,
+    )
+
+
+def search_customers(query: str, limit: int = 20) -> QuerySet:
+    """Return the customer profiles best matching query, best first.
+
+    A profile matches when every word of the query prefixes a word of its
+    document, or when the query occurs anywhere in its search text (partial
+    ID, phone or account numbers). Both filters are served by GIN indexes.
+    """
+    text = normalize(query)
+    if not text:
+        return Profile.objects.none()
+
+    ts_query = search_query(text)
+    return (
+        Profile.objects.filter(
+            Q(search_vector=ts_query) | Q(search_text__contains=text),
+            user__is_staff=False,
+            user__is_superuser=False,
+        )
+        .select_related("user")
+        .prefetch_related("user__bank_accounts")
+        .defer("search_vector", "search_text")
+        .annotate(
+            rank=SearchRank(F("search_vector"), ts_query)
+            + TrigramWordSimilarity(Value(text), "search_text")
+        )
+        .order_by("-rank")[:limit]
+    )
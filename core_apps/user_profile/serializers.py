@@ -3,14 +3,13 @@ from typing import Dict, Any
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.contrib.contenttypes.models import ContentType
 from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
 from django_countries.serializer_fields import CountryField
 from phonenumber_field.serializerfields import PhoneNumberField
 from rest_framework import serializers
 
-from core_apps.common.models import ContentView
+from core_apps.common.view_tracking import get_view_count
 from core_apps.accounts.models import BankAccount
 from .models import Profile, NextOfKin
 from .tasks import upload_photos_to_cloudinary
@@ -178,22 +177,25 @@ class ProfileSerializer(serializers.ModelSerializer):
         return instance
 
     def get_view_count(self, obj: Profile) -> int:
-        content_type = ContentType.objects.get_for_model(obj)
-        return ContentView.objects.filter(
-            content_type=content_type, object_id=obj.id
-        ).count()
+        return get_view_count(obj)
 
 
 class ProfileListSerializer(serializers.ModelSerializer):
-    full_name = serializers.ReadOnlyField(source="user.full_name")
+    id = UUIDField(read_only=True)
+    full_name = serializers.ReadOnlyField(source="user.fullname")
     username = serializers.ReadOnlyField(source="user.username")
     email = serializers.EmailField(source="user.email", read_only=True)
+    id_no = serializers.ReadOnlyField(source="user.id_no")
     photo = serializers.SerializerMethodField()
+    # Annotated by annotate_view_counts in ProfileListApiView.get_queryset.
+    view_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Profile
         fields = [
+            "id",
             "full_name",
+            "id_no",
             "username",
             "email",
             "photo",
@@ -201,6 +203,7 @@ class ProfileListSerializer(serializers.ModelSerializer):
             "nationality",
             "country_of_birth",
             "phone_number",
+            "view_count",
         ]
 
     def get_photo(self, obj: Profile) -> str | None:
@@ -208,3 +211,18 @@ class ProfileListSerializer(serializers.ModelSerializer):
             return obj.photo_url
         except AttributeError:
             return None
+
+
+class CustomerSearchSerializer(ProfileListSerializer):
+    account_numbers = serializers.SerializerMethodField()
+    rank = serializers.FloatField(read_only=True)
+
+    class Meta(ProfileListSerializer.Meta):
+        fields = [
+            field
+            for field in ProfileListSerializer.Meta.fields
+            if field != "view_count"
+        ] + ["account_numbers", "rank"]
+
+    def get_account_numbers(self, obj: Profile) -> list[str]:
+        return [account.account_number for account in obj.user.bank_accounts.all()]
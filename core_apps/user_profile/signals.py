@@ -1,12 +1,16 @@
-from typing import Any, Type
+from typing import Any, Optional, Type
 from django.db.models.base import Model
 
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
+from django.utils import timezone
 from loguru import logger
 
 from config.settings.base import AUTH_USER_MODEL
+from core_apps.accounts.models import BankAccount
+from core_apps.user_profile.cache import invalidate_profile
 from core_apps.user_profile.models import Profile
+from core_apps.user_profile.search import refresh_search_documents
 
 
 @receiver(post_save, sender=AUTH_USER_MODEL)
@@ -14,13 +18,68 @@ def create_user_profile(
     sender: Type[Model], instance: Model, created: bool, **kwargs: Any
 ) -> None:
     if created:
-        Profile.objects.create(user=instance)
+        Profile(user=instance).save(force_insert=True, validate=False)
         logger.info(
             f"Profile created for user {instance.first_name} {instance.last_name}"
         )
 
 
+# User columns surfaced through the profile; saves that change none of them
+# (login counters, lockout state, password) leave the profile alone.
+PROFILE_USER_FIELDS = {
+    "first_name",
+    "middle_name",
+    "last_name",
+    "username",
+    "email",
+    "id_no",
+}
+
+
 @receiver(post_save, sender=AUTH_USER_MODEL)
-def save_user_profile(sender: Type[Model], instance: Model, **kwargs: Any) -> None:
-    instance.profile.save()
+def save_user_profile(
+    sender: Type[Model],
+    instance: Model,
+    created: bool,
+    update_fields: Optional[frozenset] = None,
+    **kwargs: Any,
+) -> None:
+    if created:
+        return
+    fields = PROFILE_USER_FIELDS if update_fields is None else update_fields
+    if not instance.changed_fields(PROFILE_USER_FIELDS & fields):
+        return
+    Profile.objects.filter(user_id=instance.pk).update(updated_at=timezone.now())
+    invalidate_profile(instance.pk)
+    refresh_search_documents([instance.pk])
     logger.info(f"Profile saved for user {instance.first_name} {instance.last_name}")
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_cached_profile(
+    sender: Type[Model], instance: Profile, **kwargs: Any
+) -> None:
+    invalidate_profile(instance.user_id)
+
+
+@receiver(post_save, sender=Profile)
+def refresh_profile_search_document(
+    sender: Type[Model],
+    instance: Profile,
+    update_fields: Optional[frozenset] = None,
+    **kwargs: Any,
+) -> None:
+    # phone_number is the only profile column in the search document.
+    if update_fields is None or "phone_number" in update_fields:
+        refresh_search_documents([instance.user_id])
+
+
+@receiver(post_save, sender=BankAccount)
+@receiver(post_delete, sender=BankAccount)
+def refresh_account_holder_search_document(
+    sender: Type[Model], instance: BankAccount, **kwargs: Any
+) -> None:
+    # Account numbers never change, so only new and deleted accounts matter.
+    if kwargs.get("created", True):
+        refresh_search_documents([instance.user_id])
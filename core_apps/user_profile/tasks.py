@@ -25,7 +25,11 @@ def upload_photos_to_cloudinary(profile_id: UUID, photos: dict) -> None:
 
             setattr(profile, field_name, response["public_id"])
             setattr(profile, f"{field_name}_url", response["url"])
-        profile.save()
+
+        update_fields = ["updated_at"]
+        for field_name in photos:
+            update_fields += [field_name, f"{field_name}_url"]
+        profile.save(validate=False, update_fields=update_fields)
 
         logger.info(f"Photos uploaded to cloudinary for profile {profile_id}")
     except Exception as e:
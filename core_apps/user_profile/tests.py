@@ -0,0 +1,176 @@
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core_apps.accounts.models import BankAccount
+from core_apps.common.models import ContentView, ContentViewDailyRollup
+from core_apps.user_auth.models import User
+from .models import NextOfKin, Profile
+from .search import refresh_search_documents, search_customers
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+def create_customer(email: str, id_no: str, **kwargs) -> User:
+    kwargs.setdefault("first_name", "Profile")
+    kwargs.setdefault("last_name", "Owner")
+    return User.objects.create_user(
+        email=email,
+        password="Str0ng-Passw0rd!",
+        id_no=id_no,
+        security_question=User.SecurityQuestions.PET_NAME,
+        security_answer="rex",
+        **kwargs,
+    )
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class NextOfKinDetailTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = create_customer("kin@example.com", "NK-0001")
+        cls.kin = NextOfKin(
+            profile=cls.user.profile,
+            first_name="Ada",
+            last_name="Owner",
+            relationship="Sister",
+            email_address="ada@example.com",
+            phone_number="+237670000000",
+            city="Douala",
+            country="CM",
+        )
+        cls.kin.save(validate=False)
+
+    def test_retrieve_next_of_kin(self) -> None:
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.get(reverse("next-of-kin-detail", args=[self.kin.pk]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "ada@example.com")
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class ProfileListTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.manager = create_customer(
+            "list.manager@example.com",
+            "PL-0001",
+            role=User.RoleChoices.BRANCH_MANAGER,
+        )
+        cls.viewed = create_customer(
+            "viewed.customer@example.com",
+            "PL-0002",
+            first_name="ada",
+            middle_name="king",
+            last_name="lovelace",
+        )
+        for number in range(3, 8):
+            create_customer(f"customer{number}@example.com", f"PL-000{number}")
+        create_customer("list.staff@example.com", "PL-0008", is_staff=True)
+
+        profile = cls.viewed.profile
+        ContentView.record_views_bulk(
+            [(profile, None, "10.0.0.1"), (profile, cls.manager, "10.0.0.2")]
+        )
+        ContentViewDailyRollup.objects.create(
+            content_type=ContentType.objects.get_for_model(Profile),
+            object_id=profile.pk,
+            day=timezone.localdate(),
+            viewers=3,
+        )
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.client.force_authenticate(self.manager)
+
+    def list_profiles(self, page_size: int) -> list[dict]:
+        response = self.client.get(reverse("profile-list"), {"page_size": page_size})
+        self.assertEqual(response.status_code, 200)
+        return response.data["results"]
+
+    def test_query_count_does_not_grow_with_the_page(self) -> None:
+        # The count, then one page of profiles with users and view counts.
+        with self.assertNumQueries(2):
+            self.assertEqual(len(self.list_profiles(page_size=2)), 2)
+        with self.assertNumQueries(2):
+            self.assertEqual(len(self.list_profiles(page_size=10)), 7)
+
+    def test_profiles_carry_name_id_and_view_count(self) -> None:
+        profiles = {profile["email"]: profile for profile in self.list_profiles(10)}
+
+        self.assertNotIn("list.staff@example.com", profiles)
+        viewed = profiles["viewed.customer@example.com"]
+        self.assertEqual(viewed["id"], str(self.viewed.profile.pk))
+        self.assertEqual(viewed["full_name"], "Ada King Lovelace")
+        self.assertEqual(viewed["id_no"], "PL-0002")
+        # Two viewers still in ContentView plus three rolled up.
+        self.assertEqual(viewed["view_count"], 5)
+        self.assertEqual(profiles["customer3@example.com"]["view_count"], 0)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class CustomerSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.jonathan = create_customer(
+            "jonathan.smith@example.com",
+            "ID-778899",
+            first_name="Jonathan",
+            last_name="Smith",
+        )
+        cls.jane = create_customer(
+            "jane.doe@example.com", "ID-112233", first_name="Jane", last_name="Doe"
+        )
+        cls.staff = create_customer(
+            "jon.staff@example.com",
+            "ID-445566",
+            first_name="Jon",
+            last_name="Staff",
+            is_staff=True,
+        )
+        BankAccount.objects.create(
+            user=cls.jane,
+            account_number="0123456789",
+            currency=BankAccount.AccountCurrency.USD,
+        )
+        # Start from empty documents so only refresh_search_documents fills them.
+        Profile.objects.update(search_vector=None, search_text="")
+        cls.refreshed = refresh_search_documents(
+            [cls.jonathan.pk, cls.jane.pk, cls.staff.pk]
+        )
+
+    def search(self, query: str) -> list:
+        return [profile.user_id for profile in search_customers(query)]
+
+    def test_refresh_writes_every_document(self) -> None:
+        self.assertEqual(self.refreshed, 3)
+        profile = Profile.objects.get(user=self.jane)
+        # Names, identifiers, email, then the default phone number.
+        self.assertTrue(
+            profile.search_text.startswith(
+                "jane doe id 112233 0123456789 jane doe example com "
+            )
+        )
+        self.assertIsNotNone(profile.search_vector)
+
+    def test_name_prefixes_match(self) -> None:
+        self.assertEqual(self.search("jon"), [self.jonathan.pk])
+        self.assertEqual(self.search("Smi Jonat"), [self.jonathan.pk])
+        self.assertEqual(self.search("jo smith"), [self.jonathan.pk])
+
+    def test_id_fragment_matches(self) -> None:
+        self.assertEqual(self.search("7788"), [self.jonathan.pk])
+        self.assertEqual(self.search("ID-1122"), [self.jane.pk])
+
+    def test_account_number_matches(self) -> None:
+        self.assertEqual(self.search("0123456789"), [self.jane.pk])
+        self.assertEqual(self.search("3456"), [self.jane.pk])
+
+    def test_staff_and_empty_queries_match_nothing(self) -> None:
+        self.assertEqual(self.search("staff"), [])
+        self.assertEqual(self.search(" -- "), [])
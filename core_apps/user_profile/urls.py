@@ -1,15 +1,23 @@
 from django.urls import path
 
 from .views import (
+    CustomerSearchAPIView,
     NextOfKinListApiView,
     NextOfKinDetailApiView,
     ProfileListApiView,
     ProfileDetailApiView,
+    AsyncProfileDetailApiView,
 )
 
 urlpatterns = [
     path("", ProfileListApiView.as_view(), name="profile-list"),
+    path("search/", CustomerSearchAPIView.as_view(), name="customer-search"),
     path("my-profile/", ProfileDetailApiView.as_view(), name="profile-detail"),
+    path(
+        "my-profile/async/",
+        AsyncProfileDetailApiView.as_view(),
+        name="profile-detail-async",
+    ),
     path(
         "my-profile/next-of-kin/",
         NextOfKinListApiView.as_view(),
@@ -1,26 +1,35 @@
 from locale import currency
 from typing import Any, List
 
-from django.contrib.contenttypes.models import ContentType
+from asgiref.sync import sync_to_async
 from django.db import transaction
 from django.http import Http404
 from django.shortcuts import get_object_or_404
-from django.utils import timezone
 from django_filters import CharFilter, FilterSet
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import status, filters, generics, serializers
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
+from rest_framework.permissions import SAFE_METHODS
 from rest_framework.response import Response
 from rest_framework.request import Request
 
-from core_apps.common.models import ContentView
-from core_apps.common.permissions import IsBranchManager
+from core_apps.common.async_views import AsyncAPIView
+from core_apps.common.permissions import IsBranchManager, IsTeller
 from core_apps.common.renderers import GenericJSONRenderer
+from core_apps.common.utils import get_client_ip
+from core_apps.common.view_tracking import annotate_view_counts, record_view
 from core_apps.accounts.utils import create_bank_account
 from core_apps.accounts.models import BankAccount
+from .cache import get_profile_by_user
 from .models import NextOfKin, Profile
-from .serializers import NextOfKinSerializer, ProfileSerializer
+from .search import search_customers
+from .serializers import (
+    CustomerSearchSerializer,
+    NextOfKinSerializer,
+    ProfileListSerializer,
+    ProfileSerializer,
+)
 
 
 class StandardResultsSetPagination(PageNumberPagination):
@@ -40,7 +49,7 @@ class ProfileFilter(FilterSet):
 
 
 class ProfileListApiView(generics.ListAPIView):
-    serializer_class = ProfileSerializer
+    serializer_class = ProfileListSerializer
     renderer_classes = [GenericJSONRenderer]
     pagination_class = StandardResultsSetPagination
     object_label = "profiles"
@@ -50,11 +59,32 @@ class ProfileListApiView(generics.ListAPIView):
     search_fields = ["user__id_no", "user__first_name", "user__last_name"]
 
     def get_queryset(self) -> List[Profile]:
-        return Profile.objects.exclude(user__is_superuser=True).exclude(
-            user__is_staff=True
+        return annotate_view_counts(
+            Profile.objects.select_related("user")
+            .exclude(user__is_superuser=True)
+            .exclude(user__is_staff=True)
         )
 
 
+class CustomerSearchAPIView(generics.ListAPIView):
+    serializer_class = CustomerSearchSerializer
+    renderer_classes = [GenericJSONRenderer]
+    object_label = "customers"
+    permission_classes = [IsTeller | IsBranchManager]
+    # Results are ranked best first and capped, not paged.
+    pagination_class = None
+    max_results = 50
+
+    def get_queryset(self) -> List[Profile]:
+        try:
+            limit = min(
+                int(self.request.query_params.get("limit", 20)), self.max_results
+            )
+        except ValueError:
+            limit = 20
+        return search_customers(self.request.query_params.get("q", ""), max(limit, 1))
+
+
 class ProfileDetailApiView(generics.RetrieveUpdateAPIView):
     serializer_class = ProfileSerializer
     parser_classes = [JSONParser, FormParser, MultiPartParser]
@@ -62,36 +92,20 @@ class ProfileDetailApiView(generics.RetrieveUpdateAPIView):
     object_label = "profile"
 
     def get_object(self) -> Profile:
-        try:
-            profile = Profile.objects.get(user=self.request.user)
-            self.record_profile_view(profile)
-            return profile
-        except Profile.DoesNotExist:
+        if self.request.method in SAFE_METHODS:
+            profile = get_profile_by_user(self.request.user.id)
+        else:
+            profile = Profile.objects.filter(user=self.request.user).first()
+        if profile is None:
             raise Http404("Profile not found")
+        return profile
 
     def record_profile_view(self, profile: Profile) -> None:
-        content_type = ContentType.objects.get_for_model(profile)
-        viewer_ip = self.get_client_ip()
-        user = self.request.user
-
-        obj, created = ContentView.objects.update_or_create(
-            content_type=content_type,
-            object_id=profile.id,
-            user=user,
-            viewer_ip=viewer_ip,
-            defaults={"last_viewed_at": timezone.now()},
-        )
-
-    def get_client_ip(self) -> str:
-        x_forwarded_for = self.request.META.get("HTTP_X_FORWARDED_FOR")
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(",")[0]
-        else:
-            ip = self.request.META.get("REMOTE_ADDR")
-        return ip
+        record_view(profile, self.request.user, get_client_ip(self.request))
 
     def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         instance = self.get_object()
+        self.record_profile_view(instance)
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
 
@@ -154,6 +168,31 @@ class ProfileDetailApiView(generics.RetrieveUpdateAPIView):
         serializer.save()
 
 
+class AsyncProfileDetailApiView(AsyncAPIView, generics.GenericAPIView):
+    serializer_class = ProfileSerializer
+    renderer_classes = [GenericJSONRenderer]
+    object_label = "profile"
+
+    async def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        try:
+            profile = await (
+                Profile.objects.select_related("user")
+                .prefetch_related("next_of_kin")
+                .aget(user=request.user)
+            )
+        except Profile.DoesNotExist:
+            raise Http404("Profile not found")
+
+        await self.record_profile_view(profile)
+        data = await sync_to_async(lambda: self.get_serializer(profile).data)()
+        return Response(data)
+
+    async def record_profile_view(self, profile: Profile) -> None:
+        await sync_to_async(record_view)(
+            profile, self.request.user, get_client_ip(self.request)
+        )
+
+
 class NextOfKinListApiView(generics.ListCreateAPIView):
     serializer_class = NextOfKinSerializer
     renderer_classes = [GenericJSONRenderer]
@@ -6,6 +6,11 @@ set -o pipefail
 
 set -o nounset
 
+# Under ASGI every request runs in its own thread, and a persistent connection
+# would be left behind with it. Connections are closed after each request and
+# pooled by PgBouncer instead (the pgbouncer service in local.yml).
+export POSTGRES_CONN_MAX_AGE="${POSTGRES_CONN_MAX_AGE:-0}"
+
 python manage.py migrate --no-input
 python manage.py collectstatic --no-input
-exec python manage.py runserver 0.0.0.0:8000
\ No newline at end of file
+exec uvicorn config.asgi:application --host 0.0.0.0 --port 8000 --reload
\ No newline at end of file
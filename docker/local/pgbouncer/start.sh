@@ -0,0 +1,31 @@
+#!/bin/bash
+
+set -o errexit
+
+set -o pipefail
+
+set -o nounset
+
+# Transaction pooling in front of PGBOUNCER_DB_HOST, with the application's
+# own credentials.
+cat > /etc/pgbouncer/pgbouncer.ini <<INI
+[databases]
+${POSTGRES_DB} = host=${PGBOUNCER_DB_HOST} port=5432 dbname=${POSTGRES_DB}
+
+[pgbouncer]
+listen_addr = 0.0.0.0
+listen_port = 6432
+auth_type = scram-sha-256
+auth_file = /etc/pgbouncer/userlist.txt
+pool_mode = transaction
+max_client_conn = ${PGBOUNCER_MAX_CLIENT_CONN:-500}
+default_pool_size = ${PGBOUNCER_DEFAULT_POOL_SIZE:-20}
+ignore_startup_parameters = extra_float_digits
+INI
+
+# Double quotes inside a userlist entry are written twice.
+printf '"%s" "%s"\n' "${POSTGRES_USER//\"/\"\"}" "${POSTGRES_PASSWORD//\"/\"\"}" \
+  > /etc/pgbouncer/userlist.txt
+chmod 0600 /etc/pgbouncer/userlist.txt
+
+exec pgbouncer /etc/pgbouncer/pgbouncer.ini
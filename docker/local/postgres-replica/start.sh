@@ -0,0 +1,26 @@
+#!/bin/bash
+
+set -o errexit
+
+set -o pipefail
+
+set -o nounset
+
+# Clone the primary on first start and follow it as a hot standby from then on.
+if [ ! -s "${PGDATA}/PG_VERSION" ]; then
+  until PGPASSWORD="${POSTGRES_PASSWORD}" pg_basebackup \
+    --host="${POSTGRES_HOST}" \
+    --port="${POSTGRES_PORT:-5432}" \
+    --username="${POSTGRES_USER:-postgres}" \
+    --pgdata="${PGDATA}" \
+    --wal-method=stream \
+    --checkpoint=fast \
+    --write-recovery-conf; do
+    >&2 echo "Waiting for the primary to accept replication connections..."
+    rm -rf "${PGDATA:?}"/*
+    sleep 2
+  done
+  chmod 0700 "${PGDATA}"
+fi
+
+exec postgres -c hot_standby=on
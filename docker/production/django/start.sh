@@ -0,0 +1,17 @@
+#!/bin/bash
+
+set -o errexit
+
+set -o pipefail
+
+set -o nounset
+
+# Under ASGI every request runs in its own thread, and a persistent connection
+# would be left behind with it. Connections are closed after each request and
+# pooled by a PgBouncer in front of Postgres instead: point POSTGRES_HOST at it
+# and set DATABASE_POOL_MODE=transaction.
+export POSTGRES_CONN_MAX_AGE="${POSTGRES_CONN_MAX_AGE:-0}"
+
+python manage.py migrate --no-input
+python manage.py collectstatic --no-input
+exec gunicorn config.asgi:application --config config/gunicorn.py